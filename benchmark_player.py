@@ -0,0 +1,608 @@
+"""데모 플레이어 성능 벤치마크 (화면 없이 실행)
+
+QT_QPA_PLATFORM=offscreen 환경에서 합성 영상(해상도/GOP/FPS별)과 합성 결과 엑셀(행 수별)을 만들고,
+dual_video_player_with_tabs.py의 재생/탐색/표/그래프 경로를 측정해 JSON으로 저장합니다.
+저장한 결과끼리 비교할 수 있으므로 변경 전후의 성능 차이를 확인할 때 사용합니다.
+
+사용법:
+    python benchmark_player.py                        # 전체 구성, bench_results/bench_<시각>.json 저장
+    python benchmark_player.py --quick                # 작은 구성만 빠르게
+    python benchmark_player.py --compare 이전.json    # 실행 후 이전 결과와 비교해 출력
+    python benchmark_player.py --compare A.json B.json  # 저장된 두 결과만 비교 (실행하지 않음)
+    python benchmark_player.py --soak 12              # 12시간 연속 재생하며 메모리/할당/틱 시간을 주기적으로 기록
+    python benchmark_player.py --check-mot            # MOT 평가가 TrackEval 결과와 같은지 확인 (MOT 평가를 바꾸면 필수)
+"""
+import os
+import gc
+import sys
+import json
+import time
+import random
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+import cv2
+import pandas as pd
+from PyQt5.QtCore import QEventLoop, QTimer
+from PyQt5.QtWidgets import QApplication, QFileDialog
+
+import dual_video_player_with_tabs as player_module
+
+# --- 벤치마크 구성 ---
+FULL_CONFIG = {
+    'resolutions': [(640, 360), (1280, 720), (1920, 1080)],
+    'codecs': ['mp4v', 'mjpg'],  # mp4v: 긴 GOP(인코더 기본값), mjpg: 모든 프레임이 키프레임
+    'fps': [30, 60],
+    'duration': 6.0,             # 합성 영상 길이 (초)
+    'play_seconds': 5.0,         # 구성별 재생 측정 시간 (초)
+    'seeks': 30,                 # 구성별 탐색 횟수
+    'table_rows': [2000, 10000, 30000],
+}
+QUICK_CONFIG = {
+    'resolutions': [(640, 360)],
+    'codecs': ['mp4v', 'mjpg'],
+    'fps': [30],
+    'duration': 3.0,
+    'play_seconds': 2.0,
+    'seeks': 10,
+    'table_rows': [1000, 5000],
+}
+CODEC_FOURCC = {'mp4v': ('mp4v', '.mp4'), 'mjpg': ('MJPG', '.avi')}
+REQUESTED_GOP = 60               # 인코더가 지원하면 이 간격으로 키프레임을 넣도록 요청 (실제 GOP는 측정해서 기록)
+SEEK_TIMEOUT = 5.0               # 탐색 한 번을 기다리는 최대 시간 (초)
+# --- 소크(장시간) 테스트 구성 ---
+SOAK_VIDEO = {'size': (1280, 720), 'fps': 30, 'duration': 20.0, 'codec': 'mp4v'}
+SOAK_INTERVAL = 60.0             # 기본 기록 간격 (초)
+SOAK_WARMUP = 0.25               # 메모리 증가율 계산에서 뺄 앞부분 비율 (프레임 캐시가 차는 구간)
+# --- MOT 평가 회귀 확인 (기댓값은 TrackEval 1.3.0으로 계산) ---
+# GT 1명(6프레임). 3번 프레임은 트래커가, 5번 프레임은 GT가 비어 있어도 직전 짝(10번)이 유지되어야
+# 4, 6번 프레임에서 IoU가 더 높은 20, 30번 대신 10번과 매칭되고 IDSW가 생기지 않음
+MOT_CHECK_GT = """\
+1,1,100,100,50,100,1,1,1
+2,1,100,100,50,100,1,1,1
+3,1,100,100,50,100,1,1,1
+4,1,100,100,50,100,1,1,1
+6,1,100,100,50,100,1,1,1
+"""
+MOT_CHECK_TRACKER = """\
+1,10,100,100,50,100,1,-1,-1,-1
+2,10,100,100,50,100,1,-1,-1,-1
+4,10,112.5,100,50,100,1,-1,-1,-1
+4,20,102.5,100,50,100,1,-1,-1,-1
+5,10,112.5,100,50,100,1,-1,-1,-1
+6,10,112.5,100,50,100,1,-1,-1,-1
+6,30,101,100,50,100,1,-1,-1,-1
+"""
+MOT_CHECK_EXPECTED = {'HOTA': 0.4470237270802821, 'DetA': 0.38947368421052636, 'AssA': 0.5131578947368421,
+                      'LocA': 0.8736842105263158, 'MOTA': 0.2, 'MOTP': 0.8, 'IDF1': 0.6666666666666666,
+                      'IDSW': 0, 'FP': 3, 'FN': 1}
+
+
+def percentiles(values):
+    """측정값 목록의 평균과 p50/p90/p99 (ms 단위 목록을 받음)"""
+    if not values:
+        return {}
+    arr = np.asarray(values, dtype=np.float64)
+    return {'mean': float(arr.mean()), 'p50': float(np.percentile(arr, 50)),
+            'p90': float(np.percentile(arr, 90)), 'p99': float(np.percentile(arr, 99)),
+            'max': float(arr.max()), 'n': int(arr.size)}
+
+
+def run_event_loop(seconds):
+    """Qt 이벤트 루프를 seconds초 동안 실제로 돌립니다. (재생 타이머가 평소처럼 동작)"""
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec_()
+
+
+def wait_until(app, condition, timeout):
+    """condition()이 참이 될 때까지 이벤트를 처리합니다. 시간 안에 되면 True"""
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        app.processEvents()
+        time.sleep(0.0005)
+    return True
+
+
+# =_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=
+#  합성 데이터 생성
+# =_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=
+def make_video(path, size, fps, duration, codec):
+    """움직이는 그라디언트와 사각형이 있는 합성 영상을 만듭니다. 프레임 번호는 흰 세로줄 위치로도 알 수 있습니다."""
+    w, h = size
+    fourcc, _ = CODEC_FOURCC[codec]
+    writer = cv2.VideoWriter(path, cv2.CAP_FFMPEG, cv2.VideoWriter_fourcc(*fourcc), fps, (w, h),
+                             [cv2.VIDEOWRITER_PROP_KEY_INTERVAL, REQUESTED_GOP])
+    if not writer.isOpened():
+        raise RuntimeError(f"VideoWriter를 열 수 없습니다: {codec} {size}")
+    xs = np.linspace(0, 255, w, dtype=np.float32)
+    ys = np.linspace(0, 255, h, dtype=np.float32)[:, None]
+    rng = np.random.default_rng(0)
+    noise = rng.integers(0, 24, (h, w, 1), dtype=np.uint8)
+    frame = np.empty((h, w, 3), np.uint8)
+    for i in range(int(fps * duration)):
+        shift = i * 3
+        frame[..., 0] = (xs[None, :] + shift) % 256
+        frame[..., 1] = (ys + shift) % 256
+        frame[..., 2] = ((xs[None, :] + ys) / 2).astype(np.uint8)
+        frame += noise
+        bx, by = (i * 7) % max(1, w - w // 5), (i * 5) % max(1, h - h // 5)
+        cv2.rectangle(frame, (bx, by), (bx + w // 5, by + h // 5), (40, 200, 255), -1)
+        frame[:, (i * 5) % w] = 255
+        writer.write(frame)
+    writer.release()
+
+
+def measured_gop(path):
+    """키프레임 인덱스로 실제 평균 GOP 길이를 잽니다. (백엔드가 키프레임 정보를 주지 않으면 None)"""
+    index = player_module.KeyframeIndex.build(path)
+    if index is None or len(index.frames) < 2:
+        return None
+    return float(np.diff(index.frames).mean())
+
+
+def make_workbook(path, rows):
+    """TrackEval 결과 형태(시퀀스 + 지표 열)의 합성 엑셀 파일을 만듭니다."""
+    rng = np.random.default_rng(rows)
+    data = {'Sequence': [f"MOT17-{i % 21:02d}-{i // 21:05d}" for i in range(rows)]}
+    for metric in player_module.RESULT_METRICS:
+        data[metric] = 0.75 + 0.25 * rng.random(rows)
+    for j in range(16):
+        data[f"metric_{j:02d}"] = rng.random(rows) * 100
+    data['IDs'] = rng.integers(0, 500, rows)
+    pd.DataFrame(data).to_excel(path, index=False)
+
+
+# =_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=
+#  측정
+# =_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=
+def open_player(app, path):
+    """플레이어 창을 띄우고 네 패널 모두에 같은 영상을 엽니다."""
+    player = player_module.DualVideoPlayer()
+    player.show()
+    app.processEvents()
+    original = QFileDialog.getOpenFileName
+    QFileDialog.getOpenFileName = staticmethod(lambda *args: (path, ""))
+    try:
+        for key in list(player.caps):
+            player.open_file(key)
+    finally:
+        QFileDialog.getOpenFileName = original
+    app.processEvents()
+    return player
+
+
+def bench_playback(app, player, seconds):
+    """재생을 seconds초 동안 돌려 유지 FPS, 건너뛴 프레임, 시계 오차, 단계별 시간을 잽니다."""
+    player.toggle_play_pause()
+    start = time.perf_counter()
+    run_event_loop(seconds)
+    elapsed = time.perf_counter() - start
+    clock = player.clock.stats()
+    decode = player.decode_stats()
+    stages = player.stage_timings.summary() # {패널: {단계: ms}} -> 단계별 네 패널 평균
+    player.toggle_play_pause()
+    return {
+        'target_fps': player.fps,
+        'sustained_fps': clock['presented'] / elapsed,
+        'presented': clock['presented'],
+        'dropped': clock['dropped'],
+        'drift_avg_ms': clock['drift_avg_ms'],
+        'drift_max_ms': clock['drift_max_ms'],
+        'underruns': sum(st['underruns'] for st in decode.values()),
+        'stage_ms': {stage: float(np.mean([per_key[stage] for per_key in stages.values() if stage in per_key]))
+                     for stage in sorted({stage for per_key in stages.values() for stage in per_key})},
+    }
+
+
+def bench_seek(app, player, seeks, cached):
+    """일시정지 상태에서 임의 위치로 탐색해 네 패널이 모두 새 프레임을 표시할 때까지의 지연을 잽니다.
+
+    cached가 False면 매번 프레임 캐시를 비워 디코딩 경로를 측정합니다.
+    """
+    rng = random.Random(1234)
+    positions = [rng.randrange(player.total_frames) for _ in range(seeks)]
+    latencies, timeouts = [], 0
+    for position in positions:
+        if not cached:
+            for key in player.caps:
+                player.frame_cache.invalidate(key)
+        start = time.perf_counter()
+        player.set_video_position(position)
+        player.apply_pending_seek() # 병합 타이머를 기다리지 않고 바로 탐색
+        if wait_until(app, lambda: not player.seek_pending_keys, SEEK_TIMEOUT):
+            latencies.append((time.perf_counter() - start) * 1000)
+        else:
+            timeouts += 1
+    result = percentiles(latencies)
+    result['timeouts'] = timeouts
+    return result
+
+
+def bench_display_frame(player, path, repeats=60):
+    """원본 크기 프레임 하나를 display_frame으로 반복 표시해 축소+표시 비용을 잽니다."""
+    cap = cv2.VideoCapture(path)
+    ok, frame = cap.read()
+    cap.release()
+    if not ok:
+        return {}
+    key = next(iter(player.caps))
+    times = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        player.display_frame(key, i, frame, None)
+        times.append((time.perf_counter() - start) * 1000)
+    return percentiles(times)
+
+
+def bench_videos(app, config, workdir):
+    results = []
+    for (w, h) in config['resolutions']:
+        for codec in config['codecs']:
+            for fps in config['fps']:
+                name = f"{w}x{h}_{codec}_{fps}fps"
+                path = os.path.join(workdir, name + CODEC_FOURCC[codec][1])
+                start = time.perf_counter()
+                make_video(path, (w, h), fps, config['duration'], codec)
+                print(f"[영상] {name} 생성 {time.perf_counter() - start:.1f}s", flush=True)
+
+                player = open_player(app, path)
+                entry = {
+                    'name': name, 'width': w, 'height': h, 'codec': codec, 'fps': fps,
+                    'frames': player.total_frames, 'gop': measured_gop(path),
+                    'playback': bench_playback(app, player, config['play_seconds']),
+                    'seek_decode_ms': bench_seek(app, player, config['seeks'], cached=False),
+                    'seek_cached_ms': bench_seek(app, player, config['seeks'], cached=True),
+                    'display_frame_ms': bench_display_frame(player, path),
+                }
+                player.close()
+                player.deleteLater()
+                app.processEvents()
+                pb = entry['playback']
+                print(f"       재생 {pb['sustained_fps']:.1f}/{pb['target_fps']:.0f}fps, 건너뜀 {pb['dropped']}, "
+                      f"탐색 p50 {entry['seek_decode_ms'].get('p50', float('nan')):.1f}ms "
+                      f"p90 {entry['seek_decode_ms'].get('p90', float('nan')):.1f}ms", flush=True)
+                results.append(entry)
+    return results
+
+
+def bench_tables(app, config, workdir):
+    results = []
+    widget = player_module.ResultDisplayWidget("benchmark")
+    widget.resize(900, 900)
+    widget.show()
+    app.processEvents()
+    for rows in config['table_rows']:
+        path = os.path.join(workdir, f"results_{rows}.xlsx")
+        make_workbook(path, rows)
+
+        loader = player_module.ResultSheetLoader(path, player_module.result_read_columns()) # 앱과 같은 열만 읽음
+        start = time.perf_counter()
+        df = loader.read_sheet()
+        parse_s = time.perf_counter() - start
+        loader.run()              # 디스크 캐시에 저장
+        cached = player_module.ResultSheetLoader(path, player_module.result_read_columns())
+        cached.run()              # 캐시에서 다시 읽기
+        widget.df = cached.df if cached.df is not None else df
+
+        start = time.perf_counter()
+        widget.update_table()
+        app.processEvents()       # 보이는 셀을 실제로 그림
+        table_s = time.perf_counter() - start
+
+        widget.plot_redraw_ms['full'] = None # 첫 갱신을 전체 그리기로 측정
+        redraws = []
+        for _ in range(6):
+            widget.update_plot()
+            app.processEvents()
+            redraws.append(dict(widget.plot_redraw_ms))
+        entry = {
+            'name': f"{rows}rows", 'rows': rows, 'columns': int(df.shape[1]),
+            'excel_parse_s': parse_s,
+            'cache_load_s': cached.elapsed,
+            'cache_hit': cached.from_cache,
+            'update_table_s': table_s,
+            'plot_full_ms': redraws[0]['full'],
+            'plot_blit_ms': float(np.mean([r['blit'] for r in redraws[1:] if r['blit'] is not None]))
+                            if any(r['blit'] is not None for r in redraws[1:]) else None,
+        }
+        print(f"[표] {rows}행: 엑셀 {parse_s:.2f}s, 캐시 {cached.elapsed:.3f}s, 표 {table_s:.3f}s, "
+              f"그래프 전체 {entry['plot_full_ms']:.1f}ms / 블리팅 {entry['plot_blit_ms'] or float('nan'):.1f}ms",
+              flush=True)
+        results.append(entry)
+    widget.close()
+    widget.deleteLater()
+    return results
+
+
+def environment_info():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    from PyQt5.QtCore import QT_VERSION_STR
+    return {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'git_commit': commit,
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'opencv': cv2.__version__,
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'qt': QT_VERSION_STR,
+        'decode_mode': player_module.DECODE_MODE,
+        'renderer': player_module.VIDEO_RENDERER,
+    }
+
+
+# =_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=
+#  소크(장시간) 테스트
+# =_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=
+def rss_bytes():
+    """현재 프로세스의 상주 메모리(RSS). psutil이 있으면 사용하고, 없으면 /proc(Linux)에서 읽음"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class TickRecorder:
+    """StageTimings.trace 자리에 끼워 재생 틱마다 걸린 시간('clock', 'tick')만 모읍니다."""
+
+    def __init__(self):
+        self.ticks = []
+
+    def write(self, stream_key, stage, value):
+        if stage == 'tick':
+            self.ticks.append(value)
+
+    def drain(self):
+        ticks, self.ticks = self.ticks, []
+        return ticks
+
+    def close(self):
+        pass
+
+
+def allocation_counters(player):
+    """지금까지의 누적 할당 관련 횟수 (프레임 풀, 패널 버퍼, GC 수집)"""
+    pool = player.frame_pool.stats()
+    return {
+        'pool_allocated': pool['allocated'],
+        'pool_reused': pool['reused'],
+        'label_reallocations': sum(getattr(label, 'reallocations', 0) for label in player.video_labels.values()),
+        'gc_collections': sum(gen['collections'] for gen in gc.get_stats()),
+    }
+
+
+def soak(app, hours, interval, workdir, output, trace_python=False):
+    """합성 영상을 hours시간 동안 계속 재생하며 interval초마다 RSS, 할당 횟수, 틱 시간 분포를 기록합니다.
+
+    기록은 매번 output에 덮어써 두므로 며칠짜리 실행이 중간에 죽어도 그때까지의 결과가 남습니다.
+    """
+    spec = SOAK_VIDEO
+    path = os.path.join(workdir, "soak" + CODEC_FOURCC[spec['codec']][1])
+    make_video(path, spec['size'], spec['fps'], spec['duration'], spec['codec'])
+    player = open_player(app, path)
+    recorder = TickRecorder()
+    player.stage_timings.trace = recorder
+    if trace_python:
+        tracemalloc.start()
+
+    results = {'environment': environment_info(), 'soak': {'hours': hours, 'interval_s': interval, 'video': spec},
+               'samples': []}
+    start = time.perf_counter()
+    previous = allocation_counters(player)
+    player.toggle_play_pause()
+    try:
+        while time.perf_counter() - start < hours * 3600:
+            run_event_loop(min(interval, hours * 3600 - (time.perf_counter() - start)))
+            counters = allocation_counters(player)
+            ticks = recorder.drain()
+            clock = player.clock.stats()
+            sample = {
+                'elapsed_s': time.perf_counter() - start,
+                'rss_mb': (rss_bytes() or 0) / 1024**2,
+                'frame_cache_mb': player.frame_cache.nbytes / 1024**2,
+                'frame_pool_mb': player.frame_pool.nbytes / 1024**2,
+                'presented': clock['presented'],
+                'dropped': clock['dropped'],
+                'tick_ms': percentiles(ticks),
+                **{name: counters[name] - previous[name] for name in counters},
+            }
+            if trace_python:
+                current, peak = tracemalloc.get_traced_memory()
+                sample['python_traced_mb'] = current / 1024**2
+                sample['python_peak_mb'] = peak / 1024**2
+            previous = counters
+            results['samples'].append(sample)
+            with open(output, "w", encoding="utf-8") as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+            tick = sample['tick_ms']
+            print(f"[소크] {sample['elapsed_s'] / 3600:6.2f}h  RSS {sample['rss_mb']:7.1f}MB  "
+                  f"새 버퍼 {sample['pool_allocated']} / 재사용 {sample['pool_reused']}  GC {sample['gc_collections']}  "
+                  f"틱 p50 {tick.get('p50', float('nan')):.2f} p99 {tick.get('p99', float('nan')):.2f} "
+                  f"max {tick.get('max', float('nan')):.1f}ms", flush=True)
+    finally:
+        player.toggle_play_pause()
+        player.stage_timings.trace = None
+        player.close()
+        if trace_python:
+            tracemalloc.stop()
+
+    results['summary'] = soak_summary(results['samples'])
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    summary = results['summary']
+    print(f"[소크] RSS 증가율 {summary['rss_growth_mb_per_hour']:+.2f}MB/h (처음 {SOAK_WARMUP:.0%} 제외), "
+          f"새 버퍼 {summary['pool_allocated_after_warmup']}개, 틱 최악 p99 {summary['tick_p99_worst_ms']:.2f}ms")
+    print(f"결과 저장: {output}")
+    return results
+
+
+def soak_summary(samples):
+    """워밍업 이후 RSS의 시간당 증가율(선형 회귀), 새 버퍼 할당 수, 구간별 틱 p99의 최악값을 요약합니다."""
+    steady = samples[int(len(samples) * SOAK_WARMUP):] or samples
+    hours = np.array([s['elapsed_s'] for s in steady]) / 3600
+    rss = np.array([s['rss_mb'] for s in steady])
+    slope = float(np.polyfit(hours, rss, 1)[0]) if len(steady) > 1 and np.ptp(hours) > 0 else 0.0
+    p99s = [s['tick_ms']['p99'] for s in samples if s['tick_ms']]
+    return {
+        'rss_growth_mb_per_hour': slope,
+        'rss_start_mb': samples[0]['rss_mb'] if samples else None,
+        'rss_end_mb': samples[-1]['rss_mb'] if samples else None,
+        'pool_allocated_after_warmup': int(sum(s['pool_allocated'] for s in steady)),
+        'label_reallocations_after_warmup': int(sum(s['label_reallocations'] for s in steady)),
+        'tick_p99_worst_ms': float(max(p99s)) if p99s else float('nan'),
+        'tick_p99_median_ms': float(np.median(p99s)) if p99s else float('nan'),
+    }
+
+
+# =_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=
+#  결과 비교
+# =_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=
+def check_mot(workdir=None):
+    """빈 프레임이 있는 합성 시퀀스를 평가해 TrackEval 기댓값과 비교합니다. (scipy / NumPy 매칭 모두) 틀린 지표 수를 반환
+
+    다른 스크립트에서도 바로 부를 수 있습니다. workdir을 주지 않으면 임시 폴더에 입력 파일을 만들고 지웁니다.
+    """
+    if workdir is None:
+        with tempfile.TemporaryDirectory(prefix="demoplayer_motcheck_") as tmp:
+            return check_mot(tmp)
+    gt_path = os.path.join(workdir, "mot_check_gt.txt")
+    tracker_path = os.path.join(workdir, "mot_check_tracker.txt")
+    with open(gt_path, "w") as f:
+        f.write(MOT_CHECK_GT)
+    with open(tracker_path, "w") as f:
+        f.write(MOT_CHECK_TRACKER)
+    failures = 0
+    saved = player_module._scipy_assignment
+    try:
+        for label, assignment in (("scipy", None), ("numpy", False)):
+            player_module._scipy_assignment = assignment
+            row = player_module.summarize_sequence("check", player_module.evaluate_sequence(gt_path, tracker_path))
+            wrong = {k: (row[k], v) for k, v in MOT_CHECK_EXPECTED.items() if abs(row[k] - v) > 1e-6}
+            failures += len(wrong)
+            print(f"[MOT 평가 확인 {label}] " + ("TrackEval과 일치" if not wrong else
+                  ", ".join(f"{k} {got:.5f} (기댓값 {want:.5f})" for k, (got, want) in wrong.items())))
+    finally:
+        player_module._scipy_assignment = saved
+    return failures
+
+
+def flatten(results):
+    """결과 JSON을 {'videos/640x360_mp4v_30fps/playback/sustained_fps': 값} 형태의 숫자 목록으로 펼칩니다."""
+    flat = {}
+
+    def walk(prefix, value):
+        if isinstance(value, dict):
+            for k, v in value.items():
+                walk(f"{prefix}/{k}", v)
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, dict) and 'name' in item:
+                    walk(f"{prefix}/{item['name']}", item)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[prefix.lstrip("/")] = float(value)
+
+    for section in ('videos', 'tables'):
+        walk(section, results.get(section, []))
+    return flat
+
+
+def compare(old, new):
+    """두 결과에서 공통된 측정값의 변화를 출력합니다."""
+    a, b = flatten(old), flatten(new)
+    print(f"\n비교: {old['environment'].get('git_commit')} ({old['environment']['timestamp']}) -> "
+          f"{new['environment'].get('git_commit')} ({new['environment']['timestamp']})")
+    for key in sorted(a.keys() & b.keys()):
+        before, after = a[key], b[key]
+        change = f"{(after - before) / abs(before) * 100:+7.1f}%" if before else "      -"
+        print(f"  {key:<70} {before:12.3f} -> {after:12.3f}  {change}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="데모 플레이어 헤드리스 성능 벤치마크")
+    parser.add_argument("--quick", action="store_true", help="작은 구성만 실행")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: bench_results/bench_<시각>.json)")
+    parser.add_argument("--workdir", help="합성 영상/엑셀과 캐시를 둘 폴더 (기본: 임시 폴더, 끝나면 삭제)")
+    parser.add_argument("--skip-videos", action="store_true", help="영상 재생/탐색 측정 생략")
+    parser.add_argument("--skip-tables", action="store_true", help="표/그래프 측정 생략")
+    parser.add_argument("--compare", nargs="+", metavar="JSON", help="이전 결과와 비교 (두 개를 주면 실행 없이 비교만)")
+    parser.add_argument("--soak", type=float, metavar="HOURS", help="벤치마크 대신 HOURS시간 동안 연속 재생하는 소크 테스트")
+    parser.add_argument("--soak-interval", type=float, default=SOAK_INTERVAL, metavar="SEC", help="소크 테스트 기록 간격 (초)")
+    parser.add_argument("--tracemalloc", action="store_true", help="소크 테스트에서 파이썬 할당량도 추적 (느려짐)")
+    parser.add_argument("--check-mot", action="store_true", help="벤치마크 대신 MOT 평가 결과를 TrackEval 기댓값과 비교")
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) == 2:
+        with open(args.compare[0], encoding="utf-8") as f_old, open(args.compare[1], encoding="utf-8") as f_new:
+            compare(json.load(f_old), json.load(f_new))
+        return
+
+    config = QUICK_CONFIG if args.quick else FULL_CONFIG
+    workdir = args.workdir or tempfile.mkdtemp(prefix="demoplayer_bench_")
+    os.makedirs(workdir, exist_ok=True)
+    player_module.CACHE_DIR = os.path.join(workdir, "cache") # 사용자 캐시를 건드리지 않고 매번 같은 조건에서 측정
+
+    if args.check_mot:
+        try:
+            failures = check_mot(workdir)
+        finally:
+            if not args.workdir:
+                shutil.rmtree(workdir, ignore_errors=True)
+        sys.exit(1 if failures else 0)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    if args.soak:
+        output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_results",
+                                             time.strftime("soak_%Y%m%d_%H%M%S.json"))
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        try:
+            soak(app, args.soak, args.soak_interval, workdir, output, args.tracemalloc)
+        finally:
+            if not args.workdir:
+                shutil.rmtree(workdir, ignore_errors=True)
+        return
+
+    results = {'environment': environment_info(), 'config': config}
+    try:
+        if not args.skip_videos:
+            results['videos'] = bench_videos(app, config, workdir)
+        if not args.skip_tables:
+            results['tables'] = bench_tables(app, config, workdir)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_results",
+                                         time.strftime("bench_%Y%m%d_%H%M%S.json"))
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {output}")
+
+    if args.compare:
+        with open(args.compare[0], encoding="utf-8") as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
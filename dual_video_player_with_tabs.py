@@ -1,15 +1,537 @@
 import sys, os
-import cv2
-import pandas as pd
+import time, threading, logging, hashlib, queue, importlib, json, tempfile, warnings
+_IMPORT_START = time.perf_counter() # 시작 시간 보고용 기준 시각
+import multiprocessing
+from multiprocessing import shared_memory
+from collections import deque, OrderedDict
+import numpy as np
 from PyQt5.QtWidgets import *
-from PyQt5.QtGui import QImage, QPixmap, QFont
-from PyQt5.QtCore import QTimer, Qt, pyqtSignal
+from PyQt5.QtGui import (QImage, QPixmap, QFont, QKeySequence, QPainter, QColor, QOpenGLContext, QOffscreenSurface, QOpenGLVersionProfile,
+                         QOpenGLShader, QOpenGLShaderProgram, QOpenGLBuffer, QVector2D, QVector4D)
+from PyQt5.QtCore import QTimer, Qt, QEvent, QPoint, pyqtSignal, QAbstractTableModel, QModelIndex
+from PyQt5 import sip
+
+try:
+    import lz4.frame as lz4_frame # 선택 사항: 루프 캐시 압축용
+except ImportError:
+    lz4_frame = None
+
+logger = logging.getLogger("demoplayer")
+
+# --- 시작 시간 ---
+STARTUP_PHASES = OrderedDict() # 시작 단계 이름 -> 소요 시간(초). report_startup()이 로그로 남김
+
+
+class LazyModule:
+    """[신규] 처음 속성에 접근할 때 실제로 import 하는 모듈 대리 객체.
+
+    cv2, pandas처럼 무거운 모듈을 프로그램 시작 시점이 아니라 처음 쓰는 시점에 읽어 창이 빨리 뜨게 합니다.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            start = time.perf_counter()
+            self._module = importlib.import_module(self._name)
+            logger.info("[지연 import] %s %.2fs", self._name, time.perf_counter() - start)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+
+cv2 = LazyModule("cv2")
+pd = LazyModule("pandas")
+
+
+def load_matplotlib():
+    """[신규] 결과 탭을 처음 만들 때 matplotlib(Qt5Agg)을 읽어 (Figure, FigureCanvas, pyplot)을 반환합니다."""
+    import matplotlib
+    matplotlib.use('Qt5Agg')
+    from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+    from matplotlib.figure import Figure
+    import matplotlib.pyplot as plt
+    return Figure, FigureCanvas, plt
+
+
+def warm_results_imports():
+    """[신규] 결과 탭에 필요한 matplotlib(Qt5Agg)과 pandas를 미리 import 합니다. (백그라운드 스레드에서 호출)"""
+    load_matplotlib()
+    pd._load()
+
+
+def report_startup():
+    """지금까지 기록된 시작 단계별 소요 시간을 한 줄로 로그에 남깁니다."""
+    logger.info("[시작 시간] %s, 합계 %.2fs",
+                ", ".join(f"{name} {sec:.2f}s" for name, sec in STARTUP_PHASES.items()),
+                sum(STARTUP_PHASES.values()))
+
+# --- 디코딩 파이프라인 설정 ---
+DECODE_QUEUE_SIZE = 8            # 스트림별로 미리 디코딩해 둘 프레임 수
+PREROLL_FRAMES = 12              # 영상 끝에 도달하면 다음 루프용으로 미리 디코딩해 둘 시작 프레임 수
+DECODE_STATS_INTERVAL_MS = 10000 # 재생 중 디코딩 통계를 로그로 남기는 주기
+# 디코딩 방식: "thread"(기본, 스트림별 스레드) 또는 "process"(스트림별 프로세스 + 공유 메모리 링)
+DECODE_MODE = os.environ.get("DEMOPLAYER_DECODE", "thread").lower()
+PROCESS_RING_SLOTS = 4           # 프로세스 모드에서 스트림별 공유 메모리 슬롯 수
+PROCESS_MAX_OUTPUT = (1920, 1080) # 공유 메모리 슬롯 하나에 담을 수 있는 최대 표시 크기
+CLOCK_SPIN_THRESHOLD = 0.002     # 목표 시각까지 이보다 적게 남으면 타이머 대신 sleep으로 맞춤 (초)
+# 디코딩 예산: 모든 영상의 디코딩이 이 코어 수 안에 들도록 덜 중요한 영상부터 프레임률을 나눔 (1/2, 1/3, ...)
+DECODE_CPU_BUDGET = float(os.environ.get("DEMOPLAYER_DECODE_BUDGET", "0")) or max(1, (os.cpu_count() or 1) - 1)
+DECODE_MAX_DIVISOR = 4           # 프레임률을 최대 이만큼까지 나눔
+DECODE_SCHEDULE_MS = 2000        # 재생 중 예산을 다시 나누는 주기
+DECODE_MS_PER_MPIXEL = 4.0       # 아직 측정값이 없는 영상의 프레임당 디코딩 시간 추정 (ms / 백만 화소)
+# 영상 탭이 보이지 않을 때(결과 탭, 최소화): "continue"는 시계를 계속 돌리고 영상은 가져오지 않다가 돌아올 때
+# 키프레임 탐색으로 맞춤, "pause"는 재생 시계를 멈췄다가 그 자리에서 이어서 재생
+HIDDEN_PLAYBACK = os.environ.get("DEMOPLAYER_HIDDEN", "continue").lower()
+HIDDEN_TICK_MS = 100             # 숨김 중 재생 시계(슬라이더 위치, 루프 전환)만 갱신하는 간격
+HIDDEN_PREWARM_MS = 500          # 탭 자동 전환으로 돌아오기 이만큼 전에 돌아올 위치로 미리 탐색
+
+# --- 화면 구성 (모델 N개 x 시점 M개) ---
+GRID_MODELS = [name.strip() for name in os.environ.get("DEMOPLAYER_MODELS", "기존,개선").split(",") if name.strip()]
+GRID_VIEWS = max(1, int(os.environ.get("DEMOPLAYER_VIEWS", "2")))
+GRID_MODEL_COLORS = ["#FF6347", "#3CB371", "#3498db", "#f1c40f", "#9b59b6", "#e67e22"]
+GRID_COLUMN_WEIGHTS = (350, 650) if GRID_VIEWS == 2 else (1,) * GRID_VIEWS # 열 너비 비율
+# 영상별 중요도 (예: "1-1=2,2-1=2"). 화면 넓이와 곱해 디코딩 예산을 나눌 때 씀. 지정하지 않은 영상은 1
+PANEL_PRIORITY = {key.strip(): float(value) for key, _, value in
+                  (item.partition("=") for item in os.environ.get("DEMOPLAYER_PRIORITY", "").split(",")) if value}
+
+
+def grid_rows():
+    """화면 구성의 행별 (모델 이름, 색, 영상 key 목록). key는 '모델-시점' (1부터)"""
+    return [(name, GRID_MODEL_COLORS[r % len(GRID_MODEL_COLORS)], [f"{r + 1}-{c + 1}" for c in range(GRID_VIEWS)])
+            for r, name in enumerate(GRID_MODELS)]
+
+# --- 탐색(스크러빙) 설정 ---
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".demoplayer_cache") # 키프레임 인덱스 등 디스크 캐시 위치
+SEEK_COALESCE_MS = 15            # 슬라이더 이벤트를 모아 최신 위치만 탐색하는 간격
+SEEK_POLL_MS = 10                # 일시정지 중 탐색한 프레임이 준비됐는지 확인하는 간격
+SEEK_DISPLAY_TIMEOUT = 2.0       # 탐색한 프레임을 기다리는 최대 시간 (초)
+# 탐색 막대 미리보기: 영상마다 키프레임만 골라 만든 썸네일 아틀라스를 디스크에 캐시해 두고, 드래그 중에는 이것만 보여줌
+THUMB_INTERVAL_S = 2.0           # 썸네일 사이 간격 (초). 키프레임 인덱스가 있으면 그 직전 키프레임으로 맞춤
+THUMB_MAX_COUNT = 400            # 영상 하나의 최대 썸네일 수 (긴 영상은 간격을 늘림. 막대 너비보다 촘촘해 봐야 소용없음)
+THUMB_SIZE = (160, 90)           # 썸네일 한 장의 최대 크기 (비율 유지)
+THUMB_JPEG_QUALITY = 80          # 디스크에 저장하는 아틀라스의 JPEG 품질
+
+# --- 표시 크기 프레임 캐시 ---
+FRAME_CACHE_BYTES = 256 * 1024 * 1024 # 모든 패널이 함께 쓰는 LRU 캐시의 전체 메모리 예산
+FRAME_POOL_BYTES = 64 * 1024 * 1024   # 캐시에서 밀려난 프레임 버퍼를 다시 쓰려고 모아 두는 최대 크기
+
+# --- 전시용 루프 캐시 (첫 루프의 표시 크기 프레임을 디스크에 기록해 두고 이후 루프는 mmap으로 재생) ---
+LOOP_CACHE_ENABLED = os.environ.get("DEMOPLAYER_LOOP_CACHE", "0") == "1"
+LOOP_CACHE_CODEC = os.environ.get("DEMOPLAYER_LOOP_CACHE_CODEC", "auto") # auto / raw / lz4 / jpeg
+LOOP_CACHE_RAW_LIMIT = 2 * 1024**3 # auto일 때 스트림 하나의 예상 크기가 이보다 작으면 무압축(raw) 사용
+LOOP_CACHE_JPEG_QUALITY = 92
+LOOP_CACHE_QUEUE = 64            # 기록 스레드로 넘길 대기 프레임 수 (넘치면 직전 프레임으로 대체)
+LOOP_CACHE_MAX_GAP = 30          # 이보다 많이 건너뛰면(탐색 등) 이번 루프의 기록을 포기
+
+# --- 화면 표시 경로 ---
+# Qt 5.14 이상은 BGR 버퍼를 그대로 QImage로 감쌀 수 있음. 그보다 낮으면 축소된 버퍼를 한 번만 제자리 변환함
+DISPLAY_QIMAGE_FORMAT = getattr(QImage, 'Format_BGR888', QImage.Format_RGB888)
+STAGE_TIMING_WINDOW = 120        # 단계별 소요 시간 이동 평균에 쓰는 샘플 수
+# 성능 오버레이(F3)와 측정값 기록(F4). 환경 변수로 시작할 때부터 켤 수 있음
+OVERLAY_ENABLED = os.environ.get("DEMOPLAYER_OVERLAY", "0") == "1"
+OVERLAY_INTERVAL_MS = 500        # 오버레이 갱신 주기
+TRACE_PATH = os.environ.get("DEMOPLAYER_TRACE", "") # 지정하면 시작할 때부터 이 파일(.csv/.jsonl)에 기록
+# 영상 렌더러: "label"(영상마다 QLabel) 또는 "gl"(QOpenGLWidget 하나). GL을 쓸 수 없으면 자동으로 label로 돌아감
+VIDEO_RENDERER = os.environ.get("DEMOPLAYER_RENDERER", "label").lower()
+# 추적 박스 오버레이 (MOT 형식 txt를 표시 크기 프레임에 그림). 영상과 같은 이름의 .txt가 있으면 자동으로 불러옴
+TRACK_BOX_COLORS = [(75, 25, 230), (75, 180, 60), (25, 225, 255), (200, 130, 0), (48, 130, 245),
+                    (180, 30, 145), (240, 240, 70), (230, 50, 240), (60, 245, 210), (255, 190, 220)] # BGR, ID별로 순환
+TRACK_BOX_THICKNESS = 2
+TRACK_LABEL_SCALE = 0.45
+TRACK_LABEL_MIN_HEIGHT = 24      # 화면에서 이보다 작은 박스에는 ID를 쓰지 않음 (px)
+
+# --- 영상 내보내기 ---
+EXPORT_SIZE = (1920, 1080)       # 내보낼 비교 화면 크기
+EXPORT_QUEUE = 8                 # 디코딩 -> 합성 -> 인코딩 단계 사이 큐 크기 (프레임)
+
+# --- 결과 탭 ---
+RESULT_METRICS = ['HOTA', 'MOTA', 'IDF1'] # 그래프와 요약에 쓰는 지표 열
+# 표에 보여주고 비교할 열 (MOT 평가 결과와 같은 열). 시트에서는 이 열과 시퀀스/지표 열만 읽음.
+# DEMOPLAYER_RESULT_COLUMNS로 쉼표 목록을 줄 수 있고, "all"이면 None (시트의 모든 열을 읽음)
+RESULT_TABLE_COLUMNS = ['HOTA', 'DetA', 'AssA', 'LocA', 'MOTA', 'MOTP', 'IDF1', 'IDP', 'IDR', 'IDSW', 'FP', 'FN']
+if os.environ.get("DEMOPLAYER_RESULT_COLUMNS", "").strip():
+    RESULT_TABLE_COLUMNS = (None if os.environ["DEMOPLAYER_RESULT_COLUMNS"].strip().lower() == "all" else
+                            [name.strip() for name in os.environ["DEMOPLAYER_RESULT_COLUMNS"].split(",") if name.strip()])
+RESULT_PROGRESS_ROWS = 1000      # 엑셀을 읽을 때 진행률 갱신/취소 확인 간격 (행)
+RESULT_CACHE_VERSION = 2         # 시트를 읽는 방식이 바뀌면 올려서 이전 결과 캐시를 무효화
+RESULT_PLOT_BLIT = True          # False면 그래프를 매번 전체 다시 그림 (블리팅과 소요 시간 비교용)
+# 모델 간 비교 (결과 패널은 DEMOPLAYER_MODELS의 모델마다 하나, 첫 번째 모델이 기준)
+RESULT_SEQUENCE_COLUMN = 'Sequence' # 모델끼리 행을 맞출 열. 없으면 행 순서로 맞춤
+RESULT_SUMMARY_ROWS = ('COMBINED',) # 시퀀스별 비교에서 빼는 합계 행 (TrackEval 출력)
+RESULT_LOWER_IS_BETTER = {'IDSW', 'FP', 'FN', 'Frag', 'IDs', 'ML', 'CLR_FP', 'CLR_FN', 'IDFP', 'IDFN'} # 순위를 거꾸로 매길 지표
+RESULT_BOOTSTRAP_RESAMPLES = 1000 # 차이의 신뢰구간을 구하는 부트스트랩 반복 수
+RESULT_BOOTSTRAP_CHUNK = 64      # 부트스트랩 가중치를 이만큼씩 나눠 만듦 (시퀀스가 아주 많아도 메모리를 적게 씀)
+RESULT_CONFIDENCE = 0.95
+# 창이 뜨고 이만큼 뒤에 결과 탭을 미리 구성 (import는 백그라운드 스레드, 위젯은 유휴 시간에 패널 하나씩). 음수면 끔
+RESULTS_PREBUILD_DELAY_MS = int(os.environ.get("DEMOPLAYER_RESULTS_PREBUILD_MS", "1000"))
+
+
+def result_read_columns():
+    """결과 시트에서 읽을 열 이름 집합. (표시할 열 + 시퀀스 열 + 지표 열, RESULT_TABLE_COLUMNS가 None이면 None = 전체)"""
+    if RESULT_TABLE_COLUMNS is None:
+        return None
+    return set(RESULT_TABLE_COLUMNS) | set(RESULT_METRICS) | {RESULT_SEQUENCE_COLUMN}
+
+class DataFrameTableModel(QAbstractTableModel):
+    """[신규] DataFrame의 NumPy 열을 그대로 들고 있는 표 모델.
+
+    셀 문자열은 화면에 보이는 셀을 그릴 때만 만들고, 정렬/필터는 행 번호 배열(self._rows)만 바꿔서 처리합니다.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._headers = []
+        self._columns = []      # 열별 NumPy 배열
+        self._text_columns = {} # 필터용 소문자 문자열 열 (처음 필터링할 때 만듦)
+        self._rows = np.arange(0) # 화면의 행 -> 원본 행 번호
+        self._sort_column, self._sort_order = -1, Qt.AscendingOrder
+        self._filter = ""
+
+    def set_dataframe(self, df):
+        self.beginResetModel()
+        self._headers = [str(c) for c in df.columns]
+        self._columns = [df.iloc[:, j].to_numpy() for j in range(df.shape[1])]
+        self._text_columns = {}
+        self._rows = self._visible_rows()
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return str(self._columns[index.column()][self._rows[index.row()]])
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and section < len(self._headers):
+            return self._headers[section]
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        self._sort_column, self._sort_order = column, order
+        self._rows = self._visible_rows()
+        self.layoutChanged.emit()
+
+    def set_filter(self, text):
+        """모든 열 중 하나라도 text를 포함하는(대소문자 무시) 행만 남깁니다."""
+        self.beginResetModel()
+        self._filter = text.strip().lower()
+        self._rows = self._visible_rows()
+        self.endResetModel()
+
+    def _visible_rows(self):
+        n = len(self._columns[0]) if self._columns else 0
+        if 0 <= self._sort_column < len(self._columns):
+            series = pd.Series(self._columns[self._sort_column])
+            try:
+                rows = series.sort_values(ascending=self._sort_order == Qt.AscendingOrder,
+                                          kind='mergesort', na_position='last').index.to_numpy()
+            except TypeError: # 숫자와 문자열이 섞인 열은 문자열로 비교
+                rows = series.astype(str).sort_values(ascending=self._sort_order == Qt.AscendingOrder,
+                                                      kind='mergesort').index.to_numpy()
+        else:
+            rows = np.arange(n)
+        if self._filter:
+            # 숫자로 볼 수 없는 검색어는 숫자 열을 문자열로 바꿔 볼 필요가 없음
+            numeric_query = all(c in "0123456789.-+e" for c in self._filter)
+            mask = np.zeros(n, dtype=bool)
+            for j, column in enumerate(self._columns):
+                if numeric_query or not np.issubdtype(column.dtype, np.number):
+                    mask |= self._text_column(j).str.contains(self._filter, regex=False).to_numpy()
+            rows = rows[mask[rows]]
+        return rows
+
+    def _text_column(self, j):
+        if j not in self._text_columns:
+            self._text_columns[j] = pd.Series(self._columns[j]).astype(str).str.lower()
+        return self._text_columns[j]
+
+
+class ResultSheetLoader(threading.Thread):
+    """[신규] 결과 엑셀 파일을 백그라운드에서 읽습니다.
+
+    한 번 읽은 시트는 경로/크기/수정 시각으로 만든 키로 디스크 캐시(pickle)에 저장해 두었다가,
+    파일이 바뀌지 않았으면 엑셀을 다시 해석하지 않고 바로 읽습니다.
+    GUI는 progress / done / df / error 속성을 타이머로 확인합니다.
+    """
+    kind = "엑셀"
+
+    def __init__(self, path, columns=None):
+        super().__init__(name=f"result-loader-{os.path.basename(path)}", daemon=True)
+        self.path = path
+        self.columns = columns    # 읽을 열 이름 집합 (None이면 전체)
+        self.progress = 0.0       # 0~1, 알 수 없으면 0에 머묾
+        self.df = None
+        self.error = None
+        self.from_cache = False
+        self.elapsed = 0.0
+        self.done = False
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def cache_file(self):
+        ident = f"{file_cache_key(self.path)}|{','.join(sorted(map(str, self.columns or [])))}|{RESULT_CACHE_VERSION}"
+        return os.path.join(CACHE_DIR, "results", hashlib.sha1(ident.encode("utf-8")).hexdigest() + ".pkl")
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            cache_file = self.cache_file()
+            if os.path.exists(cache_file):
+                self.df = pd.read_pickle(cache_file)
+                self.from_cache = True
+            else:
+                df = self.read_sheet()
+                if df is None or self.cancelled:
+                    return
+                os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+                df.to_pickle(cache_file + ".tmp")
+                os.replace(cache_file + ".tmp", cache_file)
+                self.df = df
+            self.progress = 1.0
+        except Exception as e:
+            self.error = e
+        finally:
+            self.elapsed = time.perf_counter() - start
+            self.done = True
+
+    def read_sheet(self):
+        """첫 번째 시트를 읽습니다. (.xlsx는 openpyxl로 한 줄씩 읽어 진행률/취소를 지원)
+
+        열 이름은 pd.read_excel과 같게 만듭니다. 빈 머리글은 'Unnamed: N', 중복된 이름은 'X.1', 'X.2'...
+        읽을 열(self.columns)이 시트에 하나도 없으면 다른 형식의 결과표로 보고 모든 열을 읽습니다.
+        """
+        if not self.path.lower().endswith(".xlsx"):
+            if self.columns is not None:
+                df = pd.read_excel(self.path, usecols=lambda c: c in self.columns)
+                if len(df.columns):
+                    return df
+            return pd.read_excel(self.path)
+
+        import openpyxl
+        from pandas.io.parsers import TextParser
+        workbook = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0]
+            total = sheet.max_row or 0
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return pd.DataFrame()
+            # read_excel이 쓰는 파서로 머리글만 해석해 빈 칸/중복 이름 처리를 똑같이 맞춤
+            names = list(TextParser([["" if h is None else h for h in header]], header=0).read().columns)
+            keep = [j for j, name in enumerate(names) if self.columns is None or name in self.columns]
+            if not keep:
+                keep = list(range(len(names)))
+
+            data = []
+            for i, row in enumerate(rows, 1):
+                data.append([row[j] if j < len(row) else None for j in keep])
+                if i % RESULT_PROGRESS_ROWS == 0:
+                    if self.cancelled:
+                        return None
+                    if total > 1:
+                        self.progress = min(i / (total - 1), 0.99)
+            while data and all(v is None for v in data[-1]): # 서식만 남은 빈 줄 제거
+                data.pop()
+            return pd.DataFrame(data, columns=[names[j] for j in keep]).infer_objects()
+        finally:
+            workbook.close()
+
+
+class ResultComparison:
+    """[신규] 여러 모델의 결과표를 시퀀스 열로 맞춰 한 번에 비교하는 엔진.
+
+    데이터셋(모델)별 집계(시퀀스별 숫자 지표 표, 평균, 부트스트랩 표본 합)는 그 모델 자신의 시퀀스 x 지표
+    전체에 대해 한 번만 계산해 메모해 두므로, 모델을 하나 더 불러오면 공통 시퀀스가 줄어들더라도
+    그 모델의 집계만 새로 계산합니다. 비교는 모든 모델에 공통인 시퀀스와 숫자 지표 전체를
+    (모델 x 시퀀스 x 지표) 배열 하나로 쌓아 한 번에 계산합니다.
+
+    첫 번째로 등록된 모델이 기준이며, 차이의 신뢰구간은 짝지은 포아송 부트스트랩으로 구합니다.
+    표본마다 시퀀스별 가중치(평균 1인 포아송 수)를 시퀀스 이름과 seed로만 정하므로 모든 모델이 같은 표본을 쓰고,
+    메모한 합에서 공통이 아닌 시퀀스의 몫만 빼면 공통 시퀀스에 대한 표본 평균이 됩니다.
+    """
+
+    def __init__(self, resamples=RESULT_BOOTSTRAP_RESAMPLES, confidence=RESULT_CONFIDENCE, seed=0):
+        self.resamples = resamples
+        self.confidence = confidence
+        self.seed = seed
+        self._datasets = OrderedDict() # 모델 이름 -> DataFrame 또는 None (등록 순서 = 표시 순서)
+        self._tables = {}              # 모델 이름 -> (원본 DataFrame, 시퀀스 x 지표 표, 지표별 평균)
+        self._boot = {}                # 모델 이름 -> (표본별 가중 합 resamples x 지표, 표본별 가중치 합, 빈 값을 채운 표)
+        self._weights = {}             # 시퀀스 -> 표본별 가중치 (uint8, 모든 모델이 함께 씀)
+        self.computed = set()          # 마지막 compare()에서 부트스트랩을 새로 계산한 모델
+        self.reused = set()            # 마지막 compare()에서 메모한 부트스트랩을 그대로 쓴 모델
+        self.counts = {'tables': 0, 'bootstraps': 0, 'reused': 0} # 지금까지 계산/재사용한 횟수
+
+    def register(self, name):
+        """데이터 없이 이름만 먼저 등록해 표시 순서(기준 모델)를 정합니다."""
+        self._datasets.setdefault(name, None)
+
+    def set_dataset(self, name, df):
+        """name 모델의 결과표를 지정합니다. 같은 DataFrame이면 메모한 집계를 그대로 씁니다."""
+        if self._datasets.get(name) is df:
+            return
+        self._datasets[name] = df
+        self._tables.pop(name, None)
+        self._boot.pop(name, None)
+
+    def models(self):
+        """결과표가 있는 모델 이름 (등록 순서)"""
+        return [name for name, df in self._datasets.items() if df is not None]
+
+    def _aggregate(self, name):
+        df = self._datasets.get(name)
+        if df is None:
+            return None
+        cached = self._tables.get(name)
+        if cached is not None and cached[0] is df:
+            return cached
+        numeric = df.select_dtypes(include=[np.number]).astype(np.float64)
+        if RESULT_SEQUENCE_COLUMN in df.columns:
+            keys = df[RESULT_SEQUENCE_COLUMN].astype(str).to_numpy()
+            keep = ~np.isin(keys, RESULT_SUMMARY_ROWS)
+            numeric = numeric.drop(columns=[RESULT_SEQUENCE_COLUMN], errors='ignore')
+            table = numeric[keep].groupby(keys[keep], sort=False).mean() # 같은 시퀀스가 여러 줄이면 평균
+        else:
+            table = numeric.reset_index(drop=True) # 시퀀스 열이 없으면 행 순서로 맞춤
+        cached = self._tables[name] = (df, table, table.mean())
+        self.counts['tables'] += 1
+        return cached
+
+    def table(self, name):
+        """name 모델의 시퀀스별 숫자 지표 표 (합계 행 제외)"""
+        aggregate = self._aggregate(name)
+        return None if aggregate is None else aggregate[1]
+
+    def means(self, name, df=None):
+        """name 모델의 지표별 평균 (Series). df를 주면 먼저 그 결과표로 바꿉니다."""
+        if df is not None:
+            self.set_dataset(name, df)
+        aggregate = self._aggregate(name)
+        return None if aggregate is None else aggregate[2]
+
+    def _sequence_weights(self, keys):
+        """시퀀스별 부트스트랩 가중치 (resamples x len(keys)). 시퀀스 이름과 seed로만 정해지므로 모든 모델에서 같음"""
+        columns = []
+        for key in keys:
+            column = self._weights.get(key)
+            if column is None:
+                digest = int.from_bytes(hashlib.sha1(str(key).encode("utf-8")).digest()[:8], "little")
+                column = np.random.default_rng([self.seed, digest]).poisson(1.0, self.resamples).astype(np.uint8)
+                self._weights[key] = column
+            columns.append(column)
+        if not columns:
+            return np.zeros((self.resamples, 0), np.uint8)
+        return np.stack(columns, axis=1)
+
+    def _bootstrap(self, name):
+        """name 모델 자신의 시퀀스 x 지표 전체에 대한 표본별 가중 합을 메모해 둡니다. (다른 모델과 무관)"""
+        cached = self._boot.get(name)
+        if cached is not None:
+            self.reused.add(name)
+            self.counts['reused'] += 1
+            return cached
+        table = self.table(name)
+        values = table.to_numpy()
+        with np.errstate(invalid='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning) # 값이 하나도 없는 지표는 NaN으로 남음
+            values = np.where(np.isnan(values), np.nanmean(values, axis=0), values) # 빈 값은 그 지표 평균으로
+        weights = self._sequence_weights(table.index)
+        sums = np.empty((self.resamples, values.shape[1]))
+        for start in range(0, self.resamples, RESULT_BOOTSTRAP_CHUNK): # 가중치를 조금씩 실수로 바꿔 곱함
+            sums[start:start + RESULT_BOOTSTRAP_CHUNK] = weights[start:start + RESULT_BOOTSTRAP_CHUNK].astype(np.float64) @ values
+        cached = self._boot[name] = (sums, weights.sum(axis=1, dtype=np.int64), values)
+        self.computed.add(name)
+        self.counts['bootstraps'] += 1
+        return cached
+
+    def _bootstrap_means(self, name, sequences, metrics):
+        """메모한 가중 합을 공통 시퀀스/지표로 잘라 표본별 지표 평균 (resamples x 지표)을 만듭니다."""
+        sums, weight_sum, values = self._bootstrap(name)
+        table = self.table(name)
+        columns = table.columns.get_indexer(metrics)
+        sums = sums[:, columns]
+        dropped = ~table.index.isin(sequences)
+        if dropped.any(): # 공통이 아닌 시퀀스의 몫만 빼면 됨 (빠진 시퀀스 수만큼만 계산)
+            weights = self._sequence_weights(table.index[dropped]).astype(np.float64)
+            sums = sums - weights @ values[dropped][:, columns]
+            weight_sum = weight_sum - weights.sum(axis=1)
+        means = np.full(sums.shape, np.nan)
+        drawn = weight_sum > 0 # 모든 가중치가 0인 표본(시퀀스가 아주 적을 때)은 신뢰구간에서 뺌
+        means[drawn] = sums[drawn] / weight_sum[drawn, None]
+        return means
+
+    def compare(self):
+        """결과표가 있는 모든 모델을 비교합니다. 두 개 미만이면 None.
+
+        반환값 dict:
+            models, baseline, sequences, metrics
+            means, delta, delta_pct, ci_low, ci_high, ci_low_pct, ci_high_pct, mean_rank: (모델 x 지표) DataFrame
+            per_sequence_delta: {모델: (시퀀스 x 지표) DataFrame}, ranks: (모델 x 시퀀스 x 지표) 배열 (1이 가장 좋음)
+        """
+        start = time.perf_counter()
+        self.computed = set()
+        self.reused = set()
+        names = self.models()
+        if len(names) < 2:
+            return None
+        tables = [self.table(name) for name in names]
+        sequences = tables[0].index
+        for table in tables[1:]:
+            sequences = sequences.intersection(table.index, sort=False)
+        metrics = [c for c in tables[0].columns if all(c in table.columns for table in tables[1:])]
+        result = {'models': names, 'baseline': names[0], 'sequences': list(sequences), 'metrics': metrics}
+        if len(sequences) == 0 or not metrics:
+            return result
+
+        values = np.stack([table.loc[sequences, metrics].to_numpy() for table in tables]) # (모델, 시퀀스, 지표)
+        means = np.nanmean(values, axis=1)
+        deltas = values - values[0]
+        better = np.where(np.isin(metrics, list(RESULT_LOWER_IS_BETTER)), 1.0, -1.0) # 오름차순 정렬에서 좋은 값이 앞에 오도록
+        ranks = np.argsort(np.argsort(values * better, axis=0, kind='stable'), axis=0) + 1
+        boot = np.stack([self._bootstrap_means(name, sequences, metrics) for name in names])
+        tail = (1 - self.confidence) / 2 * 100
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning) # 값이 하나도 없는 지표는 NaN
+            ci_low, ci_high = np.nanpercentile(boot - boot[0], [tail, 100 - tail], axis=1)
+        scale = np.where(np.abs(means[0]) > _EPS, 100 / np.maximum(np.abs(means[0]), _EPS), np.nan) # 기준 대비 %
+
+        def frame(array):
+            return pd.DataFrame(array, index=names, columns=metrics)
+
+        result.update({
+            'means': frame(means),
+            'delta': frame(means - means[0]),
+            'delta_pct': frame((means - means[0]) * scale),
+            'ci_low': frame(ci_low), 'ci_high': frame(ci_high),
+            'ci_low_pct': frame(ci_low * scale), 'ci_high_pct': frame(ci_high * scale),
+            'mean_rank': frame(ranks.mean(axis=1)),
+            'ranks': ranks,
+            'per_sequence_delta': {name: pd.DataFrame(deltas[i], index=sequences, columns=metrics)
+                                   for i, name in enumerate(names)},
+        })
+        logger.info("[결과 비교] 모델 %d개, 공통 시퀀스 %d개, 지표 %d개: %.1fms (부트스트랩 새로 계산: %s / 재사용: %s)",
+                    len(names), len(sequences), len(metrics), (time.perf_counter() - start) * 1000,
+                    ", ".join(name for name in names if name in self.computed) or "없음",
+                    ", ".join(name for name in names if name in self.reused) or "없음")
+        return result
 
-import matplotlib
-matplotlib.use('Qt5Agg')
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
 
 class ResultDisplayWidget(QFrame):
     
@@ -36,7 +558,7 @@ class ResultDisplayWidget(QFrame):
             QPushButton:hover {
                 background-color: #2980b9;
             }
-            QTableWidget {
+            QTableView {
                 background-color: #34495e;
                 color: white;
                 gridline-color: #2c3e50;
@@ -55,128 +577,2684 @@ class ResultDisplayWidget(QFrame):
             }
         """)
         self.df = None
+        self.title = title
+        self.summary_source = None # df -> 지표별 평균(Series)을 돌려주는 함수. 지정하면 그래프가 이 값을 씀 (비교 엔진)
+        self.loader = None # 백그라운드에서 엑셀을 읽는 중인 ResultSheetLoader
+        self.loader_timer = QTimer(self)
+        self.loader_timer.setInterval(100)
+        self.loader_timer.timeout.connect(self.poll_loader)
+
+        # --- 전체 레이아웃 ---
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(15, 15, 15, 15)
+        main_layout.setSpacing(10)
+
+        # --- 상단 (제목, 버튼) ---
+        top_layout = QHBoxLayout()
+        title_label = QLabel(title)
+        title_label.setFont(QFont("Arial", 18, QFont.Bold))
+        self.load_button = QPushButton("엑셀 파일 불러오기")
+        self.load_button.clicked.connect(self.load_data)
+        # [신규] MOT 형식 GT/트래커 txt를 직접 평가해 표와 그래프에 보여줌
+        self.eval_button = QPushButton("MOT 평가")
+        self.eval_button.clicked.connect(self.evaluate_mot)
+        # [신규] 표 필터 (모든 열에서 검색)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("필터")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.setMaximumWidth(250)
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.timeout.connect(lambda: self.model.set_filter(self.filter_edit.text()))
+        self.filter_edit.textChanged.connect(lambda: self.filter_timer.start(200))
+
+        # [신규] 불러오기 진행률과 취소 버튼 (불러오는 동안만 보임)
+        self.load_progress = QProgressBar()
+        self.load_progress.setRange(0, 100)
+        self.load_progress.setMaximumWidth(200)
+        self.load_progress.hide()
+        self.cancel_button = QPushButton("취소")
+        self.cancel_button.clicked.connect(self.cancel_loading)
+        self.cancel_button.hide()
+
+        top_layout.addWidget(title_label)
+        top_layout.addStretch()
+        top_layout.addWidget(self.filter_edit)
+        top_layout.addWidget(self.load_progress)
+        top_layout.addWidget(self.cancel_button)
+        top_layout.addWidget(self.load_button)
+        top_layout.addWidget(self.eval_button)
+        main_layout.addLayout(top_layout)
+
+        # --- 콘텐츠 (표, 그래프) 스플리터 ---
+        content_splitter = QSplitter(Qt.Vertical)
+        
+        # 표 [수정] 셀마다 QTableWidgetItem을 만드는 대신 DataFrame을 직접 보여주는 모델 사용
+        self.model = DataFrameTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setAlternatingRowColors(True)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder) # 처음에는 원본 순서
+        self.table.setSortingEnabled(True)
+        
+        table_font = QFont()
+        table_font.setPointSize(16)
+        self.table.setFont(table_font)
+        # 모든 행을 같은 높이로 고정 (행마다 내용 크기를 재지 않음)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(self.table.fontMetrics().height() + 12)
+
+        header_font = QFont()
+        header_font.setPointSize(16)
+        header_font.setBold(True)
+        self.table.horizontalHeader().setFont(header_font)
+        
+        content_splitter.addWidget(self.table)
+        
+        # 그래프
+        Figure, FigureCanvas, plt = load_matplotlib()
+        plt.style.use('dark_background')
+        self.figure = Figure(figsize=(8, 5))
+        self.figure.tight_layout()
+        self.canvas = FigureCanvas(self.figure)
+        self.setup_plot()
+        content_splitter.addWidget(self.canvas)
+        
+        content_splitter.setSizes([self.height() // 2, self.height() // 2])
+        main_layout.addWidget(content_splitter)
+
+    def load_data(self):
+        """[수정] 엑셀 파일을 백그라운드에서 불러옵니다. 다 읽으면 표, 그래프, 요약 지표를 업데이트합니다."""
+        file_name, _ = QFileDialog.getOpenFileName(self, "엑셀 파일 선택", "", "Excel Files (*.xlsx *.xls)")
+        if file_name:
+            self.cancel_loading()
+            self.start_loader(ResultSheetLoader(file_name, result_read_columns()))
+
+    def evaluate_mot(self):
+        """[신규] GT 폴더(<시퀀스>/gt/gt.txt)와 트래커 결과 폴더(<시퀀스>.txt)를 골라 백그라운드에서 평가합니다."""
+        gt_root = QFileDialog.getExistingDirectory(self, "GT 폴더 선택 (<시퀀스>/gt/gt.txt)")
+        if not gt_root:
+            return
+        tracker_dir = QFileDialog.getExistingDirectory(self, "트래커 결과 폴더 선택 (<시퀀스>.txt)", os.path.dirname(gt_root))
+        if tracker_dir:
+            self.cancel_loading()
+            self.start_loader(MotEvaluationJob(gt_root, tracker_dir))
+
+    def start_loader(self, loader):
+        """불러오기(엑셀) 또는 평가 작업을 시작하고 진행률 표시를 켭니다."""
+        self.loader = loader
+        self.loader.start()
+        self.load_button.setEnabled(False)
+        self.eval_button.setEnabled(False)
+        self.load_progress.setValue(0)
+        self.load_progress.show()
+        self.cancel_button.show()
+        self.loader_timer.start()
+
+    def poll_loader(self):
+        """백그라운드 불러오기의 진행률을 표시하고, 끝났으면 결과를 반영합니다."""
+        loader = self.loader
+        if loader is None:
+            return
+        if not loader.done:
+            self.load_progress.setValue(int(loader.progress * 100))
+            return
+        self.finish_loading()
+        if loader.error is not None:
+            QMessageBox.warning(self, "오류", f"파일을 불러오는 중 오류가 발생했습니다:\n{loader.error}")
+            return
+        if loader.df is None:
+            return
+        logger.info("[결과 불러오기] %s: %d행 x %d열, %.2fs (%s)", os.path.basename(loader.path),
+                    loader.df.shape[0], loader.df.shape[1], loader.elapsed, "캐시" if loader.from_cache else loader.kind)
+        if getattr(loader, 'combined', None):
+            logger.info("[MOT 평가] 전체: HOTA %.3f, MOTA %.3f, IDF1 %.3f", loader.combined['HOTA'],
+                        loader.combined['MOTA'], loader.combined['IDF1'])
+        try:
+            self.df = loader.df
+            self.update_table()
+            self.update_plot()
+            
+            self.data_loaded.emit() 
+            
+        except Exception as e:
+            QMessageBox.warning(self, "오류", f"파일을 불러오는 중 오류가 발생했습니다:\n{e}")
+
+    def cancel_loading(self):
+        """진행 중인 불러오기를 취소합니다. (이미 표시 중인 데이터는 그대로 둠)"""
+        if self.loader is not None and not self.loader.done:
+            self.loader.cancel()
+        self.finish_loading()
+
+    def finish_loading(self):
+        self.loader = None
+        self.loader_timer.stop()
+        self.load_progress.hide()
+        self.cancel_button.hide()
+        self.load_button.setEnabled(True)
+        self.eval_button.setEnabled(True)
+
+    def update_table(self):
+        """[수정] 데이터프레임을 표 모델에 연결합니다. (셀 문자열은 보이는 셀만 그때그때 만듦)"""
+        if self.df is None: return
+        
+        self.model.set_dataframe(self.df)
+
+    def setup_plot(self):
+        """[신규] 축, 막대, 값 라벨을 한 번만 만들어 둡니다. 이후 update_plot은 막대 높이와 라벨만 바꿉니다.
+
+        막대와 라벨은 animated 아티스트로 두어 전체 그리기 때는 배경만 그리고(배경은 캐시),
+        데이터가 바뀌면 캐시된 배경 위에 이 아티스트들만 다시 그려 블리팅합니다.
+        """
+        ax = self.figure.add_subplot(111)
+        self.ax = ax
+        
+        colors = ['#3498db', '#2ecc71', '#e74c3c']
+        self.bars = ax.bar(RESULT_METRICS, [0] * len(RESULT_METRICS),
+                           color=[colors[i % len(colors)] for i in range(len(RESULT_METRICS))])
+        self.bar_labels = [ax.annotate("", xy=(bar.get_x() + bar.get_width() / 2, 0), xytext=(0, 3),
+                                       textcoords='offset points', ha='center', va='bottom', fontsize=20)
+                           for bar in self.bars]
+        self.no_data_text = ax.text(0.5, 0.5, "표시할 데이터가 없습니다.\n(HOTA, MOTA, IDF1 열 확인)",
+                                    transform=ax.transAxes, ha='center', va='center', color='gray',
+                                    fontsize=14, visible=False)
+        self.plot_artists = list(self.bars) + self.bar_labels + [self.no_data_text]
+        for artist in self.plot_artists:
+            artist.set_animated(True)
+
+        ax.set_ylim(0.75, 1)
+        
+        ax.tick_params(axis='x', labelsize=20)
+        ax.tick_params(axis='y', labelsize=20)
+
+        ax.grid(True, axis='y', linestyle='--', alpha=0.6)
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.spines['left'].set_visible(False)
+        ax.tick_params(axis='y', length=0)
+        
+        self.figure.subplots_adjust(
+            left=0.07,
+            right=0.95,
+            top=0.95,
+            bottom=0.1
+        )
+
+        self.plot_background = None
+        self.plot_redraw_ms = {'full': None, 'blit': None} # 최근 전체 그리기 / 블리팅 소요 시간 (타이밍 훅)
+        self.canvas.mpl_connect('draw_event', self.on_plot_draw)
+
+    def on_plot_draw(self, event):
+        """전체 그리기(처음 표시, 크기 변경 등)가 끝날 때마다 배경을 다시 캐시하고 막대를 그 위에 그립니다."""
+        self.plot_background = self.canvas.copy_from_bbox(self.figure.bbox)
+        for artist in self.plot_artists:
+            self.ax.draw_artist(artist)
+
+    def update_plot(self):
+        """[수정] HOTA, MOTA, IDF1의 평균값으로 막대 높이와 라벨만 바꿔 다시 그립니다.
+
+        summary_source가 있으면 그 평균(비교 엔진의 메모된 집계)을, 없으면 데이터프레임의 열 평균을 씁니다.
+        """
+        if self.df is None: return
+
+        means = self.summary_source(self.df) if self.summary_source is not None else None
+        any_valid = False
+        for metric, bar, label in zip(RESULT_METRICS, self.bars, self.bar_labels):
+            if means is not None and metric in means.index and not np.isnan(means[metric]):
+                mean_val = means[metric]
+            elif means is None and metric in self.df.columns and pd.api.types.is_numeric_dtype(self.df[metric]):
+                mean_val = self.df[metric].mean()
+            else:
+                mean_val = None
+            if mean_val is not None:
+                bar.set_height(mean_val)
+                label.xy = (label.xy[0], mean_val)
+                label.set_text(f"{mean_val:.3f}")
+                any_valid = True
+            else:
+                bar.set_height(0)
+                label.set_text("")
+        self.no_data_text.set_visible(not any_valid)
+        self.redraw_plot()
+
+    def redraw_plot(self):
+        """바뀐 아티스트만 캐시된 배경 위에 다시 그립니다. (배경이 아직 없으면 한 번 전체 그리기)"""
+        t0 = time.perf_counter()
+        if self.plot_background is None or self.plot_redraw_ms['full'] is None or not RESULT_PLOT_BLIT:
+            self.canvas.draw() # 첫 갱신은 비교 기준이 되도록 전체 그리기 시간도 잼
+            mode = 'full'
+        else:
+            self.canvas.restore_region(self.plot_background)
+            for artist in self.plot_artists:
+                self.ax.draw_artist(artist)
+            self.canvas.blit(self.figure.bbox)
+            mode = 'blit'
+        self.plot_redraw_ms[mode] = (time.perf_counter() - t0) * 1000
+        logger.info("[그래프 %s] %s 다시 그리기 %.1fms (최근 전체 그리기 %s)", self.title,
+                    "블리팅" if mode == 'blit' else "전체", self.plot_redraw_ms[mode],
+                    "-" if self.plot_redraw_ms['full'] is None else f"{self.plot_redraw_ms['full']:.1f}ms")
+
+
+# =_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=
+#  MOT 평가 (MOT 챌린지 형식 GT/트래커 txt에서 HOTA, MOTA, IDF1 직접 계산)
+# =_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=
+MOT_EVAL_VERSION = 2             # 계산 방식이 바뀌면 올려서 이전 평가 캐시를 무효화
+MOT_EVAL_WORKERS = int(os.environ.get("DEMOPLAYER_MOT_WORKERS", "0")) or max(1, (os.cpu_count() or 1) - 1)
+MOT_PEDESTRIAN_CLASS = 1         # 평가 대상 GT 클래스
+MOT_DISTRACTOR_CLASSES = (2, 7, 8, 12) # 이 GT와 겹치는 트래커 박스는 FP로 세지 않고 제외 (MOT17/20 기준)
+MOT_MATCH_THRESHOLD = 0.5        # CLEAR/Identity 매칭 IoU 기준
+HOTA_ALPHAS = np.arange(0.05, 0.99, 0.05) # HOTA 위치 정확도 기준값 19개
+_EPS = np.finfo(float).eps
+
+
+class MotDetections:
+    """MOT 형식 txt 한 개를 프레임 번호 순으로 정렬한 배열과 프레임별 오프셋 색인.
+
+    한 프레임의 박스는 rows(frame)으로 잘라 쓰며, 줄마다 파이썬 객체를 만들지 않습니다.
+    열: frame, id, x, y, w, h, conf(GT는 평가 여부 플래그), class, visibility
+    """
+
+    def __init__(self, path):
+        self.path = path
+        data = self._read(path) if os.path.getsize(path) > 0 else np.zeros((0, 9))
+        data = data[np.argsort(data[:, 0], kind='stable')]
+        self.frames = data[:, 0].astype(np.int64)
+        self.ids = data[:, 1].astype(np.int64)
+        self.boxes = data[:, 2:6]
+        self.conf = data[:, 6]
+        self.classes = data[:, 7].astype(np.int64)
+        self.has_classes = bool(np.any(data[:, 7] >= 0)) # 7열 이하 파일(MOT15 등)은 -1로 채워짐
+        self.frame_numbers = np.unique(self.frames)
+        # 프레임 f의 박스는 offsets[f] ~ offsets[f + 1] 범위 (프레임 번호로 바로 찾는 오프셋 표)
+        last = int(self.frames[-1]) if len(self.frames) else 0
+        self.offsets = np.searchsorted(self.frames, np.arange(max(last, 0) + 2))
+
+    @staticmethod
+    def _read(path):
+        df = pd.read_csv(path, header=None)
+        data = np.full((len(df), 9), -1.0)
+        n = min(df.shape[1], 9)
+        data[:, :n] = df.iloc[:, :n].to_numpy(dtype=np.float64)
+        return data
+
+    def rows(self, frame):
+        """frame 번호의 행 범위를 slice로 반환합니다. (없으면 빈 slice)"""
+        if 0 <= frame < len(self.offsets) - 1:
+            return slice(self.offsets[frame], self.offsets[frame + 1])
+        return slice(0, 0)
+
+    def __len__(self):
+        return len(self.frames)
+
+
+def box_iou(a, b):
+    """(N,4)와 (M,4) xywh 박스 사이의 (N,M) IoU 행렬을 브로드캐스팅으로 계산합니다."""
+    ax1, ay1 = a[:, 0:1], a[:, 1:2]
+    ax2, ay2 = ax1 + a[:, 2:3], ay1 + a[:, 3:4]
+    bx1, by1 = b[:, 0], b[:, 1]
+    bx2, by2 = bx1 + b[:, 2], by1 + b[:, 3]
+    iw = np.clip(np.minimum(ax2, bx2) - np.maximum(ax1, bx1), 0, None)
+    ih = np.clip(np.minimum(ay2, by2) - np.maximum(ay1, by1), 0, None)
+    inter = iw * ih
+    union = (a[:, 2:3] * a[:, 3:4]) + (b[:, 2] * b[:, 3]) - inter
+    return np.where(union > _EPS, inter / np.maximum(union, _EPS), 0.0)
+
+
+_scipy_assignment = None
+
+
+def max_weight_matching(score):
+    """score(N,M)의 합이 최대가 되는 1:1 매칭 (rows, cols)를 반환합니다. 점수가 0 이하인 쌍은 버립니다.
+
+    scipy가 있으면 linear_sum_assignment를 쓰고, 없으면 양수 점수로 연결된 덩어리별로 나눠
+    NumPy 헝가리안 알고리즘으로 풉니다. (프레임 안에서 서로 겹치는 박스 묶음은 대개 아주 작음)
+    """
+    global _scipy_assignment
+    if _scipy_assignment is None:
+        try:
+            from scipy.optimize import linear_sum_assignment
+            _scipy_assignment = linear_sum_assignment
+        except ImportError:
+            _scipy_assignment = False
+    empty = np.zeros(0, dtype=np.int64)
+    if score.size == 0:
+        return empty, empty
+    if _scipy_assignment:
+        rows, cols = _scipy_assignment(-score)
+    else:
+        rows, cols = _matching_by_components(score)
+    keep = score[rows, cols] > _EPS
+    return rows[keep], cols[keep]
+
+
+def _matching_by_components(score):
+    positive = score > _EPS
+    n_rows, n_cols = positive.shape
+    row_label = np.full(n_rows, -1)
+    all_rows, all_cols = [], []
+    for seed in np.flatnonzero(positive.any(axis=1)):
+        if row_label[seed] >= 0:
+            continue
+        # 양수 점수로 이어진 행/열 묶음을 넓혀 감
+        rows = np.zeros(n_rows, dtype=bool)
+        rows[seed] = True
+        cols = np.zeros(n_cols, dtype=bool)
+        while True:
+            new_cols = positive[rows].any(axis=0)
+            new_rows = positive[:, new_cols].any(axis=1)
+            if (new_cols == cols).all() and (new_rows == rows).all():
+                break
+            rows, cols = new_rows, new_cols
+        row_label[rows] = seed
+        r_idx, c_idx = np.flatnonzero(rows), np.flatnonzero(cols)
+        if len(r_idx) == 1 or len(c_idx) == 1:
+            sub = score[np.ix_(r_idx, c_idx)]
+            k = int(np.argmax(sub))
+            all_rows.append(r_idx[k // len(c_idx)])
+            all_cols.append(c_idx[k % len(c_idx)])
+            continue
+        sub_r, sub_c = _hungarian_max(score[np.ix_(r_idx, c_idx)])
+        all_rows.extend(r_idx[sub_r])
+        all_cols.extend(c_idx[sub_c])
+    return np.asarray(all_rows, dtype=np.int64), np.asarray(all_cols, dtype=np.int64)
+
+
+def _hungarian_max(score):
+    """최대 가중 매칭용 헝가리안 알고리즘 (최단 증가 경로, 안쪽 갱신은 NumPy로 한 번에)."""
+    transposed = score.shape[0] > score.shape[1]
+    cost = -(score.T if transposed else score)
+    n, m = cost.shape # n <= m
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64) # 열 j에 매칭된 행 (1부터, 0은 없음)
+    way = np.zeros(m + 1, dtype=np.int64)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            cur = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (cur < minv[1:])
+            minv[1:][better] = cur[better]
+            way[1:][better] = j0
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+            used_idx = np.flatnonzero(used)
+            u[p[used_idx]] += delta
+            v[used_idx] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    cols = np.flatnonzero(p[1:]) # 매칭된 열 (0부터)
+    rows = p[1:][cols] - 1
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+def prepare_sequence(gt, tracker):
+    """프레임별 (GT id, 트래커 id, IoU 행렬) 목록을 만듭니다.
+
+    TrackEval의 MOT 전처리와 같게, 방해 클래스 GT와 매칭되는 트래커 박스는 지우고
+    평가 플래그가 0이거나 보행자가 아닌 GT는 뺍니다. id는 0부터 이어지는 번호로 다시 매깁니다.
+    """
+    frames = np.union1d(gt.frame_numbers, tracker.frame_numbers)
+    steps = []
+    for frame in frames:
+        g, t = gt.rows(frame), tracker.rows(frame)
+        gt_boxes, tr_boxes = gt.boxes[g], tracker.boxes[t]
+        gt_ids, tr_ids = gt.ids[g], tracker.ids[t]
+        sim = box_iou(gt_boxes, tr_boxes)
+        if gt.has_classes:
+            classes = gt.classes[g]
+            distractor = np.isin(classes, MOT_DISTRACTOR_CLASSES)
+            if distractor.any() and sim.size:
+                rows, cols = max_weight_matching(np.where(sim >= MOT_MATCH_THRESHOLD - _EPS, sim, 0))
+                remove = cols[distractor[rows]]
+                if len(remove):
+                    keep_tr = np.ones(len(tr_ids), dtype=bool)
+                    keep_tr[remove] = False
+                    tr_ids, sim = tr_ids[keep_tr], sim[:, keep_tr]
+            keep_gt = (gt.conf[g] != 0) & (classes == MOT_PEDESTRIAN_CLASS)
+            gt_ids, sim = gt_ids[keep_gt], sim[keep_gt]
+        steps.append([gt_ids, tr_ids, sim])
+
+    gt_unique = np.unique(np.concatenate([s[0] for s in steps])) if steps else np.zeros(0, np.int64)
+    tr_unique = np.unique(np.concatenate([s[1] for s in steps])) if steps else np.zeros(0, np.int64)
+    for s in steps:
+        s[0] = np.searchsorted(gt_unique, s[0])
+        s[1] = np.searchsorted(tr_unique, s[1])
+    return steps, len(gt_unique), len(tr_unique)
+
+
+def clear_metrics(steps, num_gt_ids):
+    """MOTA, MOTP, IDSW, FP, FN (이전 프레임과 같은 짝을 우선 매칭)
+
+    GT나 트래커가 없는 프레임은 건너뛰기만 하고 직전 짝은 그대로 둡니다. (TrackEval과 같음)
+    """
+    tp = fn = fp = idsw = 0
+    motp_sum = 0.0
+    last_match = np.full(num_gt_ids, -1)  # GT id별 마지막으로 매칭된 트래커 id
+    prev_step = np.full(num_gt_ids, -1)   # 바로 앞 프레임에서 매칭된 트래커 id
+    for gt_ids, tr_ids, sim in steps:
+        if len(gt_ids) == 0 or len(tr_ids) == 0:
+            fp += len(tr_ids)
+            fn += len(gt_ids)
+            continue
+        continuing = tr_ids[None, :] == prev_step[gt_ids][:, None]
+        score = 1000 * continuing + sim
+        score[sim < MOT_MATCH_THRESHOLD - _EPS] = 0
+        rows, cols = max_weight_matching(score)
+        matched_gt, matched_tr = gt_ids[rows], tr_ids[cols]
+        previous = last_match[matched_gt]
+        idsw += int(np.count_nonzero((previous >= 0) & (previous != matched_tr)))
+        last_match[matched_gt] = matched_tr
+        prev_step[:] = -1
+        prev_step[matched_gt] = matched_tr
+        tp += len(rows)
+        fn += len(gt_ids) - len(rows)
+        fp += len(tr_ids) - len(rows)
+        motp_sum += float(sim[rows, cols].sum())
+    return {'CLR_TP': tp, 'CLR_FN': fn, 'CLR_FP': fp, 'IDSW': idsw, 'MOTP_sum': motp_sum}
+
+
+def identity_metrics(steps, num_gt_ids, num_tr_ids):
+    """IDTP/IDFP/IDFN: 시퀀스 전체에서 GT id와 트래커 id를 1:1로 묶어 겹친 프레임 수가 최대가 되게 함"""
+    potential = np.zeros((num_gt_ids, num_tr_ids))
+    gt_dets = tr_dets = 0
+    for gt_ids, tr_ids, sim in steps:
+        gt_dets += len(gt_ids)
+        tr_dets += len(tr_ids)
+        if sim.size:
+            potential[gt_ids[:, None], tr_ids[None, :]] += sim >= MOT_MATCH_THRESHOLD - _EPS
+    rows, cols = max_weight_matching(potential)
+    idtp = int(potential[rows, cols].sum())
+    return {'IDTP': idtp, 'IDFN': gt_dets - idtp, 'IDFP': tr_dets - idtp, 'GT_Dets': gt_dets, 'Tracker_Dets': tr_dets}
+
+
+def hota_metrics(steps, num_gt_ids, num_tr_ids):
+    """HOTA/DetA/AssA/LocA를 alpha별 배열로 계산합니다. (alpha 19개를 한 번에 브로드캐스팅)"""
+    n_alpha = len(HOTA_ALPHAS)
+    gt_id_count = np.zeros(num_gt_ids)
+    tr_id_count = np.zeros(num_tr_ids)
+    potential = np.zeros((num_gt_ids, num_tr_ids))
+    for gt_ids, tr_ids, sim in steps:
+        gt_id_count[gt_ids] += 1
+        tr_id_count[tr_ids] += 1
+        if sim.size:
+            denom = sim.sum(0)[None, :] + sim.sum(1)[:, None] - sim
+            potential[gt_ids[:, None], tr_ids[None, :]] += np.where(denom > _EPS, sim / np.maximum(denom, _EPS), 0)
+    global_score = potential / np.maximum(gt_id_count[:, None] + tr_id_count[None, :] - potential, _EPS)
+
+    tp = np.zeros(n_alpha)
+    fn = np.zeros(n_alpha)
+    fp = np.zeros(n_alpha)
+    loc_sum = np.zeros(n_alpha)
+    matches = np.zeros((n_alpha, num_gt_ids, num_tr_ids), dtype=np.int32)
+    for gt_ids, tr_ids, sim in steps:
+        if len(gt_ids) == 0 or len(tr_ids) == 0:
+            fp += len(tr_ids)
+            fn += len(gt_ids)
+            continue
+        rows, cols = max_weight_matching(global_score[gt_ids[:, None], tr_ids[None, :]] * sim)
+        matched_sim = sim[rows, cols]
+        ok = matched_sim[None, :] >= HOTA_ALPHAS[:, None] - _EPS # (alpha, 매칭 쌍)
+        n_ok = ok.sum(axis=1)
+        tp += n_ok
+        fn += len(gt_ids) - n_ok
+        fp += len(tr_ids) - n_ok
+        loc_sum += (ok * matched_sim[None, :]).sum(axis=1)
+        a_idx, k_idx = np.nonzero(ok)
+        np.add.at(matches, (a_idx, gt_ids[rows][k_idx], tr_ids[cols][k_idx]), 1)
+
+    ass_iou = matches / np.maximum(gt_id_count[None, :, None] + tr_id_count[None, None, :] - matches, 1)
+    ass_a = (matches * ass_iou).sum(axis=(1, 2)) / np.maximum(tp, 1)
+    det_a = tp / np.maximum(tp + fn + fp, 1)
+    return {'HOTA_TP': tp, 'HOTA_FN': fn, 'HOTA_FP': fp, 'AssA': ass_a, 'DetA': det_a,
+            'HOTA': np.sqrt(det_a * ass_a), 'LocA': np.maximum(loc_sum, 1e-10) / np.maximum(tp, 1e-10)}
+
+
+def evaluate_sequence(gt_path, tracker_path):
+    """GT txt와 트래커 txt 한 쌍을 평가해 JSON으로 저장할 수 있는 dict를 반환합니다. (프로세스 풀에서 호출)"""
+    gt, tracker = MotDetections(gt_path), MotDetections(tracker_path)
+    steps, num_gt_ids, num_tr_ids = prepare_sequence(gt, tracker)
+    clear = clear_metrics(steps, num_gt_ids)
+    identity = identity_metrics(steps, num_gt_ids, num_tr_ids)
+    hota = hota_metrics(steps, num_gt_ids, num_tr_ids)
+    result = {key: value.tolist() for key, value in hota.items()} # alpha별 값은 합산용으로 그대로 둠
+    result.update(clear)
+    result.update(identity)
+    result['GT_IDs'] = num_gt_ids
+    result['Tracker_IDs'] = num_tr_ids
+    return result
+
+
+def summarize_sequence(name, r):
+    """evaluate_sequence 결과(또는 합산 결과)를 표의 한 행(dict)으로 만듭니다. 비율 지표는 0~1."""
+    gt_dets = r['CLR_TP'] + r['CLR_FN']
+    return {
+        'Sequence': name,
+        'HOTA': float(np.mean(r['HOTA'])), 'DetA': float(np.mean(r['DetA'])),
+        'AssA': float(np.mean(r['AssA'])), 'LocA': float(np.mean(r['LocA'])),
+        'MOTA': (r['CLR_TP'] - r['CLR_FP'] - r['IDSW']) / max(1, gt_dets),
+        'MOTP': r['MOTP_sum'] / max(1, r['CLR_TP']),
+        'IDF1': r['IDTP'] / max(1, r['IDTP'] + 0.5 * r['IDFP'] + 0.5 * r['IDFN']),
+        'IDP': r['IDTP'] / max(1, r['IDTP'] + r['IDFP']),
+        'IDR': r['IDTP'] / max(1, r['IDTP'] + r['IDFN']),
+        'IDSW': r['IDSW'], 'FP': r['CLR_FP'], 'FN': r['CLR_FN'],
+        'GT_Dets': gt_dets, 'Tracker_Dets': r['Tracker_Dets'], 'GT_IDs': r['GT_IDs'],
+    }
+
+
+def combine_sequences(results):
+    """시퀀스별 결과를 TrackEval의 COMBINED 방식으로 합칩니다. (개수는 더하고 AssA/LocA는 TP 가중 평균)"""
+    total = {}
+    for key in ('CLR_TP', 'CLR_FN', 'CLR_FP', 'IDSW', 'MOTP_sum', 'IDTP', 'IDFN', 'IDFP',
+                'GT_Dets', 'Tracker_Dets', 'GT_IDs', 'Tracker_IDs'):
+        total[key] = sum(r[key] for r in results)
+    tp = sum(np.asarray(r['HOTA_TP']) for r in results)
+    fn = sum(np.asarray(r['HOTA_FN']) for r in results)
+    fp = sum(np.asarray(r['HOTA_FP']) for r in results)
+    ass_a = sum(np.asarray(r['AssA']) * np.asarray(r['HOTA_TP']) for r in results) / np.maximum(tp, 1)
+    loc_a = sum(np.asarray(r['LocA']) * np.asarray(r['HOTA_TP']) for r in results) / np.maximum(tp, 1e-10)
+    det_a = tp / np.maximum(tp + fn + fp, 1)
+    total.update({'HOTA_TP': tp, 'HOTA_FN': fn, 'HOTA_FP': fp, 'AssA': ass_a, 'DetA': det_a,
+                  'HOTA': np.sqrt(det_a * ass_a), 'LocA': loc_a})
+    return total
+
+
+def find_mot_pairs(gt_root, tracker_dir):
+    """<gt_root>/<시퀀스>/gt/gt.txt 와 <tracker_dir>/<시퀀스>.txt 가 모두 있는 (시퀀스, gt, 트래커) 목록"""
+    pairs = []
+    for name in sorted(os.listdir(gt_root)):
+        gt_path = os.path.join(gt_root, name, "gt", "gt.txt")
+        tracker_path = os.path.join(tracker_dir, name + ".txt")
+        if os.path.isfile(gt_path) and os.path.isfile(tracker_path):
+            pairs.append((name, gt_path, tracker_path))
+    return pairs
+
+
+class MotEvaluationJob(threading.Thread):
+    """[신규] GT 폴더와 트래커 결과 폴더의 모든 시퀀스를 백그라운드에서 평가합니다.
+
+    시퀀스는 프로세스 풀(spawn)에 나눠 병렬로 평가하고, (GT, 트래커) 파일 쌍마다 결과를 디스크 캐시(JSON)에
+    저장해 두어 파일이 바뀌지 않았으면 다시 계산하지 않습니다. ResultSheetLoader와 같은 속성을 써서
+    ResultDisplayWidget의 불러오기 타이머가 그대로 진행률을 보여주고 결과 DataFrame을 받습니다.
+    """
+    kind = "MOT 평가"
+
+    def __init__(self, gt_root, tracker_dir, workers=MOT_EVAL_WORKERS):
+        super().__init__(name=f"mot-eval-{os.path.basename(tracker_dir)}", daemon=True)
+        self.path = tracker_dir
+        self.gt_root = gt_root
+        self.workers = workers
+        self.progress = 0.0
+        self.df = None
+        self.combined = None      # 전체 시퀀스를 합친 요약 행 (dict)
+        self.error = None
+        self.from_cache = False   # 모든 시퀀스를 캐시에서 읽었으면 True
+        self.elapsed = 0.0
+        self.done = False
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    @staticmethod
+    def cache_file(gt_path, tracker_path):
+        ident = f"{file_cache_key(gt_path)}|{file_cache_key(tracker_path)}|{MOT_EVAL_VERSION}"
+        return os.path.join(CACHE_DIR, "mot_eval", hashlib.sha1(ident.encode("utf-8")).hexdigest() + ".json")
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            pairs = find_mot_pairs(self.gt_root, self.path)
+            if not pairs:
+                raise FileNotFoundError("평가할 시퀀스가 없습니다. (<GT 폴더>/<시퀀스>/gt/gt.txt 와 <트래커 폴더>/<시퀀스>.txt 확인)")
+            results = {}
+            todo = []
+            for name, gt_path, tracker_path in pairs:
+                cache_file = self.cache_file(gt_path, tracker_path)
+                if os.path.exists(cache_file):
+                    with open(cache_file, encoding="utf-8") as f:
+                        results[name] = json.load(f)
+                else:
+                    todo.append((name, gt_path, tracker_path))
+            self.from_cache = not todo
+            for name, result in self.evaluate(todo):
+                if self.cancelled:
+                    return
+                results[name] = result
+                self.progress = min(len(results) / len(pairs), 0.99)
+            if self.cancelled:
+                return
+            ordered = [results[name] for name, _, _ in pairs]
+            self.df = pd.DataFrame([summarize_sequence(name, r) for (name, _, _), r in zip(pairs, ordered)])
+            self.combined = summarize_sequence("COMBINED", combine_sequences(ordered))
+            self.progress = 1.0
+        except Exception as e:
+            self.error = e
+        finally:
+            self.elapsed = time.perf_counter() - start
+            self.done = True
+
+    def evaluate(self, todo):
+        """캐시에 없는 시퀀스를 평가하며 (이름, 결과)를 끝나는 순서대로 내놓고, 결과는 캐시에 저장합니다."""
+        if not todo:
+            return
+        paths = {name: (gt_path, tracker_path) for name, gt_path, tracker_path in todo}
+        if self.workers <= 1 or len(todo) == 1:
+            finished = ((name, evaluate_sequence(*paths[name])) for name in paths)
+            executor = None
+        else:
+            from concurrent.futures import ProcessPoolExecutor, as_completed
+            executor = ProcessPoolExecutor(max_workers=min(self.workers, len(todo)),
+                                           mp_context=multiprocessing.get_context("spawn"))
+            futures = {executor.submit(evaluate_sequence, *paths[name]): name for name in paths}
+            finished = ((futures[f], f.result()) for f in as_completed(futures))
+        try:
+            for name, result in finished:
+                cache_file = self.cache_file(*paths[name])
+                os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+                with open(cache_file + ".tmp", "w", encoding="utf-8") as f:
+                    json.dump(result, f)
+                os.replace(cache_file + ".tmp", cache_file)
+                yield name, result
+                if self.cancelled:
+                    return
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+
+# =_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=
+#  영상 디코딩 파이프라인 (GUI 스레드 밖에서 디코딩)
+# =_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=
+def fit_size(src_w, src_h, panel_size):
+    """화면 비율을 유지하면서 panel_size 안에 들어가는 (너비, 높이)를 계산합니다."""
+    scale = min(panel_size[0] / src_w, panel_size[1] / src_h)
+    return max(1, int(src_w * scale)), max(1, int(src_h * scale))
+
+
+def fit_frame(frame, panel_size, pool=None):
+    """프레임을 패널 크기에 맞게 한 번만 리사이즈합니다. (축소는 INTER_AREA)
+
+    pool(FramePool)을 주면 결과를 새로 할당하지 않고 풀에서 빌린 같은 크기 버퍼에 씁니다.
+    """
+    h, w = frame.shape[:2]
+    size = fit_size(w, h, panel_size)
+    if size == (w, h):
+        return frame
+    interpolation = cv2.INTER_AREA if size[0] < w else cv2.INTER_LINEAR
+    dst = pool.take((size[1], size[0], 3)) if pool is not None and frame.ndim == 3 else None
+    return cv2.resize(frame, size, dst=dst, interpolation=interpolation)
+
+
+def copy_frame(frame, pool=None):
+    """frame의 복사본을 만듭니다. (pool이 있으면 풀의 버퍼에 복사)"""
+    if pool is None:
+        return frame.copy()
+    out = pool.take(frame.shape)
+    np.copyto(out, frame)
+    return out
+
+
+def to_display_format(frame):
+    """QImage가 바로 쓸 수 있는 채널 순서로 맞춥니다. (BGR888을 지원하면 아무것도 하지 않음)"""
+    if DISPLAY_QIMAGE_FORMAT == QImage.Format_RGB888:
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame) # 이미 축소된 버퍼를 제자리 변환
+    return frame
+
+
+def needs_color_conversion():
+    """to_display_format이 실제로 cvtColor를 하는지 여부 (Qt 5.14 미만)"""
+    return DISPLAY_QIMAGE_FORMAT == QImage.Format_RGB888
+
+
+def seek_capture(cap, position, target, index, should_abort=lambda: False):
+    """다음 read()가 target 프레임을 반환하도록 캡처를 옮기고 새 위치를 반환합니다.
+
+    position은 캡처가 다음에 반환할 프레임 번호입니다. 키프레임 인덱스는 target이 position과 같은 GOP 안의
+    앞쪽일 때만 씁니다. 이때는 탐색 없이 grab()으로 전진해, 키프레임부터 다시 디코딩하지 않습니다.
+    그 밖의 경우는 cap.set(target)에 맡깁니다. FFmpeg이 안에서 직전 키프레임으로 가서 target까지 디코딩하므로,
+    인덱스로 키프레임에 착지한 뒤 Python에서 grab()하는 것보다 빠릅니다.
+    """
+    if index is None or not (index.keyframe_before(target) <= position <= target):
+        cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+        return target
+
+    while position < target:
+        if should_abort():
+            break
+        if not cap.grab():
+            break
+        position += 1
+    return position
+
+
+def timeline_frame(master_idx, stride):
+    """마스터 타임라인의 프레임 번호를 스트림 자신의 프레임 번호로 바꿉니다.
+
+    stride는 마스터 프레임 하나당 스트림 프레임 수(스트림 FPS / 마스터 FPS)입니다.
+    두 타임라인 모두 0번 프레임이 0ms이므로, 같은 시각(ms)에 해당하는 스트림 프레임을 고르는 것과 같습니다.
+    """
+    return int(master_idx * stride + 1e-6)
+
+
+def frame_needed(index, stride):
+    """스트림 프레임 index가 마스터 타임라인의 어떤 프레임에서든 표시되는지 여부.
+
+    스트림이 마스터보다 빠르면(stride > 1) 표시되지 않는 프레임이 생기며, 디코더는 이를 grab()으로 건너뜁니다.
+    """
+    if stride <= 1:
+        return True
+    master_idx = -(-(index - 1e-6) // stride) # 이 프레임 이후 첫 마스터 프레임 (올림)
+    return timeline_frame(master_idx, stride) == index
+
+
+class TrackBoxOverlay:
+    """[신규] 패널 하나에 겹쳐 그릴 MOT 형식 추적 결과 (박스 + ID).
+
+    MotDetections의 프레임별 오프셋 표로 현재 프레임의 박스를 바로 찾고, 이미 패널 크기로 줄인 프레임에
+    좌표만 비율로 옮겨 그립니다. 박스는 색별로 cv2.polylines 한 번에 모아 그립니다.
+    """
+
+    def __init__(self, path, source_size):
+        self.path = path
+        self.detections = MotDetections(path)
+        self.source_size = source_size # 원본 영상 (너비, 높이). 박스 좌표의 기준
+        unique_ids, inverse = np.unique(self.detections.ids, return_inverse=True)
+        self.label_index = inverse     # 행 -> labels 위치
+        self.labels = [str(i) for i in unique_ids]
+        self.color_index = np.mod(self.detections.ids, len(TRACK_BOX_COLORS))
+        # 오래된 Qt에서는 표시 버퍼가 RGB이므로 색도 뒤집어 둠
+        self.colors = [c[::-1] if needs_color_conversion() else c for c in TRACK_BOX_COLORS]
+
+    def draw(self, frame, frame_idx):
+        """frame(표시 크기, 제자리 수정)에 frame_idx(0부터) 프레임의 박스를 그리고 박스 수를 반환합니다."""
+        rows = self.detections.rows(frame_idx + 1) # MOT 프레임 번호는 1부터
+        n = rows.stop - rows.start
+        if n == 0:
+            return 0
+        h, w = frame.shape[:2]
+        sx, sy = w / self.source_size[0], h / self.source_size[1]
+        boxes = self.detections.boxes[rows] * (sx, sy, sx, sy)
+        x1, y1 = boxes[:, 0], boxes[:, 1]
+        x2, y2 = x1 + boxes[:, 2], y1 + boxes[:, 3]
+        corners = np.stack([x1, y1, x2, y1, x2, y2, x1, y2], axis=1).round().astype(np.int32).reshape(n, 4, 2)
+        colors = self.color_index[rows]
+        for c in np.unique(colors):
+            cv2.polylines(frame, corners[colors == c], True, self.colors[c], TRACK_BOX_THICKNESS)
+        for i in np.flatnonzero(y2 - y1 >= TRACK_LABEL_MIN_HEIGHT):
+            cv2.putText(frame, self.labels[self.label_index[rows.start + i]], (int(x1[i]) + 2, int(y1[i]) + 14),
+                        cv2.FONT_HERSHEY_SIMPLEX, TRACK_LABEL_SCALE, self.colors[colors[i]], 1, cv2.LINE_AA)
+        return n
+
+
+class TraceWriter:
+    """[신규] 측정값을 하나도 빼지 않고 파일에 기록합니다. 확장자가 .jsonl이면 JSON Lines, 아니면 CSV.
+
+    열: t(기록 시작 후 초), stream, stage, value(단계 소요 시간은 ms, dropped는 프레임 수)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.jsonl = path.lower().endswith(".jsonl")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self.rows = 0
+        if not self.jsonl:
+            self._file.write("t,stream,stage,value\n")
+
+    def write(self, stream_key, stage, value):
+        t = time.perf_counter() - self._start
+        if self.jsonl:
+            line = f'{{"t": {t:.6f}, "stream": "{stream_key}", "stage": "{stage}", "value": {value:.4f}}}\n'
+        else:
+            line = f"{t:.6f},{stream_key},{stage},{value:.4f}\n"
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line)
+                self.rows += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class StageTimings:
+    """스트림별/단계별 처리 시간(ms)의 최근 이동 평균을 모읍니다. (여러 스레드에서 기록 가능)
+
+    trace에 TraceWriter를 지정하면 모든 샘플을 파일로도 내보냅니다.
+    """
+
+    def __init__(self, window=STAGE_TIMING_WINDOW):
+        self.window = window
+        self._samples = {} # (stream_key, stage) -> deque[ms]
+        self.trace = None
+
+    def add(self, stream_key, stage, seconds):
+        samples = self._samples.get((stream_key, stage))
+        if samples is None:
+            samples = self._samples.setdefault((stream_key, stage), deque(maxlen=self.window))
+        samples.append(seconds * 1000)
+        trace = self.trace
+        if trace is not None:
+            trace.write(stream_key, stage, seconds * 1000)
+
+    def summary(self):
+        """{stream_key: {stage: 평균 ms}} 형태로 반환합니다."""
+        result = {}
+        for (stream_key, stage), samples in list(self._samples.items()):
+            if samples:
+                result.setdefault(stream_key, {})[stage] = sum(samples) / len(samples)
+        return result
+
+
+class DecoderWorker(threading.Thread):
+    """영상 하나를 전담하는 디코딩 스레드. 디코딩된 프레임을 고정 크기 링에 채워 둡니다."""
+
+    def __init__(self, key, cap, capacity=DECODE_QUEUE_SIZE, timings=None, pool=None):
+        super().__init__(name=f"decoder-{key}", daemon=True)
+        self.key = key
+        self.cap = cap
+        self.capacity = max(1, capacity)
+        self.timings = timings
+        self.pool = pool                  # FramePool. 축소 결과를 쓸 버퍼를 여기서 빌림
+        self._raw = None                  # 원본 크기 디코딩 버퍼 (축소해서 내보낼 때만 다음 read()에 재사용)
+        self.output_size = None           # 표시할 패널 크기. 정해지면 워커에서 미리 축소해 둠
+        self.stride = 1.0                 # 마스터 프레임 하나당 이 영상의 프레임 수 (timeline_frame 참고)
+
+        # 메타데이터는 스레드 시작 전에 읽어 둡니다 (이후 cap은 워커 스레드만 사용)
+        self.frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        self.fps = cap.get(cv2.CAP_PROP_FPS)
+
+        self._frames = deque()            # (프레임 번호, 프레임, 축소 기준 패널 크기) 링
+        self._cond = threading.Condition()
+        self._running = True
+        self._eof = False
+        self._seek_to = 0                 # 처리 대기 중인 탐색 요청 (None이면 없음)
+        self._next_index = 0              # 다음에 디코딩할 프레임 번호
+        self._cap_pos = 0                 # 캡처가 실제로 다음에 반환할 프레임 번호 (워커 스레드 전용)
+        self._target = 0                  # 재생 시계가 지금 보여주려는 프레임 번호
+        self._preroll = deque()           # 영상 끝에 도달한 뒤 다음 루프용으로 미리 디코딩한 시작 프레임
+        self._preroll_next = 0            # 프리롤에 다음으로 디코딩할 프레임 번호
+        self._preroll_done = False        # 프리롤을 다 채웠거나 더 읽을 프레임이 없음
+        self.index = None                 # KeyframeIndex (백그라운드 인덱싱이 끝나면 채워짐)
+
+        # --- 통계 ---
+        self.decoded_frames = 0
+        self.skipped_frames = 0           # 늦어서 grab()으로 디코딩 없이 건너뛴 프레임
+        self.discarded_frames = 0         # 디코딩했지만 표시 시점을 놓쳐 버린 프레임
+        self.underruns = 0
+        self.min_depth = self.capacity
+
+    def run(self):
+        while True:
+            with self._cond:
+                while (self._running and self._seek_to is None and
+                       ((self._eof and self._preroll_done) or len(self._frames) >= self.capacity)):
+                    self._cond.wait()
+                if not self._running:
+                    break
+                seek_to, self._seek_to = self._seek_to, None
+                if seek_to is not None:
+                    self._release(self._frames)
+                    self._eof = False
+                    self._next_index = seek_to
+                    self._clear_preroll()
+                prerolling = self._eof # 끝까지 읽었으면 남은 시간에 다음 루프의 시작 프레임을 준비
+                index = self._preroll_next if prerolling else self._next_index
+                # 표시 시점이 지났거나 마스터 타임라인에서 쓰이지 않는 프레임은 디코딩하지 않음
+                late = (index < self._target or not frame_needed(index, self.stride)) and not prerolling
+
+            if seek_to is not None:
+                self._seek_capture(seek_to)
+                if self._seek_to is not None:
+                    continue # 이동 중 더 새로운 탐색 요청이 왔으면 그쪽으로 바로 넘어감
+            elif prerolling and index == 0 and self._cap_pos != 0:
+                self._seek_capture(0) # 화면은 아직 끝부분을 보여주는 중이므로 여기서의 탐색은 보이지 않음
+                if self._seek_to is not None or not self._running:
+                    continue
+
+            if late:
+                ret = self.cap.grab()
+                self._cap_pos += 1
+                with self._cond:
+                    if self._seek_to is None:
+                        if ret:
+                            self._next_index = index + 1
+                            self.skipped_frames += 1
+                        else:
+                            self._reached_eof()
+                continue
+
+            output_size = self.output_size
+            t0 = time.perf_counter()
+            ret, frame = self.cap.read(self._raw if output_size is not None else None)
+            self._cap_pos += 1
+            t1 = time.perf_counter()
+            if ret and output_size is not None:
+                fitted = fit_frame(frame, output_size, self.pool)
+                self._raw = frame if fitted is not frame else None # 원본 크기 그대로 링에 넘긴 버퍼는 다시 쓰지 않음
+                frame = fitted
+                t2 = time.perf_counter()
+                frame = to_display_format(frame)
+            if self.timings is not None:
+                self.timings.add(self.key, 'decode', t1 - t0)
+                if ret and output_size is not None:
+                    self.timings.add(self.key, 'resize', t2 - t1)
+                    if needs_color_conversion():
+                        self.timings.add(self.key, 'cvtcolor', time.perf_counter() - t2)
+
+            with self._cond:
+                if self._seek_to is not None:
+                    if ret and output_size is not None:
+                        self._release([(index, frame)])
+                    continue # 디코딩 도중 탐색 요청이 들어왔으면 버림
+                if prerolling:
+                    self._store_preroll(index, ret, frame, output_size)
+                elif not ret:
+                    self._reached_eof()
+                else:
+                    self._frames.append((index, frame, output_size))
+                    self._next_index = index + 1
+                    self.decoded_frames += 1
+                self._cond.notify_all()
+
+        self.cap.release()
+
+    def _seek_capture(self, target):
+        self._cap_pos = seek_capture(self.cap, self._cap_pos, target, self.index,
+                                     lambda: self._seek_to is not None or not self._running)
+
+    def _reached_eof(self):
+        """(락을 잡은 상태에서) 영상 끝에 도달했음을 기록하고 다음 루프용 프리롤을 시작하게 합니다."""
+        self._eof = True
+        self._clear_preroll()
+        self._cond.notify_all()
+
+    def _release(self, frames):
+        """(락을 잡은 상태에서) 화면에 내보내지 않고 버리는 링/프리롤 프레임의 버퍼를 풀로 돌려보냅니다."""
+        if self.pool is not None:
+            for entry in frames:
+                self.pool.give(entry[1])
+        frames.clear()
+
+    def _clear_preroll(self):
+        self._release(self._preroll)
+        self._preroll_next = 0
+        self._preroll_done = PREROLL_FRAMES <= 0
+
+    def _store_preroll(self, index, ret, frame, output_size):
+        """(락을 잡은 상태에서) 프리롤 중 디코딩한 프레임을 보관합니다."""
+        if not self._eof:
+            # 디코딩하는 사이 루프 전환으로 프리롤이 링으로 넘어갔으면 링 뒤에 바로 이어 붙임
+            if ret and index == self._next_index:
+                self._frames.append((index, frame, output_size))
+                self._next_index = index + 1
+                self.decoded_frames += 1
+            elif not ret:
+                self._reached_eof()
+        elif not ret:
+            self._preroll_done = True
+        else:
+            self._preroll.append((index, frame, output_size))
+            self._preroll_next = index + 1
+            self.decoded_frames += 1
+            self._preroll_done = len(self._preroll) >= PREROLL_FRAMES
+        self._cond.notify_all()
+
+    def seek(self, frame_idx):
+        """링을 비우고 frame_idx부터 다시 디코딩하도록 요청합니다. (즉시 반환)
+
+        frame_idx가 미리 디코딩해 둔 시작 프레임 안에 있으면 탐색 없이 링만 교체하고 True를 반환합니다.
+        """
+        with self._cond:
+            if self._preroll and self._preroll[0][0] <= frame_idx <= self._preroll[-1][0]:
+                self._release(self._frames)
+                self._frames = deque(f for f in self._preroll if f[0] >= frame_idx)
+                self._next_index = self._preroll[-1][0] + 1 # 캡처는 이미 프리롤 다음 위치에 있음
+                self._preroll.clear()
+                self._preroll_next = 0
+                self._preroll_done = True
+                self._eof = False
+                self._seek_to = None
+                self._target = frame_idx
+                self._cond.notify_all()
+                return True
+            self._seek_to = frame_idx
+            self._target = frame_idx
+            self._release(self._frames)
+            self._cond.notify_all()
+
+    def set_target(self, frame_idx):
+        """재생 시계의 현재 목표 프레임을 알려 줍니다. 이보다 앞선 프레임은 grab()으로 건너뜁니다."""
+        with self._cond:
+            self._target = frame_idx
+
+    def take(self, frame_idx):
+        """frame_idx 프레임이 준비되어 있으면 (프레임, 축소 기준 패널 크기)로 꺼내 반환하고, 아니면 None을 반환합니다.
+
+        패널 크기가 None이면 원본 크기의 BGR 프레임입니다.
+        """
+        with self._cond:
+            self._target = max(self._target, frame_idx)
+            while self._frames and self._frames[0][0] < frame_idx:
+                self._release([self._frames.popleft()])
+                self.discarded_frames += 1
+            self.min_depth = min(self.min_depth, len(self._frames))
+
+            frame = None
+            if self._frames and self._frames[0][0] == frame_idx:
+                frame = self._frames.popleft()[1:]
+            elif not self._eof:
+                self.underruns += 1
+            self._cond.notify_all()
+            return frame
+
+    def wait_frame(self, frame_idx, timeout=1.0):
+        """frame_idx 프레임이 디코딩될 때까지 최대 timeout초 기다린 뒤 take()와 같은 형태로 꺼내 반환합니다."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                while self._frames and self._frames[0][0] < frame_idx:
+                    self._release([self._frames.popleft()])
+                    self._cond.notify_all()
+                if self._frames and self._frames[0][0] == frame_idx and self._seek_to is None:
+                    frame = self._frames.popleft()[1:]
+                    self._cond.notify_all()
+                    return frame
+                remaining = deadline - time.monotonic()
+                if (self._eof and self._seek_to is None) or remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def stats(self):
+        """큐 깊이와 언더런 횟수 등 디코딩 통계를 반환합니다."""
+        with self._cond:
+            return {
+                'depth': len(self._frames),
+                'capacity': self.capacity,
+                'min_depth': self.min_depth,
+                'decoded': self.decoded_frames,
+                'skipped': self.skipped_frames,
+                'discarded': self.discarded_frames,
+                'underruns': self.underruns,
+            }
+
+    def reset_stats(self):
+        with self._cond:
+            self.decoded_frames = 0
+            self.skipped_frames = 0
+            self.discarded_frames = 0
+            self.underruns = 0
+            self.min_depth = len(self._frames)
+
+    def stop(self, timeout=2.0):
+        """스레드를 종료하고 캡처를 해제합니다."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self.is_alive():
+            self.join(timeout)
+
+
+def file_cache_key(path):
+    """경로, 크기, 수정 시각으로 파일별 디스크 캐시 키를 만듭니다. (파일이 바뀌면 키도 바뀜)"""
+    st = os.stat(path)
+    ident = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}"
+    return hashlib.sha1(ident.encode("utf-8")).hexdigest()
+
+
+def save_npz_atomic(cache_file, **arrays):
+    """고유한 임시 파일에 npz를 다 쓴 뒤 cache_file로 바꿉니다. (여러 스레드/프로세스가 같은 캐시를 써도 안전)"""
+    folder = os.path.dirname(cache_file)
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_file = tempfile.mkstemp(suffix=".tmp.npz", prefix=os.path.basename(cache_file) + "_", dir=folder)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_file, cache_file)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+
+
+class KeyframeIndex:
+    """영상 하나의 키프레임 위치(프레임 번호)와 타임스탬프(ms) 목록"""
+
+    def __init__(self, frames, timestamps):
+        self.frames = np.asarray(frames, dtype=np.int64)
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+
+    def keyframe_before(self, frame_idx):
+        """frame_idx 이하인 가장 가까운 키프레임 번호를 반환합니다."""
+        i = int(np.searchsorted(self.frames, frame_idx, side='right')) - 1
+        return int(self.frames[max(i, 0)]) if len(self.frames) else 0
+
+    @classmethod
+    def build(cls, path, should_stop=lambda: False):
+        """영상을 디코딩 없이(raw 패킷 grab) 한 번 훑어 키프레임 인덱스를 만듭니다.
+
+        OpenCV FFmpeg 백엔드가 키프레임 정보를 제공하지 않으면 None을 반환합니다.
+        """
+        if not hasattr(cv2, 'CAP_PROP_LRF_HAS_KEY_FRAME'):
+            return None
+        cap = cv2.VideoCapture(path, cv2.CAP_FFMPEG, [cv2.CAP_PROP_FORMAT, -1])
+        try:
+            if not cap.isOpened():
+                return None
+            frames, timestamps = [], []
+            i = 0
+            while cap.grab():
+                if should_stop():
+                    return None
+                if cap.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME):
+                    frames.append(i)
+                    timestamps.append(cap.get(cv2.CAP_PROP_POS_MSEC))
+                i += 1
+        finally:
+            cap.release()
+        if not frames:
+            return None
+        return cls(frames, timestamps)
+
+    @classmethod
+    def load(cls, cache_file):
+        with np.load(cache_file) as data:
+            return cls(data['frames'], data['timestamps'])
+
+    def save(self, cache_file):
+        save_npz_atomic(cache_file, frames=self.frames, timestamps=self.timestamps)
+
+
+class SharedFileJob(threading.Thread):
+    """[신규] 파일 하나에 대해 한 번만 도는 백그라운드 작업. 같은 파일을 연 패널들이 함께 구독합니다.
+
+    결과가 나오면 구독한 패널마다 콜백을 부르고, 끝난 뒤에 구독하면 바로 부릅니다.
+    구독한 패널이 모두 빠지면 작업을 멈춥니다.
+    """
+
+    def __init__(self, name):
+        super().__init__(name=name, daemon=True)
+        self.result = None
+        self.finished = False
+        self._listeners = {} # 패널 key -> on_ready(result)
+        self._lock = threading.Lock()
+        self._stopped = False
+
+    def subscribe(self, key, on_ready):
+        with self._lock:
+            self._listeners[key] = on_ready
+            if not self.finished:
+                return
+        if self.result is not None:
+            on_ready(self.result)
+
+    def unsubscribe(self, key):
+        """key 패널의 구독을 끊습니다. 아직 구독한 패널이 남아 있으면 True"""
+        with self._lock:
+            self._listeners.pop(key, None)
+            if self._listeners:
+                return True
+        self.stop()
+        return False
+
+    def finish(self, result):
+        """(작업 스레드) 결과를 저장하고 구독한 패널들에 알립니다."""
+        with self._lock:
+            self.result = result
+            self.finished = True
+            listeners = list(self._listeners.values())
+        if result is not None and not self._stopped:
+            for on_ready in listeners:
+                on_ready(result)
+
+    def stop(self):
+        self._stopped = True
+
+
+class KeyframeIndexer(SharedFileJob):
+    """열린 파일마다 한 번, 백그라운드에서 키프레임 인덱스를 만들거나 디스크 캐시에서 읽습니다."""
+
+    def __init__(self, path):
+        super().__init__(f"keyframe-index-{os.path.basename(path)}")
+        self.path = path
+
+    @property
+    def index(self):
+        """완료 후의 KeyframeIndex (만들 수 없었으면 None)"""
+        return self.result
+
+    def run(self):
+        index = None
+        try:
+            cache_file = os.path.join(CACHE_DIR, "keyframes", file_cache_key(self.path) + ".npz")
+            if os.path.exists(cache_file):
+                index = KeyframeIndex.load(cache_file)
+            else:
+                start = time.perf_counter()
+                index = KeyframeIndex.build(self.path, lambda: self._stopped)
+                if index is not None:
+                    index.save(cache_file)
+                    logger.info("[키프레임 인덱스] %s: 키프레임 %d개 (%.2fs)",
+                                os.path.basename(self.path), len(index.frames), time.perf_counter() - start)
+        except Exception as e:
+            logger.warning("[키프레임 인덱스] %s 인덱싱 실패: %s", self.path, e)
+            index = None
+        finally:
+            self.finish(index)
+
+
+class ThumbnailStrip:
+    """[신규] 영상 하나의 미리보기 썸네일 묶음.
+
+    같은 크기의 썸네일을 격자로 이어 붙인 아틀라스 한 장과 썸네일별 프레임 번호로 이루어지며,
+    디스크에는 아틀라스를 JPEG 한 장으로 압축해 저장합니다.
+    """
+
+    def __init__(self, atlas, frames, tile_size):
+        self.atlas = atlas
+        self.frames = np.asarray(frames, dtype=np.int64)
+        self.tile_size = (int(tile_size[0]), int(tile_size[1]))
+        self.columns = max(1, atlas.shape[1] // self.tile_size[0])
+
+    def __len__(self):
+        return len(self.frames)
+
+    def index_of(self, frame_idx):
+        """frame_idx 이하에서 가장 가까운 썸네일 번호"""
+        return max(0, int(np.searchsorted(self.frames, frame_idx, side='right')) - 1)
+
+    def tile(self, i):
+        """i번 썸네일 (아틀라스의 뷰, BGR)"""
+        w, h = self.tile_size
+        r, c = divmod(i, self.columns)
+        return self.atlas[r * h:(r + 1) * h, c * w:(c + 1) * w]
+
+    @classmethod
+    def build(cls, path, index=None, interval=THUMB_INTERVAL_S, size=THUMB_SIZE, should_stop=lambda: False):
+        """interval초마다 (최대 THUMB_MAX_COUNT장) 한 장씩 썸네일을 만듭니다.
+
+        키프레임 인덱스가 있으면 각 위치 직전의 키프레임으로 맞춰, 탐색 후 GOP 중간까지 디코딩하지 않고
+        키프레임 자체를 썸네일로 씁니다.
+        """
+        cap = cv2.VideoCapture(path)
+        try:
+            if not cap.isOpened():
+                return None
+            fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+            count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            if count <= 0:
+                return None
+            interval = max(interval, count / fps / THUMB_MAX_COUNT)
+            targets = range(0, count, max(1, int(round(fps * interval))))
+            if index is not None:
+                targets = sorted({index.keyframe_before(target) for target in targets})
+            tiles, frames, tile_size = [], [], None
+            position = 0 # 다음 read()가 반환할 프레임 번호
+            for target in targets:
+                if should_stop():
+                    return None
+                if target != position:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                position = target + 1
+                if tile_size is None:
+                    tile_size = fit_size(frame.shape[1], frame.shape[0], size)
+                tiles.append(cv2.resize(frame, tile_size, interpolation=cv2.INTER_AREA))
+                frames.append(target)
+        finally:
+            cap.release()
+        if not tiles:
+            return None
+        w, h = tile_size
+        columns = int(np.ceil(np.sqrt(len(tiles))))
+        atlas = np.zeros((-(-len(tiles) // columns) * h, columns * w, 3), np.uint8)
+        for i, tile in enumerate(tiles):
+            r, c = divmod(i, columns)
+            atlas[r * h:(r + 1) * h, c * w:(c + 1) * w] = tile
+        return cls(atlas, frames, tile_size)
+
+    @classmethod
+    def load(cls, cache_file):
+        with np.load(cache_file) as data:
+            atlas = cv2.imdecode(data['atlas'], cv2.IMREAD_COLOR)
+            if atlas is None:
+                raise ValueError("썸네일 아틀라스를 읽을 수 없습니다.")
+            return cls(atlas, data['frames'], data['tile_size'])
+
+    def save(self, cache_file):
+        ok, jpeg = cv2.imencode(".jpg", self.atlas, [cv2.IMWRITE_JPEG_QUALITY, THUMB_JPEG_QUALITY])
+        if not ok:
+            raise IOError("썸네일 아틀라스를 JPEG로 인코딩할 수 없습니다.")
+        save_npz_atomic(cache_file, atlas=jpeg, frames=self.frames, tile_size=np.array(self.tile_size))
+
+
+class ThumbnailWorker(SharedFileJob):
+    """[신규] 열린 파일마다 한 번, 백그라운드에서 미리보기 썸네일을 만들거나 디스크 캐시에서 읽습니다.
+
+    캐시에 없으면 같은 파일의 KeyframeIndexer가 끝나기를 기다렸다가 그 인덱스로 키프레임만 디코딩합니다.
+    """
+
+    def __init__(self, path, indexer):
+        super().__init__(f"thumbnails-{os.path.basename(path)}")
+        self.path = path
+        self.indexer = indexer
+
+    def run(self):
+        strip = None
+        try:
+            cache_file = os.path.join(CACHE_DIR, "thumbnails", file_cache_key(self.path) + ".npz")
+            if os.path.exists(cache_file):
+                strip = ThumbnailStrip.load(cache_file)
+            else:
+                if self.indexer is not None:
+                    self.indexer.join()
+                start = time.perf_counter()
+                strip = ThumbnailStrip.build(self.path, getattr(self.indexer, 'index', None),
+                                             should_stop=lambda: self._stopped)
+                if strip is not None:
+                    strip.save(cache_file)
+                    logger.info("[미리보기] %s: 썸네일 %d장 (%.2fs)",
+                                os.path.basename(self.path), len(strip), time.perf_counter() - start)
+        except Exception as e:
+            logger.warning("[미리보기] %s 썸네일 생성 실패: %s", self.path, e)
+            strip = None
+        finally:
+            self.finish(strip)
+
+
+class FramePool:
+    """[신규] 표시 크기 프레임 버퍼를 크기별로 모아 두었다가 다시 빌려주는 풀. (여러 스레드에서 사용)
+
+    FrameCache가 밀어낸 프레임을 돌려받고, 디코더가 축소 결과를 쓸 버퍼를 여기서 빌립니다.
+    패널 크기가 바뀌지 않는 한 같은 버퍼들이 계속 돌기 때문에 프레임마다 새 배열을 할당하지 않습니다.
+    예산을 넘으면 가장 오래 요청되지 않은 크기(= 이전 패널 크기)의 버퍼부터 버립니다.
+
+    화면 업로드 대기(GL)나 루프 캐시 기록 대기처럼 프레임을 잠시 들고 있는 곳은 lend()로 빌리고
+    다 쓰면 release()로 돌려줍니다. 캐시가 버린(recycle) 프레임은 빌려간 곳이 모두 돌려준 뒤에야 풀에 들어갑니다.
+    """
+
+    def __init__(self, max_bytes=FRAME_POOL_BYTES):
+        self.max_bytes = max_bytes
+        self._free = OrderedDict() # shape -> [배열], 최근에 요청된 크기가 뒤쪽
+        self._lent = {}            # id(프레임) -> [프레임, 빌려간 곳 수, 주인이 이미 버렸는지]
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.reused = 0
+        self.allocated = 0
+        self.returned = 0
+
+    def take(self, shape):
+        """shape 크기의 uint8 버퍼를 빌립니다. (남은 버퍼가 없으면 새로 할당)"""
+        with self._lock:
+            free = self._free.get(shape)
+            if free is None:
+                free = self._free[shape] = []
+            self._free.move_to_end(shape)
+            if free:
+                frame = free.pop()
+                self.nbytes -= frame.nbytes
+                self.reused += 1
+                return frame
+            self.allocated += 1
+        return np.empty(shape, np.uint8)
+
+    def give(self, frame):
+        """다 쓴 버퍼를 돌려받습니다. 요청된 적 없는 크기나 다른 배열의 뷰는 받지 않습니다."""
+        if frame.dtype != np.uint8 or not (frame.flags.owndata and frame.flags.c_contiguous and frame.flags.writeable):
+            return False
+        with self._lock:
+            if frame.shape not in self._free:
+                return False
+            while self.nbytes + frame.nbytes > self.max_bytes:
+                stale_shape = next(iter(self._free))
+                if stale_shape == frame.shape:
+                    return False
+                for old in self._free.pop(stale_shape):
+                    self.nbytes -= old.nbytes
+            self._free[frame.shape].append(frame)
+            self.nbytes += frame.nbytes
+            self.returned += 1
+        return True
+
+    def lend(self, frame):
+        """frame을 다 쓸 때까지 풀로 돌아가지 않게 빌립니다. (다 쓰면 release)"""
+        with self._lock:
+            entry = self._lent.get(id(frame))
+            if entry is None:
+                self._lent[id(frame)] = [frame, 1, False]
+            else:
+                entry[1] += 1
+
+    def release(self, frame):
+        """lend()로 빌린 frame을 돌려줍니다. 주인이 이미 버렸고 빌려간 곳이 더 없으면 풀에 넣습니다."""
+        with self._lock:
+            entry = self._lent.get(id(frame))
+            if entry is None or entry[0] is not frame:
+                return
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del self._lent[id(frame)]
+        if entry[2]:
+            self.give(frame)
+
+    def recycle(self, frame):
+        """주인(캐시)이 다 쓴 frame을 풀에 넣습니다. 빌려간 곳이 있으면 모두 돌려준 뒤로 미룹니다."""
+        with self._lock:
+            entry = self._lent.get(id(frame))
+            if entry is not None and entry[0] is frame:
+                entry[2] = True
+                return
+        self.give(frame)
+
+    def stats(self):
+        with self._lock:
+            return {'bytes': self.nbytes, 'shapes': len(self._free), 'allocated': self.allocated,
+                    'reused': self.reused, 'returned': self.returned, 'lent': len(self._lent)}
+
+
+class FrameCache:
+    """(스트림 키, 프레임 번호)별로 표시 크기로 줄인 프레임을 보관하는 LRU 캐시.
+
+    모든 패널이 하나의 바이트 예산을 공유하며, 예산을 넘으면 가장 오래 쓰이지 않은 프레임부터 버립니다.
+    프레임은 만들어질 때의 패널 크기와 함께 저장되어, 패널 크기가 바뀌면 자동으로 미스 처리됩니다.
+    pool을 주면 버린 프레임을 그 풀로 돌려보냅니다. (아직 빌려간 곳이 있으면 돌려받은 뒤에)
+    """
+
+    def __init__(self, max_bytes=FRAME_CACHE_BYTES, pool=None):
+        self.max_bytes = max_bytes
+        self.pool = pool
+        self._entries = OrderedDict() # (stream_key, frame_idx) -> (panel_size, frame)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, stream_key, frame_idx, panel_size):
+        entry = self._entries.get((stream_key, frame_idx))
+        if entry is None or entry[0] != panel_size:
+            self.misses += 1
+            return None
+        self._entries.move_to_end((stream_key, frame_idx))
+        self.hits += 1
+        return entry[1]
+
+    def put(self, stream_key, frame_idx, panel_size, frame):
+        if frame.nbytes > self.max_bytes:
+            return
+        self._remove((stream_key, frame_idx), keep=frame)
+        self._entries[(stream_key, frame_idx)] = (panel_size, frame)
+        self.nbytes += frame.nbytes
+        while self.nbytes > self.max_bytes:
+            _, (_, old) = self._entries.popitem(last=False)
+            self.nbytes -= old.nbytes
+            self.evictions += 1
+            self._recycle(old)
+
+    def invalidate(self, stream_key):
+        """영상이 교체되었을 때 해당 스트림의 프레임을 모두 버립니다."""
+        for cache_key in [k for k in self._entries if k[0] == stream_key]:
+            self._remove(cache_key)
+
+    def _remove(self, cache_key, keep=None):
+        entry = self._entries.pop(cache_key, None)
+        if entry is not None:
+            old = entry[1]
+            self.nbytes -= old.nbytes
+            if old is not keep: # 같은 프레임을 다시 넣는 경우는 버리지 않음
+                self._recycle(old)
+
+    def _recycle(self, frame):
+        """버린 프레임을 풀로 돌려보냅니다. 화면 업로드나 루프 캐시 기록을 기다리는 중이면 풀이 그 뒤로 미룹니다."""
+        if self.pool is not None:
+            self.pool.recycle(frame)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.nbytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+        }
+
+
+# --- 프로세스 디코딩 모드의 공유 메모리 헤더 구성 (int64 단위) ---
+SHM_WRITE, SHM_READ, SHM_DECODED, SHM_SKIPPED, SHM_EOF_GEN, SHM_TARGET = range(6)
+SHM_HEADER_FIELDS = 8
+SHM_SLOT_IDX, SHM_SLOT_GEN, SHM_SLOT_H, SHM_SLOT_W, SHM_SLOT_FIT_W, SHM_SLOT_FIT_H = range(6)
+SHM_SLOT_FIELDS = 6
+
+
+def _shm_layout(capacity, slot_bytes):
+    """공유 메모리의 헤더 크기(바이트)와 전체 크기를 계산합니다."""
+    header_bytes = (SHM_HEADER_FIELDS + capacity * SHM_SLOT_FIELDS) * 8
+    header_bytes = (header_bytes + 63) // 64 * 64
+    return header_bytes, header_bytes + capacity * slot_bytes
+
+
+def _shm_views(shm, capacity, slot_bytes):
+    header_bytes, _ = _shm_layout(capacity, slot_bytes)
+    header = np.ndarray((SHM_HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+    slot_headers = np.ndarray((capacity, SHM_SLOT_FIELDS), dtype=np.int64, buffer=shm.buf,
+                              offset=SHM_HEADER_FIELDS * 8)
+    slots = np.ndarray((capacity, slot_bytes), dtype=np.uint8, buffer=shm.buf, offset=header_bytes)
+    return header, slot_headers, slots
+
+
+def process_decoder_main(path, shm_name, capacity, slot_bytes, commands):
+    """[프로세스 디코딩 모드] 자식 프로세스의 디코딩 루프. 표시 크기로 줄인 프레임을 공유 메모리 링에 직접 씁니다."""
+    shm = shared_memory.SharedMemory(name=shm_name) # 해제(unlink)는 부모 프로세스가 책임짐
+    header, slot_headers, slots = _shm_views(shm, capacity, slot_bytes)
+    cap = cv2.VideoCapture(path)
+
+    generation, seek_to, output_size, index, stride = 0, 0, None, None, 1.0
+    next_index = cap_pos = 0
+    eof = False
+    try:
+        while True:
+            waiting = eof or header[SHM_WRITE] - header[SHM_READ] >= capacity
+            try:
+                cmd = commands.get(timeout=0.01) if waiting else commands.get_nowait()
+            except queue.Empty:
+                cmd = None
+            while cmd is not None:
+                if cmd[0] == 'stop':
+                    return
+                elif cmd[0] == 'seek':
+                    _, generation, seek_to = cmd
+                    eof = False
+                elif cmd[0] == 'size':
+                    output_size = cmd[1]
+                elif cmd[0] == 'index':
+                    index = KeyframeIndex(cmd[1], cmd[2])
+                elif cmd[0] == 'stride':
+                    stride = cmd[1]
+                try:
+                    cmd = commands.get_nowait()
+                except queue.Empty:
+                    cmd = None
+
+            if seek_to is not None:
+                cap_pos = seek_capture(cap, cap_pos, seek_to, index)
+                next_index, seek_to = seek_to, None
+                continue
+            if eof or header[SHM_WRITE] - header[SHM_READ] >= capacity:
+                continue
+
+            if next_index < header[SHM_TARGET] or not frame_needed(next_index, stride):
+                # 이미 표시 시점이 지났거나 마스터 타임라인에서 쓰이지 않는 프레임은 디코딩하지 않고 건너뜀
+                ret = cap.grab()
+                cap_pos += 1
+                if ret:
+                    next_index += 1
+                    header[SHM_SKIPPED] += 1
+                else:
+                    eof = True
+                    header[SHM_EOF_GEN] = generation
+                continue
+
+            ret, frame = cap.read()
+            cap_pos += 1
+            if not ret:
+                eof = True
+                header[SHM_EOF_GEN] = generation
+                continue
+
+            slot = header[SHM_WRITE] % capacity
+            h, w = frame.shape[:2]
+            fitted = (-1, -1)
+            if output_size is not None:
+                fw, fh = fit_size(w, h, output_size)
+                if fw * fh * 3 <= slot_bytes:
+                    dst = slots[slot, :fw * fh * 3].reshape(fh, fw, 3)
+                    if (fw, fh) == (w, h):
+                        np.copyto(dst, frame)
+                    else:
+                        interpolation = cv2.INTER_AREA if fw < w else cv2.INTER_LINEAR
+                        cv2.resize(frame, (fw, fh), dst=dst, interpolation=interpolation)
+                    to_display_format(dst)
+                    h, w, fitted = fh, fw, output_size
+            if fitted == (-1, -1):
+                np.copyto(slots[slot, :w * h * 3].reshape(h, w, 3), frame)
+            slot_headers[slot] = (next_index, generation, h, w, fitted[0], fitted[1])
+            header[SHM_DECODED] += 1
+            header[SHM_WRITE] += 1 # 슬롯을 다 쓴 뒤에 공개
+            next_index += 1
+    finally:
+        cap.release()
+        del header, slot_headers, slots
+        shm.close()
+
+
+class ProcessDecoder:
+    """[프로세스 디코딩 모드] 영상 하나를 별도 프로세스에서 디코딩하고 공유 메모리 링으로 프레임을 받습니다.
+
+    DecoderWorker와 같은 인터페이스를 제공하므로 플레이어 쪽 코드는 그대로 동작합니다.
+    take()가 돌려주는 프레임은 공유 메모리를 복사 없이 가리키는 뷰이며, 다음 take()/seek() 전까지만 유효합니다.
+    """
+
+    frames_are_views = True
+
+    def __init__(self, key, cap, path, capacity=PROCESS_RING_SLOTS):
+        self.key = key
+        self.path = path
+        self.capacity = max(1, capacity)
+        self.frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        self.fps = cap.get(cv2.CAP_PROP_FPS)
+        src_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        src_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        cap.release() # 실제 디코딩은 자식 프로세스가 자기 캡처로 함
+
+        self.slot_bytes = max(src_w * src_h, PROCESS_MAX_OUTPUT[0] * PROCESS_MAX_OUTPUT[1]) * 3
+        _, total_bytes = _shm_layout(self.capacity, self.slot_bytes)
+        self._shm = shared_memory.SharedMemory(create=True, size=total_bytes)
+        self._header, self._slot_headers, self._slots = _shm_views(self._shm, self.capacity, self.slot_bytes)
+        self._header[:] = 0
+        self._header[SHM_EOF_GEN] = -1
+
+        ctx = multiprocessing.get_context("spawn")
+        self._commands = ctx.Queue()
+        self._process = ctx.Process(target=process_decoder_main, name=f"decoder-{key}", daemon=True,
+                                    args=(path, self._shm.name, self.capacity, self.slot_bytes, self._commands))
+        self.generation = 0
+        self._held = False     # 지금 화면에 쓰고 있는 슬롯을 붙잡고 있는지
+        self._output_size = None
+        self._index = None
+        self._stride = 1.0
+
+        # --- 통계 ---
+        self.underruns = 0
+        self.discarded_frames = 0
+        self.min_depth = self.capacity
+        self._base_decoded = 0
+        self._base_skipped = 0
+
+    def start(self):
+        self._process.start()
+
+    @property
+    def output_size(self):
+        return self._output_size
+
+    @output_size.setter
+    def output_size(self, size):
+        self._output_size = size
+        self._commands.put(('size', size))
+
+    @property
+    def stride(self):
+        return self._stride
+
+    @stride.setter
+    def stride(self, stride):
+        self._stride = stride
+        self._commands.put(('stride', stride))
+
+    @property
+    def index(self):
+        return self._index
+
+    @index.setter
+    def index(self, index):
+        self._index = index
+        if index is not None:
+            self._commands.put(('index', index.frames, index.timestamps))
+
+    def _release_held(self):
+        if self._held:
+            self._header[SHM_READ] += 1
+            self._held = False
+
+    def seek(self, frame_idx):
+        self._release_held()
+        self.generation += 1
+        self._header[SHM_TARGET] = frame_idx
+        self._commands.put(('seek', self.generation, frame_idx))
+
+    def set_target(self, frame_idx):
+        self._header[SHM_TARGET] = frame_idx
+
+    def _eof(self):
+        return self._header[SHM_EOF_GEN] == self.generation
+
+    def _poll(self, frame_idx):
+        """링 앞쪽의 낡은 슬롯을 버리고, frame_idx 슬롯이 맨 앞에 있으면 붙잡아 뷰로 반환합니다."""
+        self._release_held()
+        header, slot_headers = self._header, self._slot_headers
+        while header[SHM_READ] < header[SHM_WRITE]:
+            slot = header[SHM_READ] % self.capacity
+            idx, gen, h, w, fit_w, fit_h = slot_headers[slot]
+            if gen != self.generation or idx < frame_idx:
+                header[SHM_READ] += 1
+                if gen == self.generation:
+                    self.discarded_frames += 1
+                continue
+            if idx == frame_idx:
+                self._held = True
+                frame = self._slots[slot, :h * w * 3].reshape(h, w, 3)
+                return frame, ((int(fit_w), int(fit_h)) if fit_w >= 0 else None)
+            break
+        return None
+
+    def take(self, frame_idx):
+        self._header[SHM_TARGET] = max(self._header[SHM_TARGET], frame_idx)
+        result = self._poll(frame_idx)
+        self.min_depth = min(self.min_depth, int(self._header[SHM_WRITE] - self._header[SHM_READ]))
+        if result is None and not self._eof():
+            self.underruns += 1
+        return result
+
+    def wait_frame(self, frame_idx, timeout=1.0):
+        deadline = time.monotonic() + timeout
+        while True:
+            result = self._poll(frame_idx)
+            if result is not None or self._eof() or time.monotonic() >= deadline:
+                return result
+            time.sleep(0.001)
+
+    def stats(self):
+        return {
+            'depth': int(self._header[SHM_WRITE] - self._header[SHM_READ]),
+            'capacity': self.capacity,
+            'min_depth': self.min_depth,
+            'decoded': int(self._header[SHM_DECODED]) - self._base_decoded,
+            'skipped': int(self._header[SHM_SKIPPED]) - self._base_skipped,
+            'discarded': self.discarded_frames,
+            'underruns': self.underruns,
+        }
+
+    def reset_stats(self):
+        self._base_decoded = int(self._header[SHM_DECODED])
+        self._base_skipped = int(self._header[SHM_SKIPPED])
+        self.discarded_frames = 0
+        self.underruns = 0
+        self.min_depth = int(self._header[SHM_WRITE] - self._header[SHM_READ])
+
+    def stop(self, timeout=2.0):
+        """자식 프로세스를 종료하고 공유 메모리를 해제합니다."""
+        if self._shm is None:
+            return
+        if self._process.is_alive():
+            self._commands.put(('stop',))
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join(1.0)
+        self._commands.cancel_join_thread()
+        self._commands.close()
+
+        self._header = self._slot_headers = self._slots = None
+        try:
+            self._shm.close()
+        except BufferError:
+            logger.warning("[디코딩 %s] 공유 메모리 뷰가 남아 있어 매핑 해제를 건너뜁니다.", self.key)
+        self._shm.unlink()
+        self._shm = None
+
+
+def loop_cache_base(path, panel_size):
+    """원본 파일과 패널 크기별 루프 캐시 파일 경로(확장자 제외)"""
+    return os.path.join(CACHE_DIR, "loop", f"{file_cache_key(path)}_{panel_size[0]}x{panel_size[1]}")
+
+
+class LoopCacheWriter(threading.Thread):
+    """첫 번째 루프에서 표시한 프레임을 루프 캐시 파일로 기록합니다.
+
+    프레임 데이터는 <base>.bin에 이어 붙이고, 프레임별 (오프셋, 길이)는 <base>.npz 인덱스에 저장합니다.
+    부하로 건너뛴 프레임은 직전 프레임의 데이터를 가리키게 하여 인덱스에 빈 곳이 없도록 합니다.
+    같은 파일을 같은 크기로 보여주는 패널들은 기록기 하나를 함께 쓰며, 프레임은 key 패널만 넣습니다.
+    임시 파일은 기록기마다 고유한 이름으로 만들어 다 쓴 뒤에만 <base>.*로 바꿉니다.
+    """
+
+    def __init__(self, key, base, codec, first_frame_idx=0, pool=None):
+        super().__init__(name=f"loop-cache-{key}", daemon=True)
+        self.key = key
+        self.base = base
+        self.codec = codec
+        self.pool = pool # 기록할 때까지 프레임을 빌려 둘 FramePool
+        self.expected = first_frame_idx # 다음에 받을 것으로 예상하는 프레임 번호
+        self.aborted = False
+        self.finished = False
+        self.done = False
+        self.ok = False
+        self._queue = queue.Queue(LOOP_CACHE_QUEUE)
+
+    def add(self, frame_idx, frame):
+        """(GUI 스레드) 표시한 프레임을 기록 대기열에 넣습니다. 호출 후 frame을 수정하면 안 됩니다."""
+        if self.aborted or self.finished or self.done:
+            return
+        if frame_idx < self.expected or frame_idx - self.expected > LOOP_CACHE_MAX_GAP:
+            self.aborted = True # 탐색 등으로 연속 재생이 깨짐
+            return
+        self._lend(frame)
+        try:
+            self._queue.put_nowait((frame_idx, frame))
+            self.expected = frame_idx + 1
+        except queue.Full:
+            self._release(frame) # 기록이 밀리면 이 프레임은 직전 프레임으로 대체됨
+
+    def _lend(self, frame):
+        if self.pool is not None:
+            self.pool.lend(frame)
+
+    def _release(self, frame):
+        if self.pool is not None:
+            self.pool.release(frame)
+
+    def finish(self):
+        """(GUI 스레드) 루프가 한 바퀴 끝났음을 알립니다. 남은 프레임을 기록한 뒤 인덱스를 저장합니다."""
+        self.finished = True
+
+    def abort(self):
+        self.aborted = True
+
+    def encode(self, frame):
+        """프레임 하나를 캐시 파일에 쓸 바이트로 만듭니다. 인코딩에 실패하면 IOError (기록 중단, 실시간 디코딩 유지)"""
+        if self.codec == "jpeg":
+            ok, data = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, LOOP_CACHE_JPEG_QUALITY])
+            if not ok:
+                raise IOError("루프 캐시 프레임을 JPEG로 인코딩할 수 없습니다.")
+            return data.tobytes()
+        if self.codec == "lz4":
+            return lz4_frame.compress(np.ascontiguousarray(frame).data)
+        return np.ascontiguousarray(frame).tobytes()
+
+    def run(self):
+        folder, prefix = os.path.split(self.base)
+        tmp_bin = tmp_index = None
+        offsets, lengths, shape = [], [], None
+        try:
+            os.makedirs(folder, exist_ok=True)
+            fd, tmp_bin = tempfile.mkstemp(suffix=".bin.tmp", prefix=prefix + "_", dir=folder)
+            with os.fdopen(fd, "wb") as f:
+                while not self.aborted:
+                    try:
+                        frame_idx, frame = self._queue.get(timeout=0.1)
+                    except queue.Empty:
+                        if self.finished:
+                            break
+                        continue
+                    try:
+                        if shape is None:
+                            if frame_idx != 0:
+                                self.aborted = True # 0번 프레임부터 기록해야 루프 전체를 덮을 수 있음
+                                break
+                            shape = frame.shape
+                        elif frame.shape != shape:
+                            self.aborted = True # 패널 크기가 바뀜
+                            break
+                        data = self.encode(frame)
+                    finally:
+                        self._release(frame)
+                    while len(offsets) < frame_idx: # 건너뛴 프레임은 직전 프레임을 가리킴
+                        offsets.append(offsets[-1])
+                        lengths.append(lengths[-1])
+                    offsets.append(f.tell())
+                    lengths.append(len(data))
+                    f.write(data)
+
+            if self.aborted or not offsets:
+                return
+            fd, tmp_index = tempfile.mkstemp(suffix=".tmp.npz", prefix=prefix + "_", dir=folder)
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, offsets=np.asarray(offsets, np.int64), lengths=np.asarray(lengths, np.int64),
+                         shape=np.asarray(shape, np.int64), codec=np.asarray(self.codec))
+            os.replace(tmp_bin, self.base + ".bin")
+            tmp_bin = None
+            os.replace(tmp_index, self.base + ".npz")
+            tmp_index = None
+            self.ok = True
+            logger.info("[루프 캐시 %s] %d프레임 기록 완료 (%s, %.1fMB)", self.key, len(offsets), self.codec,
+                        os.path.getsize(self.base + ".bin") / 2**20)
+        except Exception as e:
+            logger.warning("[루프 캐시 %s] 기록 실패: %s", self.key, e)
+        finally:
+            for path in (tmp_bin, tmp_index): # 중단되었거나 실패하면 이 기록기의 임시 파일만 지움
+                if path is not None and os.path.exists(path):
+                    os.remove(path)
+            self.done = True
+            while True: # 기록하지 못하고 남은 프레임은 풀에 돌려줌
+                try:
+                    self._release(self._queue.get_nowait()[1])
+                except queue.Empty:
+                    break
+
+
+class LoopCacheSource:
+    """루프 캐시 파일을 mmap으로 열어 디코더 대신 프레임을 공급합니다. (DecoderWorker와 같은 take/wait_frame 인터페이스)
+
+    같은 캐시 파일을 쓰는 패널들은 이 객체 하나를 함께 씁니다.
+    """
+
+    frames_are_views = False
+
+    def __init__(self, key, base, panel_size):
+        self.key = key
+        self.base = base
+        self.panel_size = panel_size
+        with np.load(base + ".npz") as index:
+            self.offsets = index['offsets']
+            self.lengths = index['lengths']
+            self.shape = tuple(int(v) for v in index['shape'])
+            self.codec = str(index['codec'])
+        self.frame_count = len(self.offsets)
+        self._data = np.memmap(base + ".bin", dtype=np.uint8, mode='r')
+        self.served = 0
+
+    @staticmethod
+    def exists(base):
+        return os.path.exists(base + ".npz") and os.path.exists(base + ".bin")
+
+    def frame(self, frame_idx):
+        start, length = int(self.offsets[frame_idx]), int(self.lengths[frame_idx])
+        data = self._data[start:start + length]
+        if self.codec == "jpeg":
+            return cv2.imdecode(data, cv2.IMREAD_COLOR)
+        if self.codec == "lz4":
+            return np.frombuffer(lz4_frame.decompress(data), dtype=np.uint8).reshape(self.shape)
+        return data.reshape(self.shape) # raw: 복사 없이 mmap을 그대로 가리킴
+
+    def take(self, frame_idx):
+        if frame_idx >= self.frame_count:
+            return None # 이 영상이 더 짧으면 마지막 프레임을 유지
+        self.served += 1
+        return self.frame(frame_idx), self.panel_size
+
+    def wait_frame(self, frame_idx, timeout=0):
+        return self.take(frame_idx)
+
+    def stop(self):
+        self._data = None
+
+
+class DecodeScheduler:
+    """[신규] 모든 영상의 디코딩이 CPU 예산(코어 수) 안에 들도록 영상별 프레임률 분할 값을 정합니다.
+
+    영상마다 (프레임당 비용, 초당 디코딩 프레임 수, 가중치)를 받아, 예산을 넘으면 가중치(화면 넓이 x 중요도) 대비
+    아끼는 CPU가 가장 큰 영상의 분할 값을 하나씩 올립니다. 같은 영상을 계속 나누면 손해가 커지도록
+    log(프레임률)로 가치를 매기므로, 작고 덜 중요한 영상부터 고르게 낮아집니다.
+    """
+
+    def __init__(self, budget=DECODE_CPU_BUDGET, max_divisor=DECODE_MAX_DIVISOR):
+        self.budget = budget
+        self.max_divisor = max_divisor
+        self.load = 0.0 # 마지막 배분의 예상 사용 코어 수
+
+    def plan(self, streams):
+        """streams: {key: (프레임당 비용 ms, 초당 디코딩 프레임 수, 가중치)} -> {key: 분할 값}"""
+        divisors = {key: 1 for key in streams}
+
+        def load():
+            return sum(cost * rate / divisors[key] for key, (cost, rate, _) in streams.items()) / 1000
+
+        total = load()
+        while total > self.budget:
+            best, best_ratio = None, None
+            for key, (cost, rate, weight) in streams.items():
+                k = divisors[key]
+                if k >= self.max_divisor or cost * rate <= 0:
+                    continue
+                saving = cost * rate / 1000 * (1 / k - 1 / (k + 1)) # 아끼는 코어
+                ratio = weight * np.log((k + 1) / k) / saving          # 아끼는 코어당 잃는 가치
+                if best is None or ratio < best_ratio:
+                    best, best_ratio = key, ratio
+            if best is None:
+                break
+            divisors[best] += 1
+            total = load()
+        self.load = total
+        return divisors
+
+
+class PresentationClock:
+    """단조 시계(perf_counter)를 기준으로 지금 표시해야 할 프레임 번호를 계산합니다.
+
+    타이머 틱 횟수가 아니라 실제 경과 시간으로 프레임을 정하므로, 틱이 늦어져도
+    표시 시간이 실제 시간보다 뒤처지지 않고 대신 프레임을 건너뜁니다.
+    """
+
+    def __init__(self):
+        self.fps = 30.0
+        self._origin = None # 0번 프레임의 표시 시각 (perf_counter 기준)
+        self.reset_stats()
+
+    @property
+    def running(self):
+        return self._origin is not None
+
+    def start(self, frame_idx, fps=None):
+        """지금 이 순간을 frame_idx의 표시 시각으로 삼아 시계를 시작합니다."""
+        if fps:
+            self.fps = float(fps)
+        self._origin = time.perf_counter() - frame_idx / self.fps
+
+    def stop(self):
+        self._origin = None
+
+    def shift(self, frames):
+        """루프 등으로 타임라인이 frames만큼 되감길 때 기준 시각을 옮깁니다. (누적 오차 없음)"""
+        if self._origin is not None:
+            self._origin += frames / self.fps
+
+    def frame_at(self, now):
+        return int((now - self._origin) * self.fps)
+
+    def deadline(self, frame_idx):
+        """frame_idx 프레임의 표시 시각 (perf_counter 기준)"""
+        return self._origin + frame_idx / self.fps
+
+    def record(self, frame_idx, now, dropped):
+        """프레임 하나를 표시했을 때의 지연(drift)과 건너뛴 프레임 수를 기록합니다."""
+        drift_ms = (now - self.deadline(frame_idx)) * 1000
+        self.presented += 1
+        self.dropped += dropped
+        self.drift_sum_ms += abs(drift_ms)
+        self.drift_max_ms = max(self.drift_max_ms, abs(drift_ms))
+        self.last_drift_ms = drift_ms
+
+    def reset_stats(self):
+        self.presented = 0
+        self.dropped = 0
+        self.drift_sum_ms = 0.0
+        self.drift_max_ms = 0.0
+        self.last_drift_ms = 0.0
+
+    def stats(self):
+        return {
+            'presented': self.presented,
+            'dropped': self.dropped,
+            'drift_avg_ms': self.drift_sum_ms / self.presented if self.presented else 0.0,
+            'drift_max_ms': self.drift_max_ms,
+            'drift_last_ms': self.last_drift_ms,
+        }
+
+
+# =_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=
+#  QLabel 렌더러 (영상마다 패널 하나)
+# =_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=
+class VideoLabel(QLabel):
+    """[신규] 프레임을 QPixmap을 거치지 않고 그리는 영상 패널.
+
+    패널마다 표시 포맷 버퍼 하나와 그 버퍼를 감싼 QImage 하나를 두고, 프레임 크기가 바뀔 때만 새로 만듭니다.
+    새 프레임은 그 버퍼에 복사만 하고 paintEvent에서 바로 그리므로 틱마다 QImage/QPixmap을 할당하지 않습니다.
+    글자(setText)를 지정하면 영상 대신 글자를 보여줍니다.
+    """
+
+    def __init__(self, text="", parent=None):
+        super().__init__(text, parent)
+        self._buffer = None
+        self._image = None
+        self.reallocations = 0 # 버퍼를 새로 만든 횟수 (소크 테스트 확인용)
+
+    def set_frame(self, frame):
+        """표시 포맷(BGR888/RGB888) 프레임을 패널의 버퍼에 복사하고 다시 그리기를 예약합니다."""
+        if self._buffer is None or self._buffer.shape != frame.shape:
+            h, w = frame.shape[:2]
+            self._buffer = np.empty((h, w, 3), np.uint8)
+            self._image = QImage(self._buffer.data, w, h, self._buffer.strides[0], DISPLAY_QIMAGE_FORMAT)
+            self.reallocations += 1
+            if self.text():
+                super().setText("")
+        np.copyto(self._buffer, frame)
+        self.update()
+
+    def setText(self, text):
+        self._buffer = self._image = None
+        super().setText(text)
+
+    def paintEvent(self, event):
+        super().paintEvent(event) # 배경(스타일시트)
+        if self._image is None:
+            return
+        painter = QPainter(self)
+        painter.drawImage((self.width() - self._image.width()) // 2, (self.height() - self._image.height()) // 2,
+                          self._image)
+        painter.end()
+
+
+class SeekPreview(QLabel):
+    """[신규] 탐색 막대 위에 띄우는 미리보기 창. 영상별 썸네일을 영상 탭과 같은 격자로 붙여 보여줍니다."""
+
+    GAP = 2
+    CAPTION_HEIGHT = 18
+
+    def __init__(self, parent=None):
+        super().__init__(parent, Qt.ToolTip | Qt.FramelessWindowHint)
+        self.setStyleSheet("background-color: #1d1d1d; border: 1px solid #3498db;")
+        self._shown = None # 마지막으로 그린 (자막, 썸네일 번호들). 같으면 위치만 옮김
+
+    def show_tiles(self, rows, picks, caption, anchor):
+        """rows: [[key, ...], ...], picks: {key: (ThumbnailStrip, 썸네일 번호)}. anchor(전역 좌표)의 위쪽 가운데에 띄웁니다."""
+        shown = (caption, tuple(sorted((key, i) for key, (_, i) in picks.items())))
+        if shown != self._shown:
+            self._shown = shown
+            self.setPixmap(self.compose(rows, picks, caption))
+            self.adjustSize()
+        self.move(anchor.x() - self.width() // 2, anchor.y() - self.height())
+        self.show()
+
+    def compose(self, rows, picks, caption):
+        tw, th = THUMB_SIZE
+        gap = self.GAP
+        n_cols = max(len(row) for row in rows)
+        width, height = gap + n_cols * (tw + gap), gap + len(rows) * (th + gap) + self.CAPTION_HEIGHT
+        canvas = np.full((height, width, 3), 0x1d, np.uint8)
+        for r, row in enumerate(rows):
+            for c, key in enumerate(row):
+                x, y = gap + c * (tw + gap), gap + r * (th + gap)
+                canvas[y:y + th, x:x + tw] = 0x11
+                if key in picks:
+                    strip, i = picks[key]
+                    tile = strip.tile(i)
+                    h, w = min(tile.shape[0], th), min(tile.shape[1], tw)
+                    ox, oy = x + (tw - w) // 2, y + (th - h) // 2
+                    canvas[oy:oy + h, ox:ox + w] = tile[:h, :w]
+        canvas = to_display_format(canvas)
+        pixmap = QPixmap.fromImage(QImage(canvas.data, width, height, canvas.strides[0], DISPLAY_QIMAGE_FORMAT))
+        painter = QPainter(pixmap)
+        painter.setPen(QColor("white"))
+        painter.setFont(QFont("Arial", 9))
+        painter.drawText(0, height - self.CAPTION_HEIGHT, width, self.CAPTION_HEIGHT, Qt.AlignCenter, caption)
+        painter.end()
+        return pixmap
+
+
+# =_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=
+#  OpenGL 렌더러 (모든 영상을 하나의 표면에 그림)
+# =_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=
+def opengl_available():
+    """OpenGL 2.1 이상 컨텍스트를 만들 수 있는지 확인합니다. (소프트웨어 Mesa/llvmpipe 포함)"""
+    context = QOpenGLContext()
+    if not context.create():
+        return False
+    surface = QOffscreenSurface()
+    surface.setFormat(context.format())
+    surface.create()
+    if not context.makeCurrent(surface):
+        return False
+    fmt = context.format()
+    ok = (fmt.majorVersion(), fmt.minorVersion()) >= (2, 1)
+    context.doneCurrent()
+    return ok
+
+
+class GLVideoGrid(QOpenGLWidget):
+    """여러 영상을 하나의 QOpenGLWidget에 격자로 그리는 렌더러.
+
+    스트림마다 텍스처를 한 번만 만들어 두고, 새 프레임은 픽셀 버퍼(PBO)를 거쳐 glTexSubImage2D로
+    갱신합니다. 프레임은 디코딩한 크기 그대로 올리고, 칸 크기로의 축소/확대(레터박스 포함)와
+    BGR→RGB 변환은 셰이더와 텍스처 필터링에서 처리합니다. 따라서 칸 크기가 바뀌어도 CPU에서 다시 줄이지 않습니다.
+    """
+
+    gl_unavailable = pyqtSignal()   # 초기화에 실패하면 발생 (기존 QLabel 경로로 되돌아감)
+
+    # 사용하는 GL 상수
+    GL_TEXTURE_2D = 0x0DE1
+    GL_RGB = 0x1907
+    GL_RGB8 = 0x8051
+    GL_UNSIGNED_BYTE = 0x1401
+    GL_FLOAT = 0x1406
+    GL_TRIANGLE_STRIP = 0x0005
+    GL_COLOR_BUFFER_BIT = 0x4000
+    GL_TEXTURE_MIN_FILTER = 0x2801
+    GL_TEXTURE_MAG_FILTER = 0x2800
+    GL_TEXTURE_WRAP_S = 0x2802
+    GL_TEXTURE_WRAP_T = 0x2803
+    GL_LINEAR = 0x2601
+    GL_CLAMP_TO_EDGE = 0x812F
+    GL_UNPACK_ALIGNMENT = 0x0CF5
+
+    VERTEX_SHADER = """
+        #version 120
+        attribute vec2 a_pos;      // 0~1 단위 사각형
+        uniform vec4 u_cell;       // 칸의 NDC 좌표 (x, y, 너비, 높이)
+        uniform vec2 u_cell_px;    // 칸 크기 (픽셀)
+        uniform vec2 u_frame_px;   // 프레임 크기 (픽셀)
+        varying vec2 v_uv;
+        void main() {
+            float s = min(u_cell_px.x / u_frame_px.x, u_cell_px.y / u_frame_px.y);
+            vec2 fit = (u_frame_px * s) / u_cell_px;
+            vec2 p = u_cell.xy + ((1.0 - fit) * 0.5 + a_pos * fit) * u_cell.zw;
+            gl_Position = vec4(p, 0.0, 1.0);
+            v_uv = vec2(a_pos.x, 1.0 - a_pos.y);
+        }
+    """
+    FRAGMENT_SHADER = """
+        #version 120
+        uniform sampler2D u_tex;
+        uniform float u_swap_rb;   // 1이면 BGR 데이터
+        varying vec2 v_uv;
+        void main() {
+            vec3 c = texture2D(u_tex, v_uv).rgb;
+            gl_FragColor = vec4(mix(c, c.bgr, u_swap_rb), 1.0);
+        }
+    """
+
+    def __init__(self, rows, column_weights=(350, 650), spacing=4, parent=None):
+        super().__init__(parent)
+        self.rows = rows                        # 예: [['1-1', '1-2'], ['2-1', '2-2']]
+        self.column_weights = column_weights
+        self.spacing = spacing
+        self.failed = False
+        self.gl = None
+        self._textures = {}    # key -> (텍스처 id, 너비, 높이)
+        self._pbos = {}        # key -> [PBO 2개], 번갈아 사용
+        self._pbo_turn = {}
+        self._pending = {}     # 아직 업로드하지 않은 최신 프레임 (pool에서 빌린 상태)
+        self._cells = {}       # key -> (x, y, w, h) 논리 픽셀
+        self.timings = None    # StageTimings (업로드+그리기 시간 기록용)
+        self.pool = None       # FramePool. 업로드할 때까지 프레임을 빌려 둠
+        self.swap_rb = 1.0 if DISPLAY_QIMAGE_FORMAT != QImage.Format_RGB888 else 0.0
+
+    def cell_rect(self, key):
+        """key 칸의 (x, y, 너비, 높이). 아직 배치 전이면 None"""
+        return self._cells.get(key)
+
+    def set_frame(self, key, frame):
+        """새 프레임을 등록합니다. 실제 업로드와 그리기는 다음 paintGL에서 한 번에 합니다."""
+        if self.pool is not None:
+            self.pool.lend(frame)
+        old = self._pending.get(key)
+        self._pending[key] = frame
+        if old is not None and self.pool is not None:
+            self.pool.release(old)
+        self.update()
+
+    def release_pending(self):
+        """업로드하지 않은 프레임을 모두 돌려줍니다. (GL 경로를 그만 쓸 때)"""
+        pending, self._pending = self._pending, {}
+        if self.pool is not None:
+            for frame in pending.values():
+                self.pool.release(frame)
+
+    def cell_size(self, key):
+        cell = self._cells.get(key)
+        return (cell[2], cell[3]) if cell else None
+
+    # --- QOpenGLWidget 인터페이스 ---
+    def initializeGL(self):
+        try:
+            profile = QOpenGLVersionProfile()
+            profile.setVersion(2, 1)
+            self.gl = self.context().versionFunctions(profile)
+            if self.gl is None or not self.gl.initializeOpenGLFunctions():
+                raise RuntimeError("OpenGL 2.1 함수를 사용할 수 없습니다.")
+
+            self.program = QOpenGLShaderProgram(self)
+            if not (self.program.addShaderFromSourceCode(QOpenGLShader.Vertex, self.VERTEX_SHADER) and
+                    self.program.addShaderFromSourceCode(QOpenGLShader.Fragment, self.FRAGMENT_SHADER)):
+                raise RuntimeError(self.program.log())
+            self.program.bindAttributeLocation("a_pos", 0)
+            if not self.program.link():
+                raise RuntimeError(self.program.log())
+
+            quad = np.array([0, 0, 1, 0, 0, 1, 1, 1], dtype=np.float32)
+            self.quad = QOpenGLBuffer(QOpenGLBuffer.VertexBuffer)
+            self.quad.create()
+            self.quad.bind()
+            self.quad.allocate(sip.voidptr(quad.ctypes.data), quad.nbytes)
+            self.quad.release()
+
+            self.gl.glPixelStorei(self.GL_UNPACK_ALIGNMENT, 1)
+            self.gl.glClearColor(0.067, 0.067, 0.067, 1.0)
+        except Exception as e:
+            logger.warning("[GL 렌더러] 초기화 실패, QLabel 렌더러로 전환합니다: %s", e)
+            self.failed = True
+            self.gl_unavailable.emit()
+
+    def resizeGL(self, w, h):
+        self._layout_cells(self.width(), self.height())
+
+    def paintGL(self):
+        if self.failed or self.gl is None:
+            return
+        gl = self.gl
+        t0 = time.perf_counter()
+        gl.glClear(self.GL_COLOR_BUFFER_BIT)
+
+        pending, self._pending = self._pending, {}
+        for key, frame in pending.items():
+            try:
+                self._upload(key, frame)
+            finally:
+                if self.pool is not None:
+                    self.pool.release(frame) # PBO로 복사했으므로 더 들고 있지 않음
+
+        ratio = self.devicePixelRatioF()
+        width, height = self.width(), self.height()
+        self.program.bind()
+        self.program.setUniformValue("u_tex", 0)
+        self.program.setUniformValue("u_swap_rb", self.swap_rb)
+        self.quad.bind()
+        self.program.enableAttributeArray(0)
+        self.program.setAttributeBuffer(0, self.GL_FLOAT, 0, 2)
+        for key, (tex, tw, th) in self._textures.items():
+            cell = self._cells.get(key)
+            if cell is None:
+                continue
+            x, y, w, h = cell
+            # 위쪽이 +1인 NDC 좌표로 변환
+            self.program.setUniformValue("u_cell", QVector4D(
+                x / width * 2 - 1, 1 - (y + h) / height * 2, w / width * 2, h / height * 2))
+            self.program.setUniformValue("u_cell_px", QVector2D(w * ratio, h * ratio))
+            self.program.setUniformValue("u_frame_px", QVector2D(tw, th))
+            gl.glBindTexture(self.GL_TEXTURE_2D, tex)
+            gl.glDrawArrays(self.GL_TRIANGLE_STRIP, 0, 4)
+        self.program.disableAttributeArray(0)
+        self.quad.release()
+        self.program.release()
+        if self.timings is not None:
+            self.timings.add('gl', 'upload_paint', time.perf_counter() - t0)
 
-        # --- 전체 레이아웃 ---
-        main_layout = QVBoxLayout(self)
-        main_layout.setContentsMargins(15, 15, 15, 15)
-        main_layout.setSpacing(10)
+    # --- 내부 구현 ---
+    def _layout_cells(self, width, height):
+        """column_weights 비율로 칸 위치를 계산합니다. (프레임 크기와 무관, 다음 paintGL에서 셰이더가 맞춤)"""
+        total_weight = float(sum(self.column_weights))
+        row_h = (height - self.spacing * (len(self.rows) - 1)) / len(self.rows)
+        for r, row in enumerate(self.rows):
+            x = 0.0
+            usable_w = width - self.spacing * (len(row) - 1)
+            for c, key in enumerate(row):
+                w = usable_w * self.column_weights[c] / total_weight
+                self._cells[key] = (int(x), int(r * (row_h + self.spacing)), max(1, int(w)), max(1, int(row_h)))
+                x += w + self.spacing
 
-        # --- 상단 (제목, 버튼) ---
-        top_layout = QHBoxLayout()
-        title_label = QLabel(title)
-        title_label.setFont(QFont("Arial", 18, QFont.Bold))
-        self.load_button = QPushButton("엑셀 파일 불러오기")
-        self.load_button.clicked.connect(self.load_data)
+    def _upload(self, key, frame):
+        """PBO 두 개를 번갈아 쓰며 텍스처를 부분 갱신합니다. (크기가 바뀔 때만 텍스처 재할당)"""
+        gl = self.gl
+        h, w = frame.shape[:2]
+        frame = np.ascontiguousarray(frame)
+        tex = self._textures.get(key)
+        if tex is None or tex[1:] != (w, h):
+            if tex is None:
+                tex_id = gl.glGenTextures(1)
+                tex_id = tex_id[0] if isinstance(tex_id, (tuple, list)) else tex_id
+            else:
+                tex_id = tex[0]
+            gl.glBindTexture(self.GL_TEXTURE_2D, tex_id)
+            for param, value in ((self.GL_TEXTURE_MIN_FILTER, self.GL_LINEAR), (self.GL_TEXTURE_MAG_FILTER, self.GL_LINEAR),
+                                 (self.GL_TEXTURE_WRAP_S, self.GL_CLAMP_TO_EDGE), (self.GL_TEXTURE_WRAP_T, self.GL_CLAMP_TO_EDGE)):
+                gl.glTexParameteri(self.GL_TEXTURE_2D, param, value)
+            gl.glTexImage2D(self.GL_TEXTURE_2D, 0, self.GL_RGB8, w, h, 0, self.GL_RGB, self.GL_UNSIGNED_BYTE, None)
+            self._textures[key] = (tex_id, w, h)
+        else:
+            tex_id = tex[0]
 
-        top_layout.addWidget(title_label)
-        top_layout.addStretch()
-        top_layout.addWidget(self.load_button)
-        main_layout.addLayout(top_layout)
+        pbos = self._pbos.get(key)
+        if pbos is None:
+            pbos = [QOpenGLBuffer(QOpenGLBuffer.PixelUnpackBuffer) for _ in range(2)]
+            for pbo in pbos:
+                pbo.setUsagePattern(QOpenGLBuffer.StreamDraw)
+                pbo.create()
+            self._pbos[key] = pbos
+        turn = self._pbo_turn.get(key, 0)
+        self._pbo_turn[key] = 1 - turn
+        pbo = pbos[turn]
 
-        # --- 콘텐츠 (표, 그래프) 스플리터 ---
-        content_splitter = QSplitter(Qt.Vertical)
-        
-        # 표
-        self.table = QTableWidget()
-        self.table.setAlternatingRowColors(True)
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.verticalHeader().setVisible(False)
-        
-        table_font = QFont()
-        table_font.setPointSize(16)
-        self.table.setFont(table_font)
+        pbo.bind()
+        pbo.allocate(frame.nbytes) # 이전 내용을 버려(orphan) GPU 대기 없이 쓸 수 있게 함
+        pbo.write(0, sip.voidptr(frame.ctypes.data), frame.nbytes)
+        gl.glBindTexture(self.GL_TEXTURE_2D, tex_id)
+        gl.glTexSubImage2D(self.GL_TEXTURE_2D, 0, 0, 0, w, h, self.GL_RGB, self.GL_UNSIGNED_BYTE, None) # PBO 오프셋 0
+        pbo.release()
 
-        header_font = QFont()
-        header_font.setPointSize(16)
-        header_font.setBold(True)
-        self.table.horizontalHeader().setFont(header_font)
-        
-        content_splitter.addWidget(self.table)
-        
-        # 그래프
-        plt.style.use('dark_background')
-        self.figure = Figure(figsize=(8, 5))
-        self.figure.tight_layout()
-        self.canvas = FigureCanvas(self.figure)
-        content_splitter.addWidget(self.canvas)
-        
-        content_splitter.setSizes([self.height() // 2, self.height() // 2])
-        main_layout.addWidget(content_splitter)
 
-    def load_data(self):
-        """엑셀 파일을 불러와 표, 그래프, 그리고 요약 지표를 업데이트합니다."""
-        file_name, _ = QFileDialog.getOpenFileName(self, "엑셀 파일 선택", "", "Excel Files (*.xlsx *.xls)")
-        if file_name:
+# =_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=
+#  영상 내보내기 (모델 x 시점 비교 화면을 하나의 영상 파일로 인코딩)
+# =_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=
+def export_layout(size):
+    """내보낼 화면 크기에서 시간 표시줄, 모델 제목, 영상 칸의 위치 (x, y, w, h)를 계산합니다. (영상 탭과 같은 비율)"""
+    w, h = size
+    scale = w / 1600
+    band_h = max(20, int(40 * scale))
+    title_w = int(120 * scale)
+    spacing = max(2, int(4 * scale))
+    rows = grid_rows()
+    row_h = (h - band_h - spacing * (len(rows) - 1)) // len(rows)
+    usable_w = w - title_w - spacing * GRID_VIEWS
+    edges = np.round(np.cumsum((0,) + GRID_COLUMN_WEIGHTS) / sum(GRID_COLUMN_WEIGHTS) * usable_w).astype(int)
+    layout = {'band': (0, 0, w, band_h), 'titles': [], 'cells': {}}
+    for r, (title, color, keys) in enumerate(rows):
+        y = band_h + r * (row_h + spacing)
+        layout['titles'].append(((0, y, title_w, row_h), title, color))
+        for c, key in enumerate(keys):
+            x = title_w + spacing * (c + 1) + edges[c]
+            layout['cells'][key] = (int(x), y, int(edges[c + 1] - edges[c]), row_h)
+    return layout
+
+
+def paint_bgr(size, paint):
+    """QPainter로 그린 size 크기 그림을 BGR NumPy 배열로 반환합니다. (QImage 그리기는 작업 스레드에서도 가능)"""
+    image = QImage(size[0], size[1], QImage.Format_RGB32)
+    image.fill(0x1d1d1d)
+    painter = QPainter(image)
+    try:
+        paint(painter)
+    finally:
+        painter.end()
+    ptr = image.constBits()
+    ptr.setsize(image.byteCount())
+    bgra = np.frombuffer(ptr, np.uint8).reshape(size[1], image.bytesPerLine() // 4, 4)
+    return bgra[:, :size[0], :3].copy() # RGB32는 메모리에 B, G, R, A 순서 (리틀 엔디언)
+
+
+class GridExporter(threading.Thread):
+    """[신규] 모든 영상을 재생과 같은 동기화 규칙으로 읽어 영상 탭과 같은 배치의 비교 화면을 영상 파일로 만듭니다.
+
+    디코딩(영상별 스레드) -> 합성 -> 인코딩(cv2.VideoWriter)을 크기가 정해진 큐로 잇는 단계별 파이프라인이며,
+    각 단계가 동시에 돌아 실시간보다 빠르게 내보냅니다. GUI는 progress / done / error 속성을 타이머로 확인합니다.
+    """
+
+    def __init__(self, output_path, video_paths, total_frames, fps, size=EXPORT_SIZE, track_overlays=None):
+        super().__init__(name="grid-exporter", daemon=True)
+        self.output_path = output_path
+        self.video_paths = dict(video_paths)
+        self.total_frames = total_frames
+        self.fps = fps
+        self.size = (size[0] // 2 * 2, size[1] // 2 * 2) # 대부분의 코덱은 짝수 크기만 받음
+        self.track_overlays = dict(track_overlays or {})
+        self.layout = export_layout(self.size)
+        self.progress = 0.0
+        self.frames_written = 0
+        self.error = None
+        self.elapsed = 0.0
+        self.done = False
+        self.cancelled = False
+        self.stage_seconds = {'decode': 0.0, 'composite': 0.0, 'encode': 0.0} # 단계별 실제 작업 시간 합계
+        self._lock = threading.Lock()
+        self.background = None # 제목과 빈 칸이 그려진 바탕 (시작 전에 GUI 스레드에서 그림)
+
+    def cancel(self):
+        self.cancelled = True
+
+    def prepare(self):
+        """바탕(모델 제목, 빈 칸)을 한 번만 그려 둡니다. start() 전에 호출."""
+        def paint(painter):
+            painter.setFont(QFont("Arial", max(8, int(24 * self.size[0] / 1600)), QFont.Bold))
+            for (x, y, w, h), title, color in self.layout['titles']:
+                painter.setPen(QColor(color))
+                painter.drawText(x, y, w, h, Qt.AlignCenter, title)
+            painter.setFont(QFont("Arial", max(6, int(12 * self.size[0] / 1600))))
+            for key, (x, y, w, h) in self.layout['cells'].items():
+                painter.fillRect(x, y, w, h, QColor("#111"))
+                if key not in self.video_paths:
+                    painter.setPen(QColor("white"))
+                    painter.drawText(x, y, w, h, Qt.AlignCenter, f"영상 {key}")
+        self.background = paint_bgr(self.size, paint)
+
+    def _add_time(self, stage, seconds):
+        with self._lock:
+            self.stage_seconds[stage] += seconds
+
+    def _put(self, q, item):
+        while not self.cancelled:
             try:
-                self.df = pd.read_excel(file_name)
-                self.update_table()
-                self.update_plot()
-                
-                self.data_loaded.emit() 
-                
-            except Exception as e:
-                QMessageBox.warning(self, "오류", f"파일을 불러오는 중 오류가 발생했습니다:\n{e}")
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
 
-    def update_table(self):
-        """데이터프레임을 기반으로 표를 채웁니다."""
-        if self.df is None: return
-        
-        self.table.setRowCount(self.df.shape[0])
-        self.table.setColumnCount(self.df.shape[1])
-        self.table.setHorizontalHeaderLabels(self.df.columns)
-        
-        for i in range(self.df.shape[0]):
-            for j in range(self.df.shape[1]):
-                
-                item = QTableWidgetItem(str(self.df.iat[i, j]))
-                item.setTextAlignment(Qt.AlignCenter) 
-                self.table.setItem(i, j, item)
-        
-        self.table.resizeRowsToContents()
+    def _get(self, q):
+        while not self.cancelled:
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return None
 
-    def update_plot(self):
-        """데이터프레임을 기반으로 HOTA, MOTA, IDF1의 평균값 막대 그래프를 그립니다."""
-        if self.df is None: return
-        
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        
-        metrics_to_plot = ['HOTA', 'MOTA', 'IDF1']
-        plot_values = []
-        valid_metric_names = []
+    def run(self):
+        start = time.perf_counter()
+        threads = []
+        try:
+            if self.background is None:
+                raise RuntimeError("prepare()를 먼저 호출해야 합니다.")
+            fourcc = "MJPG" if self.output_path.lower().endswith(".avi") else "mp4v"
+            writer = cv2.VideoWriter(self.output_path, cv2.VideoWriter_fourcc(*fourcc), self.fps, self.size)
+            if not writer.isOpened():
+                raise IOError(f"{self.output_path} 파일을 쓸 수 없습니다.")
+            frame_queues = {key: queue.Queue(EXPORT_QUEUE) for key in self.video_paths}
+            canvas_queue = queue.Queue(EXPORT_QUEUE)
+            errors = []
 
-        for metric in metrics_to_plot:
-            if metric in self.df.columns and pd.api.types.is_numeric_dtype(self.df[metric]):
-                mean_val = self.df[metric].mean()
-                plot_values.append(mean_val)
-                valid_metric_names.append(metric)
+            def guarded(target, *args):
+                try:
+                    target(*args)
+                except Exception as e:
+                    errors.append(e)
+                    self.cancel()
 
-        if not valid_metric_names:
-            ax.text(0.5, 0.5, "표시할 데이터가 없습니다.\n(HOTA, MOTA, IDF1 열 확인)", 
-                    ha='center', va='center', color='gray', fontsize=14) 
-        else:
-            colors = ['#3498db', '#2ecc71', '#e74c3c']
-            bars = ax.bar(valid_metric_names, plot_values, color=colors)
-            ax.bar_label(bars, fmt='%.3f', fontsize=20, padding=3)
+            for key, q in frame_queues.items():
+                threads.append(threading.Thread(target=guarded, args=(self.decode_stream, key, q),
+                                                name=f"export-decode-{key}", daemon=True))
+            threads.append(threading.Thread(target=guarded, args=(self.composite, frame_queues, canvas_queue),
+                                            name="export-composite", daemon=True))
+            for thread in threads:
+                thread.start()
+            try:
+                while self.frames_written < self.total_frames:
+                    canvas = self._get(canvas_queue)
+                    if canvas is None:
+                        break
+                    t0 = time.perf_counter()
+                    writer.write(canvas)
+                    self._add_time('encode', time.perf_counter() - t0)
+                    self.frames_written += 1
+                    self.progress = self.frames_written / self.total_frames
+            finally:
+                writer.release()
+            if errors:
+                raise errors[0]
+        except Exception as e:
+            self.error = e
+            self.cancel()
+        finally:
+            for thread in threads:
+                thread.join(timeout=2.0)
+            self.elapsed = time.perf_counter() - start
+            self.done = True
 
-        ax.set_ylim(0.75, 1)
-        
-        ax.tick_params(axis='x', labelsize=20)
-        ax.tick_params(axis='y', labelsize=20)
+    def decode_stream(self, key, out):
+        """영상 하나를 처음부터 읽어 마스터 프레임마다 (칸 크기로 줄인) 프레임을 하나씩 큐에 넣습니다."""
+        cap = cv2.VideoCapture(self.video_paths[key])
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            stride = fps / self.fps if fps > 0 else 1.0
+            cell = self.layout['cells'][key][2:]
+            position, frame = 0, None # position: 다음 read()가 반환할 프레임 번호
+            for master_idx in range(self.total_frames):
+                target = timeline_frame(master_idx, stride)
+                if count > 0:
+                    target = min(target, count - 1)
+                t0 = time.perf_counter()
+                if frame is None or target >= position:
+                    while position < target: # 마스터보다 빠른 영상은 표시하지 않는 프레임을 디코딩 없이 건너뜀
+                        cap.grab()
+                        position += 1
+                    ret, raw = cap.read()
+                    position += 1
+                    if ret:
+                        frame = fit_frame(raw, cell)
+                        overlay = self.track_overlays.get(key)
+                        if overlay is not None:
+                            overlay.draw(frame, target)
+                    elif frame is None:
+                        frame = np.zeros((1, 1, 3), np.uint8)
+                self._add_time('decode', time.perf_counter() - t0)
+                if not self._put(out, frame): # 느린 영상은 같은 프레임을 다시 넣음 (합성 단계는 읽기만 함)
+                    return
+        finally:
+            cap.release()
 
-        ax.grid(True, axis='y', linestyle='--', alpha=0.6)
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.spines['left'].set_visible(False)
-        ax.tick_params(axis='y', length=0)
-        
-        self.figure.subplots_adjust(
-            left=0.07,
-            right=0.95,
-            top=0.95,
-            bottom=0.1
-        )
-        self.canvas.draw()
+    def composite(self, frame_queues, out):
+        """마스터 프레임마다 각 영상의 프레임을 바탕 위 칸 가운데에 붙이고 시간 표시줄을 그립니다."""
+        band = self.layout['band']
+        time_strip, shown_second = None, None
+        for master_idx in range(self.total_frames):
+            frames = {}
+            for key, q in frame_queues.items():
+                frames[key] = self._get(q)
+                if frames[key] is None:
+                    return
+            t0 = time.perf_counter()
+            canvas = self.background.copy()
+            for key, frame in frames.items():
+                x, y, w, h = self.layout['cells'][key]
+                fh, fw = frame.shape[:2]
+                fh, fw = min(fh, h), min(fw, w)
+                ox, oy = x + (w - fw) // 2, y + (h - fh) // 2
+                canvas[oy:oy + fh, ox:ox + fw] = frame[:fh, :fw]
+            second = int(master_idx / self.fps)
+            if second != shown_second: # 시간 글자는 1초에 한 번만 다시 그림
+                shown_second = second
+                hh, mm, ss = second // 3600, second % 3600 // 60, second % 60
+                text = f"주행중 : {hh:02}시간 {mm:02}분 {ss:02}초"
+                def paint(painter, text=text):
+                    painter.setFont(QFont("Arial", max(6, int(12 * self.size[0] / 1600))))
+                    painter.setPen(QColor("white"))
+                    painter.drawText(0, 0, band[2] - 10, band[3], Qt.AlignRight | Qt.AlignVCenter, text)
+                time_strip = paint_bgr(band[2:], paint)
+            canvas[band[1]:band[1] + band[3], band[0]:band[0] + band[2]] = time_strip
+            self._add_time('composite', time.perf_counter() - t0)
+            if not self._put(out, canvas):
+                return
+
+    def report(self):
+        """처리량 요약 문자열 (내보낸 프레임 수, 속도, 실시간 대비 배수, 단계별 프레임당 시간)"""
+        n = max(1, self.frames_written)
+        fps = self.frames_written / self.elapsed if self.elapsed > 0 else 0.0
+        stages = ", ".join(f"{stage} {sec / n * 1000:.1f}ms" for stage, sec in self.stage_seconds.items())
+        return (f"{self.frames_written}프레임, {self.elapsed:.1f}s ({fps:.1f} fps, 실시간 대비 {fps / self.fps:.2f}배), "
+                f"프레임당 {stages}")
 
 
 # =_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=_=
@@ -217,9 +3295,15 @@ class DualVideoPlayer(QWidget):
         self.setup_video_tab_ui()
 
         # ===================================================================
-        #  2. 결과 탭 UI 구성
+        #  2. 결과 탭 UI 구성 [수정] 창이 뜬 뒤 유휴 시간에 미리 구성 (matplotlib/pandas 로딩을 시작 시점에서 뺌)
         # ===================================================================
-        self.setup_results_tab_ui()
+        self.results_tab_built = False
+        self.results_build = None         # 진행 중인 결과 탭 구성 단계 (build_results_tab 제너레이터)
+        self.results_prewarm = None       # matplotlib/pandas를 미리 import 하는 스레드
+        self.results_build_ms = []        # 미리 구성할 때 GUI 스레드에서 쓴 단계별 시간
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+        if RESULTS_PREBUILD_DELAY_MS >= 0:
+            QTimer.singleShot(RESULTS_PREBUILD_DELAY_MS, self.start_results_prebuild)
 
         # --- 최상위 레이아웃 설정 ---
         top_layout = QVBoxLayout(self)
@@ -242,63 +3326,110 @@ class DualVideoPlayer(QWidget):
         self.time_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
         main_layout.addWidget(self.time_label) 
 
-        # --- 영상 레이블 4개 ---
-        self.video_label1_1 = QLabel("영상 1-1")
-        self.video_label1_2 = QLabel("영상 1-2")
-        self.video_label2_1 = QLabel("영상 2-1")
-        self.video_label2_2 = QLabel("영상 2-2")
-        video_labels = [self.video_label1_1, self.video_label1_2, self.video_label2_1, self.video_label2_2]
-        for label in video_labels:
-            label.setAlignment(Qt.AlignCenter)
-            label.setStyleSheet("background-color: #111; color: white; border-radius: 5px;")
-            label.setMinimumSize(320, 180)
-            label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
-
-        # --- 모델별 영상 프레임 ---
-        model1_frame = self.create_video_frame("기존", "#FF6347", self.video_label1_1, self.video_label1_2)
-        model2_frame = self.create_video_frame("개선", "#3CB371", self.video_label2_1, self.video_label2_2)
-
+        # --- [수정] 영상 레이블 (모델 N개 x 시점 M개, 기본 2 x 2) ---
+        self.video_labels = {}
+        self.panel_sizes = {} # 표시할 프레임 크기: 패널 크기 캐시 (크기가 바뀔 때만 eventFilter에서 갱신), GL이면 디코딩 크기
         self.video_splitter = QSplitter(Qt.Vertical)
-        self.video_splitter.addWidget(model1_frame)
-        self.video_splitter.addWidget(model2_frame)
-        main_layout.addWidget(self.video_splitter) 
+        for title, color, keys in grid_rows():
+            labels = []
+            for key in keys:
+                label = VideoLabel(f"영상 {key}")
+                label.setAlignment(Qt.AlignCenter)
+                label.setStyleSheet("background-color: #111; color: white; border-radius: 5px;")
+                label.setMinimumSize(min(320, 1280 // GRID_VIEWS), min(180, 720 // len(GRID_MODELS)))
+                label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
+                self.panel_sizes[key] = (label.width(), label.height())
+                label.installEventFilter(self)
+                self.video_labels[key] = label
+                labels.append(label)
+
+            # --- 모델별 영상 프레임 ---
+            self.video_splitter.addWidget(self.create_video_frame(title, color, labels))
+
+        # --- 렌더러 선택 (GL을 쓸 수 있으면 하나의 OpenGL 표면에 모든 영상을 그림) ---
+        self.video_stack = QStackedWidget()
+        self.video_stack.addWidget(self.video_splitter)
+        self.gl_grid = None
+        if VIDEO_RENDERER == "gl":
+            if opengl_available():
+                self.video_stack.addWidget(self.create_gl_video_frame())
+                self.video_stack.setCurrentIndex(1)
+            else:
+                logger.warning("[GL 렌더러] OpenGL 2.1 컨텍스트를 만들 수 없어 QLabel 렌더러를 사용합니다.")
+        main_layout.addWidget(self.video_stack) 
 
         # --- 하단 컨트롤 패널 ---
         bottom_panel = self.create_bottom_controls()
         main_layout.addLayout(bottom_panel) 
 
 
-    def create_video_frame(self, title, color, label1, label2):
-        """모델별 영상 표시 프레임을 생성합니다."""
+    def create_video_frame(self, title, color, labels):
+        """모델별 영상 표시 프레임을 생성합니다. (시점별 영상 레이블을 가로로 나열)"""
         frame = QFrame()
         layout = QHBoxLayout(frame)
         
         layout.setContentsMargins(2, 0, 0, 0) 
         
+        title_label = self.create_title_label(title, color)
+        
+        video_splitter = QSplitter(Qt.Horizontal)
+        for label in labels:
+            video_splitter.addWidget(label)
+        video_splitter.setSizes(list(GRID_COLUMN_WEIGHTS))
+
+        layout.addWidget(title_label)
+        layout.addWidget(video_splitter)
+        return frame
+
+    def create_title_label(self, title, color):
         title_label = QLabel(title)
         title_label.setFont(QFont("Arial", 24, QFont.Bold))
         title_label.setStyleSheet(f"color: {color}; background-color: transparent;")
         title_label.setAlignment(Qt.AlignCenter)
         title_label.setFixedWidth(120)
-        
-        video_splitter = QSplitter(Qt.Horizontal)
-        video_splitter.addWidget(label1)
-        video_splitter.addWidget(label2)
-        video_splitter.setSizes([350, 650])
+        return title_label
 
-        layout.addWidget(title_label)
-        layout.addWidget(video_splitter)
+    def create_gl_video_frame(self):
+        """[신규] 제목 열 + 모든 영상을 한 번에 그리는 GLVideoGrid로 된 영상 영역을 생성합니다."""
+        frame = QFrame()
+        layout = QHBoxLayout(frame)
+        layout.setContentsMargins(2, 0, 0, 0)
+
+        titles = QVBoxLayout()
+        for title, color, _ in grid_rows():
+            titles.addWidget(self.create_title_label(title, color), 1)
+
+        self.gl_grid = GLVideoGrid([keys for _, _, keys in grid_rows()], column_weights=GRID_COLUMN_WEIGHTS)
+        self.gl_grid.gl_unavailable.connect(self.use_label_renderer)
+
+        layout.addLayout(titles)
+        layout.addWidget(self.gl_grid, 1)
         return frame
 
+    def use_label_renderer(self):
+        """[신규] GL 초기화에 실패하면 기존 QLabel 렌더러로 되돌립니다."""
+        self.gl_grid.release_pending()
+        self.gl_grid = None
+        self.video_stack.setCurrentIndex(0)
+        for key, label in self.video_labels.items():
+            self.update_panel_size(key, label.width(), label.height())
+
+    def update_panel_size(self, key, width, height):
+        """패널 크기 캐시와 해당 디코더의 축소 크기를 갱신합니다. (QLabel 렌더러 전용)"""
+        self.panel_sizes[key] = (width, height)
+        decoder = self.decoders.get(key) if hasattr(self, 'decoders') else None
+        if decoder:
+            decoder.output_size = self.panel_sizes[key]
+
     def create_bottom_controls(self):
         """영상 제어를 위한 하단 버튼 및 슬라이더를 생성합니다."""
-        self.open_btn1_1 = QPushButton("영상 1-1 열기")
-        self.open_btn1_2 = QPushButton("영상 1-2 열기")
-        self.open_btn2_1 = QPushButton("영상 2-1 열기")
-        self.open_btn2_2 = QPushButton("영상 2-2 열기")
+        # [수정] 영상마다 열기 버튼 (영상이 많으면 글자를 줄임)
+        self.open_buttons = {key: QPushButton(f"영상 {key} 열기" if len(self.video_labels) <= 4 else f"{key} 열기")
+                             for key in self.video_labels}
         self.play_pause_btn = QPushButton("▶ 재생")
+        self.export_btn = QPushButton("영상 내보내기") # [신규] 비교 화면을 영상 파일로 저장
 
-        buttons = [self.open_btn1_1, self.open_btn1_2, self.open_btn2_1, self.open_btn2_2, self.play_pause_btn]
+        buttons = list(self.open_buttons.values()) + [self.export_btn, self.play_pause_btn]
         for btn in buttons:
             btn.setFont(QFont("Arial", 10))
             btn.setStyleSheet(
@@ -309,12 +3440,15 @@ class DualVideoPlayer(QWidget):
             btn.setFixedHeight(40)
         
         self.play_pause_btn.setEnabled(False)
+        self.export_btn.setEnabled(False)
 
-        self.open_btn1_1.clicked.connect(lambda: self.open_file("1-1"))
-        self.open_btn1_2.clicked.connect(lambda: self.open_file("1-2"))
-        self.open_btn2_1.clicked.connect(lambda: self.open_file("2-1"))
-        self.open_btn2_2.clicked.connect(lambda: self.open_file("2-2"))
         self.play_pause_btn.clicked.connect(self.toggle_play_pause)
+        self.export_btn.clicked.connect(self.export_video)
+        for key, btn in self.open_buttons.items():
+            btn.clicked.connect(lambda checked=False, key=key: self.open_file(key))
+            # [신규] 열기 버튼을 우클릭하면 그 영상에 겹쳐 그릴 추적 박스 파일(MOT 형식)을 고름
+            btn.setContextMenuPolicy(Qt.CustomContextMenu)
+            btn.customContextMenuRequested.connect(lambda pos, key=key: self.show_track_menu(key, pos))
 
         self.seek_slider = QSlider(Qt.Horizontal)
         self.seek_slider.setRange(0, 0)
@@ -322,15 +3456,19 @@ class DualVideoPlayer(QWidget):
             QSlider::groove:horizontal { border: 1px solid #999; height: 8px; background: #333; margin: 2px 0; border-radius: 4px; }
             QSlider::handle:horizontal { background: #3498db; border: 1px solid #5c5c5c; width: 18px; margin: -5px 0; border-radius: 9px; }
         """)
-        self.seek_slider.sliderMoved.connect(self.set_video_position)
+        # [수정] 드래그 중에는 썸네일 미리보기만 보여주고, 놓았을 때 한 번만 실제로 탐색
+        self.seek_slider.sliderMoved.connect(self.on_slider_moved)
+        self.seek_slider.sliderReleased.connect(self.on_slider_released)
+        self.seek_slider.setMouseTracking(True) # 마우스를 올리기만 해도 미리보기 표시
+        self.seek_slider.installEventFilter(self)
         self.seek_slider.setEnabled(False)
+        self.seek_preview = SeekPreview(self)
 
         button_layout = QHBoxLayout()
-        button_layout.addWidget(self.open_btn1_1)
-        button_layout.addWidget(self.open_btn1_2)
-        button_layout.addWidget(self.open_btn2_1)
-        button_layout.addWidget(self.open_btn2_2)
+        for btn in self.open_buttons.values():
+            button_layout.addWidget(btn)
         button_layout.addStretch()
+        button_layout.addWidget(self.export_btn)
         button_layout.addWidget(self.play_pause_btn)
 
         full_layout = QVBoxLayout()
@@ -338,14 +3476,92 @@ class DualVideoPlayer(QWidget):
         full_layout.addWidget(self.seek_slider)
         return full_layout
 
-    def setup_results_tab_ui(self):
-        """결과 탭의 UI 요소를 설정합니다."""
-        self.original_model_results = ResultDisplayWidget("기존 모델 결과")
-        self.improved_model_results = ResultDisplayWidget("개선 모델 결과")
+    def on_tab_changed(self, index):
+        if self.tabs.widget(index) is self.results_tab and '결과 탭 첫 전환' not in STARTUP_PHASES:
+            start = time.perf_counter()
+            self.ensure_results_tab()
+            STARTUP_PHASES['결과 탭 첫 전환'] = time.perf_counter() - start # 미리 구성됐으면 0에 가까움
+            report_startup()
+        elif self.tabs.widget(index) is self.results_tab:
+            self.ensure_results_tab()
+        self.update_video_visibility()
 
+    def changeEvent(self, event):
+        if event.type() == QEvent.WindowStateChange:
+            self.update_video_visibility() # 최소화되면 영상 탭도 보이지 않음
+        super().changeEvent(event)
+
+    def ensure_results_tab(self):
+        """[신규] 결과 탭 위젯을 아직 만들지 않았으면 남은 단계를 지금 모두 만듭니다."""
+        if self.results_tab_built:
+            return
+        start = time.perf_counter()
+        if self.results_build is None:
+            self.results_build = self.build_results_tab()
+        for _ in self.results_build:
+            pass
+        self.results_tab_built = True
+        logger.info("[시작 시간] 결과 탭 구성 %.2fs", time.perf_counter() - start)
+
+    def start_results_prebuild(self):
+        """[신규] 결과 탭을 처음 보기 전에 미리 구성하기 시작합니다.
+
+        matplotlib/pandas import(대부분의 시간)는 백그라운드 스레드에서 하고, 끝나면 위젯은
+        QTimer.singleShot 사슬로 이벤트 사이사이에 패널 하나씩 만듭니다. 재생 중에도 한 번에 수십 ms 이상 막지 않습니다.
+        """
+        if self.results_tab_built or self.results_prewarm is not None:
+            return
+        self.results_prewarm = threading.Thread(target=warm_results_imports, name="results-prewarm", daemon=True)
+        self.results_prewarm_start = time.perf_counter()
+        self.results_prewarm.start()
+        QTimer.singleShot(50, self.continue_results_prebuild)
+
+    def continue_results_prebuild(self):
+        """[신규] 미리 구성 사슬의 한 단계. import가 끝나지 않았으면 잠시 뒤 다시 확인합니다."""
+        if self.results_tab_built:
+            return
+        if self.results_prewarm.is_alive():
+            QTimer.singleShot(50, self.continue_results_prebuild)
+            return
+        if self.results_build is None:
+            logger.info("[시작 시간] 결과 탭 import (백그라운드) %.2fs", time.perf_counter() - self.results_prewarm_start)
+            self.results_build = self.build_results_tab()
+        start = time.perf_counter()
+        try:
+            next(self.results_build)
+        except StopIteration:
+            finished = True
+        else:
+            finished = False
+        self.results_build_ms.append((time.perf_counter() - start) * 1000)
+        if not finished:
+            QTimer.singleShot(0, self.continue_results_prebuild)
+            return
+        self.results_tab_built = True
+        STARTUP_PHASES['결과 탭 미리 구성 (유휴)'] = sum(self.results_build_ms) / 1000
+        logger.info("[시작 시간] 결과 탭 미리 구성: GUI 스레드 %d단계, 단계당 최대 %.1fms",
+                    len(self.results_build_ms), max(self.results_build_ms))
+        report_startup()
+
+    def build_results_tab(self):
+        """[수정] 결과 탭의 UI 요소를 설정합니다. (영상 탭의 모델마다 결과 패널 하나, 첫 번째 모델이 비교 기준)
+
+        패널 하나를 만들 때마다 yield 하는 제너레이터입니다. 끝까지 돌리면 결과 탭이 완성됩니다.
+        """
+        self.comparison = ResultComparison()
+        self.model_results = OrderedDict()
         results_splitter = QSplitter(Qt.Horizontal)
-        results_splitter.addWidget(self.original_model_results)
-        results_splitter.addWidget(self.improved_model_results)
+        layout = QVBoxLayout(self.results_tab)
+        layout.addWidget(results_splitter,1)
+        for name in GRID_MODELS:
+            yield
+            widget = ResultDisplayWidget(f"{name} 모델 결과")
+            widget.summary_source = lambda df, name=name: self.comparison.means(name, df)
+            widget.data_loaded.connect(self.update_comparison_summary)
+            self.comparison.register(name)
+            self.model_results[name] = widget
+            results_splitter.addWidget(widget)
+        yield
         
         self.comparison_summary_label = QLabel("각 모델의 엑셀 파일을 불러오세요.")
         self.comparison_summary_label.setFont(QFont("Arial", 28, QFont.Bold))
@@ -360,56 +3576,132 @@ class DualVideoPlayer(QWidget):
             }
         """)
 
-        layout = QVBoxLayout(self.results_tab)
-        layout.addWidget(results_splitter,1)
         layout.addWidget(self.comparison_summary_label)
 
-        self.original_model_results.data_loaded.connect(self.update_comparison_summary)
-        self.improved_model_results.data_loaded.connect(self.update_comparison_summary)
-
     def update_comparison_summary(self):
-        """두 모델의 데이터를 비교하여 하단 요약 라벨을 업데이트합니다."""
-        
-        df_orig = self.original_model_results.df
-        df_impr = self.improved_model_results.df
+        """[수정] 불러온 모든 모델을 비교 엔진으로 비교하여 하단 요약 라벨을 업데이트합니다.
+
+        기준(첫 번째) 모델 대비 지표 평균의 변화율과 부트스트랩 신뢰구간, 시퀀스별 평균 순위를 보여줍니다.
+        """
+        for name, widget in self.model_results.items():
+            self.comparison.set_dataset(name, widget.df)
 
-        if df_orig is None or df_impr is None:
-            self.comparison_summary_label.setText("비교를 위해 두 엑셀 파일을 모두 불러오세요.")
+        if len(self.comparison.models()) < 2:
+            self.comparison_summary_label.setText("비교를 위해 두 개 이상의 결과 파일을 불러오세요.")
             return
 
         try:
-            metrics = ['HOTA', 'MOTA', 'IDF1']
-            summary_texts = []
-
-            for metric in metrics:
-                if (metric in df_orig.columns and pd.api.types.is_numeric_dtype(df_orig[metric]) and
-                    metric in df_impr.columns and pd.api.types.is_numeric_dtype(df_impr[metric])):
-                    
-                    old_val = df_orig[metric].mean()
-                    new_val = df_impr[metric].mean()
-
-                    if old_val != 0:
-                        improvement = ((new_val - old_val) / abs(old_val)) * 100
-                        color = "#2ecc71" if improvement >= 0 else "#e74c3c"
-                        summary_texts.append(f"{metric} <span style='color:{color};'>{improvement:+.2f}%</span>")
-                    elif new_val != 0:
-                        summary_texts.append(f"{metric} (N/A → {new_val:.3f})")
-                    else:
-                        summary_texts.append(f"{metric} (0.00%)")
-                else:
-                    summary_texts.append(f"{metric} (데이터 없음)")
-            
-            final_text = "기존 모델 대비 " + ", ".join(summary_texts) + " 향상"
-            self.comparison_summary_label.setText(final_text)
+            result = self.comparison.compare()
+            if not result['sequences'] or not result['metrics']:
+                self.comparison_summary_label.setText("모델들 사이에 공통된 시퀀스나 숫자 지표가 없어 비교할 수 없습니다.")
+                return
+
+            lines = [f"{result['baseline']} 모델 대비 <span style='font-size:16px;'>"
+                     f"(공통 시퀀스 {len(result['sequences'])}개, [ ]는 {self.comparison.confidence:.0%} 신뢰구간)</span>"]
+            ranked = [metric for metric in RESULT_METRICS if metric in result['metrics']]
+            for name in result['models'][1:]:
+                summary_texts = []
+                for metric in RESULT_METRICS:
+                    if metric not in result['metrics']:
+                        summary_texts.append(f"{metric} (데이터 없음)")
+                        continue
+                    improvement = result['delta_pct'].at[name, metric]
+                    if np.isnan(improvement):
+                        summary_texts.append(f"{metric} (N/A → {result['means'].at[name, metric]:.3f})")
+                        continue
+                    color = "#2ecc71" if improvement >= 0 else "#e74c3c"
+                    summary_texts.append(f"{metric} <span style='color:{color};'>{improvement:+.2f}%</span>"
+                                         f"<span style='font-size:16px;'> [{result['ci_low_pct'].at[name, metric]:+.2f}, "
+                                         f"{result['ci_high_pct'].at[name, metric]:+.2f}]</span>")
+                line = f"{name}: " + ", ".join(summary_texts)
+                if ranked:
+                    rank = result['mean_rank'].loc[name, ranked].mean()
+                    line += f" <span style='font-size:16px;'>(평균 순위 {rank:.1f}/{len(result['models'])})</span>"
+                lines.append(line)
+            self.comparison_summary_label.setText("<br>".join(lines))
 
         except Exception as e:
             self.comparison_summary_label.setText(f"요약 계산 중 오류 발생: {e}")
 
     def initialize_variables(self):
         """플레이어 동작에 필요한 변수들을 초기화합니다."""
-        self.caps = {'1-1': None, '1-2': None, '2-1': None, '2-2': None}
+        self.caps = {key: None for key in self.video_labels}
+        self.decoders = {key: None for key in self.caps} # 영상별 디코딩 스레드
+        self.indexers = {}          # file_cache_key -> 키프레임 인덱싱 스레드 (같은 파일을 연 패널들이 함께 씀)
+        self.thumbnail_workers = {} # file_cache_key -> 미리보기 썸네일 스레드 (같은 파일을 연 패널들이 함께 씀)
+        self.file_keys = {}         # 패널 key -> 열린 파일의 file_cache_key
+        self.thumbnail_strips = {}  # 준비된 영상별 썸네일 (ThumbnailStrip)
+        self.video_paths = {}
+        self.loop_writers = {}  # 첫 루프를 기록 중인 LoopCacheWriter
+        self.loop_sources = {}  # 기록이 끝나 mmap으로 재생 중인 LoopCacheSource
+        self.track_overlays = {} # 영상별로 겹쳐 그릴 추적 박스 (TrackBoxOverlay)
+        self.source_sizes = {}   # 영상별 원본 (너비, 높이). 추적 박스 좌표의 기준
         self.timer = QTimer(self)
+        self.timer.setSingleShot(True) # 다음 프레임 표시 시각에 맞춰 매번 다시 예약함
+        self.timer.setTimerType(Qt.PreciseTimer)
         self.timer.timeout.connect(self.play_videos)
+        self.clock = PresentationClock()
+        self.frame_pool = FramePool()
+        self.frame_cache = FrameCache(pool=self.frame_pool)
+        self.stage_timings = StageTimings()
+        if self.gl_grid is not None:
+            self.gl_grid.timings = self.stage_timings
+            self.gl_grid.pool = self.frame_pool
+
+        # --- [신규] 성능 오버레이(F3) / 측정값 파일 기록(F4) ---
+        self.presented_times = {key: deque(maxlen=STAGE_TIMING_WINDOW) for key in self.caps} # 영상별 최근 표시 시각
+        self.overlays = {}
+        self.overlay_timer = QTimer(self)
+        self.overlay_timer.setInterval(OVERLAY_INTERVAL_MS)
+        self.overlay_timer.timeout.connect(self.update_overlays)
+        QShortcut(QKeySequence("F3"), self, activated=self.toggle_overlay)
+        QShortcut(QKeySequence("F4"), self, activated=self.toggle_trace)
+        if OVERLAY_ENABLED:
+            self.toggle_overlay()
+        if TRACE_PATH:
+            self.start_trace(TRACE_PATH)
+        self.stale_decoders = set() # 캐시로 탐색 결과를 표시해서 아직 새 위치로 옮기지 않은 디코더
+        self.wrap_started = 0.0     # 마지막 루프 전환 시각
+        self.shown_frames = {}      # 영상별로 지금 화면에 있는 (그 영상 기준) 프레임 번호
+        self.wrap_waiting = {}      # 루프 전환 후 아직 첫 프레임을 표시하지 못한 영상 -> 전환 방식
+        self.wait_reason = "루프 전환" # wrap_waiting 로그에 붙일 이름 (루프 전환 / 화면 복귀)
+
+        # --- [신규] 영상 탭이 보이지 않는 동안의 재생 (HIDDEN_PLAYBACK) ---
+        self.video_visible = True
+        self.hidden_since = 0.0
+        self.prewarm_frame = None   # 돌아오기 전에 미리 탐색해 둔 마스터 프레임
+        self.prewarm_timer = QTimer(self)
+        self.prewarm_timer.setSingleShot(True)
+        self.prewarm_timer.timeout.connect(self.prewarm_hidden_decoders)
+
+        # --- 탐색 요청 병합 / 탐색 결과 표시 타이머 ---
+        self.pending_seek = None
+        self.seek_coalesce_timer = QTimer(self)
+        self.seek_coalesce_timer.setSingleShot(True)
+        self.seek_coalesce_timer.timeout.connect(self.apply_pending_seek)
+        self.seek_poll_timer = QTimer(self)
+        self.seek_poll_timer.timeout.connect(self.poll_seek_frames)
+        self.seek_pending_keys = set()
+        self.seek_poll_deadline = 0
+
+        # --- [신규] 영상 내보내기 ---
+        self.exporter = None
+        self.export_dialog = None
+        self.export_timer = QTimer(self)
+        self.export_timer.setInterval(200)
+        self.export_timer.timeout.connect(self.poll_export)
+
+        # --- [신규] 디코딩 예산 배분 (영상이 많으면 작고 덜 중요한 영상의 프레임률을 나눔) ---
+        self.decode_scheduler = DecodeScheduler()
+        self.base_strides = {}  # 영상별 마스터 프레임당 프레임 수 (FPS 비율)
+        self.rate_divisors = {} # 영상별 프레임률 분할 값 (1이면 전부 표시)
+        self.schedule_timer = QTimer(self)
+        self.schedule_timer.setInterval(DECODE_SCHEDULE_MS)
+        self.schedule_timer.timeout.connect(self.rebalance_decoding)
+
+        # --- 디코딩 통계 로그 타이머 ---
+        self.stats_timer = QTimer(self)
+        self.stats_timer.timeout.connect(self.log_decode_stats)
         self.fps = 30
         self.total_frames = 0
         self.current_frame = 0
@@ -437,37 +3729,91 @@ class DualVideoPlayer(QWidget):
                     cap.release()
                 return
 
-            if self.caps.get(num_str):
-                self.caps[num_str].release()
+            if self.decoders.get(num_str):
+                self.decoders[num_str].stop() # 이전 디코더가 기존 캡처를 해제함
+            self.release_file_jobs(num_str)
             
             self.caps[num_str] = cap
-            video_labels = {
-                '1-1': self.video_label1_1, '1-2': self.video_label1_2,
-                '2-1': self.video_label2_1, '2-2': self.video_label2_2
-            }
-            video_labels[num_str].setText("")
+            self.video_paths[num_str] = file_name
+            self.drop_loop_cache(num_str)
+            # 영상과 같은 이름의 .txt가 있으면 추적 박스로 함께 불러옴 (원본 크기는 디코더가 캡처를 넘겨받기 전에 읽음)
+            self.source_sizes[num_str] = (cap.get(cv2.CAP_PROP_FRAME_WIDTH), cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            self.track_overlays.pop(num_str, None)
+            sidecar = os.path.splitext(file_name)[0] + ".txt"
+            if os.path.isfile(sidecar):
+                self.load_tracks(num_str, sidecar)
+            if DECODE_MODE == "process":
+                decoder = ProcessDecoder(num_str, cap, file_name)
+            else:
+                decoder = DecoderWorker(num_str, cap, timings=self.stage_timings, pool=self.frame_pool)
+            if self.gl_grid is not None and all(self.source_sizes[num_str]): # GL은 디코딩한 크기 그대로 올리고 셰이더가 칸에 맞춰 그림 (CPU 축소 없음)
+                self.panel_sizes[num_str] = tuple(int(v) for v in self.source_sizes[num_str])
+                decoder.output_size = None
+            else:
+                decoder.output_size = self.panel_sizes[num_str]
+            decoder.start()
+            self.decoders[num_str] = decoder
+
+            # 키프레임 인덱스는 백그라운드에서 준비되는 대로 디코더에 연결
+            def on_index_ready(index, decoder=decoder):
+                decoder.index = index
+            # 탐색 막대 미리보기용 썸네일 (캐시에 없으면 키프레임 인덱스가 끝난 뒤 만듦)
+            def on_thumbnails_ready(strip, key=num_str):
+                self.thumbnail_strips[key] = strip
+            self.start_file_jobs(num_str, file_name, on_index_ready, on_thumbnails_ready)
+            self.frame_cache.invalidate(num_str)
+            self.video_labels[num_str].setText("")
 
             self.synchronize_videos()
 
+    def start_file_jobs(self, key, path, on_index_ready, on_thumbnails_ready):
+        """key 패널을 파일별 키프레임 인덱싱/썸네일 작업에 구독시킵니다. 같은 파일을 이미 연 패널이 있으면 그 작업을 함께 씀"""
+        file_key = file_cache_key(path)
+        self.file_keys[key] = file_key
+        indexer = self.indexers.get(file_key)
+        if indexer is None:
+            indexer = self.indexers[file_key] = KeyframeIndexer(path)
+            indexer.start()
+        indexer.subscribe(key, on_index_ready)
+        worker = self.thumbnail_workers.get(file_key)
+        if worker is None:
+            worker = self.thumbnail_workers[file_key] = ThumbnailWorker(path, indexer)
+            worker.start()
+        worker.subscribe(key, on_thumbnails_ready)
+
+    def release_file_jobs(self, key):
+        """key 패널의 구독을 끊습니다. 그 파일을 쓰는 패널이 더 없으면 작업을 멈추고 목록에서 뺍니다."""
+        self.thumbnail_strips.pop(key, None)
+        file_key = self.file_keys.pop(key, None)
+        if file_key is None:
+            return
+        for jobs in (self.thumbnail_workers, self.indexers):
+            job = jobs.get(file_key)
+            if job is not None and not job.unsubscribe(key):
+                del jobs[file_key]
+
     def synchronize_videos(self):
         """[수정] 로드된 모든 영상의 길이를 동기화하고 재생을 준비합니다."""
         self.total_frames = 0
         self.fps = 30 
         
-        valid_caps = [c for c in self.caps.values() if c and c.isOpened()]
-        if not valid_caps: return
+        valid_decoders = [d for d in self.decoders.values() if d]
+        if not valid_decoders: return
 
+        # [수정] 재생 시간이 가장 긴 영상을 마스터로 삼고, 나머지는 자기 FPS로 같은 시각의 프레임을 표시
         problematic_files = False
-        for c in valid_caps:
-            frames = c.get(cv2.CAP_PROP_FRAME_COUNT)
-            current_fps = c.get(cv2.CAP_PROP_FPS)
+        longest = 0
+        for d in valid_decoders:
+            frames = d.frame_count
+            current_fps = d.fps
 
             if frames <= 0 or current_fps <= 0:
                 problematic_files = True
                 frames = self.total_frames if self.total_frames > 0 else 3000
                 current_fps = self.fps
 
-            if frames > self.total_frames:
+            if frames / current_fps > longest:
+                longest = frames / current_fps
                 self.total_frames = int(frames)
                 self.fps = current_fps or 30
         
@@ -475,6 +3821,11 @@ class DualVideoPlayer(QWidget):
         self.total_frames = max(1, self.total_frames)
         self.fps = max(1, self.fps)
 
+        for key, d in self.decoders.items():
+            if d:
+                self.base_strides[key] = d.fps / self.fps if d.fps > 0 else 1.0
+                d.stride = self.base_strides[key] * self.rate_divisors.get(key, 1)
+
 
         if problematic_files:
             QMessageBox.warning(self, "경고",
@@ -485,6 +3836,7 @@ class DualVideoPlayer(QWidget):
         self.current_frame = 0
         self.is_paused = True
         self.timer.stop()
+        self.clock.stop()
         self.play_pause_btn.setText("▶ 재생")
         
         if all(c is not None for c in self.caps.values()):
@@ -493,6 +3845,7 @@ class DualVideoPlayer(QWidget):
         
         # 슬라이더 범위는 0 ~ (총 프레임 - 1)
         self.seek_slider.setRange(0, self.total_frames - 1)
+        self.export_btn.setEnabled(True)
         
         # [수정] 0번 프레임으로 탐색하고, 첫 프레임을 화면에 표시
         self.seek_all_videos(0) 
@@ -512,7 +3865,18 @@ class DualVideoPlayer(QWidget):
             # -----------------------------------
             
             # 기존 재생 로직
-            self.timer.start(int(1000 / self.fps))
+            for decoder in self.decoders.values():
+                if decoder:
+                    decoder.reset_stats()
+            self.seek_poll_timer.stop()
+            self.resync_stale_decoders()
+            if self.current_frame == 0:
+                self.start_loop_recording()
+            self.clock.reset_stats()
+            self.clock.start(self.current_frame, self.fps)
+            self.timer.start(0)
+            self.stats_timer.start(DECODE_STATS_INTERVAL_MS)
+            self.schedule_timer.start()
             self.play_pause_btn.setText("❚❚ 일시정지")
         else:
             # --- [수정 2: 탭 전환 타이머 정지] ---
@@ -521,105 +3885,727 @@ class DualVideoPlayer(QWidget):
 
             # 기존 일시정지 로직
             self.timer.stop()
+            self.clock.stop()
+            self.stats_timer.stop()
+            self.schedule_timer.stop()
             self.play_pause_btn.setText("▶ 재생")
         self.is_paused = not self.is_paused
 
     def play_videos(self):
-        """[수정] 비디오를 재생합니다. (탐색 없이 cap.read()만 사용)"""
-        
-        # 재생 직전에 프레임 카운터 증가 (0 -> 1)
-        self.current_frame += 1
+        """[수정] 재생 시계가 가리키는 프레임을 표시하고 다음 표시 시각에 타이머를 다시 예약합니다."""
+        if not self.clock.running:
+            return
+
+        now = time.perf_counter()
+        next_deadline = self.clock.deadline(self.current_frame + 1)
+        if now < next_deadline:
+            if next_deadline - now > CLOCK_SPIN_THRESHOLD:
+                self.schedule_next_frame() # 너무 일찍 깨어남
+                return
+            time.sleep(next_deadline - now) # 남은 시간이 아주 짧으면 정확히 맞춰 잠듦
+            now = time.perf_counter()
+
+        # 경과 시간으로 목표 프레임을 계산 (늦었으면 중간 프레임은 건너뜀)
+        target = max(self.clock.frame_at(now), self.current_frame + 1)
+        dropped = target - self.current_frame - 1
+        self.current_frame = target
         
         # --- [수정 1: 영상 자동 재시작 (루핑)] ---
         if self.current_frame >= self.total_frames:
-            # self.current_frame = 0 # seek_all_videos가 대신 처리
-            self.seek_all_videos(0) # 0번 프레임으로 탐색 (current_frame도 0으로 설정됨)
+            loops = self.current_frame // self.total_frames
+            self.clock.shift(loops * self.total_frames) # 시계 기준도 함께 되감아 오차가 쌓이지 않게 함
+            self.finish_loop_recording()
+            self.wrap_all_videos(self.current_frame % self.total_frames)
+            self.start_loop_recording()
             # 재생 타이머는 멈추지 않고 계속 진행
         # ---------------------------------------
+        self.check_loop_writers()
 
-        # UI 업데이트 (현재 프레임 기준)
-        self.seek_slider.blockSignals(True)
-        self.seek_slider.setValue(self.current_frame)
-        self.seek_slider.blockSignals(False)
-        
-        elapsed_time = self.current_frame / self.fps if self.fps > 0 else 0
-        h, m, s = int(elapsed_time // 3600), int((elapsed_time % 3600) // 60), int(elapsed_time % 60)
-        self.time_label.setText(f"주행중 : {h:02}시간 {m:02}분 {s:02}초")
-        
-        labels_map = {
-            '1-1': self.video_label1_1, '1-2': self.video_label1_2,
-            '2-1': self.video_label2_1, '2-2': self.video_label2_2
-        }
+        if self.video_visible:
+            # UI 업데이트 (현재 프레임 기준). 미리보기로 드래그 중이면 손잡이는 사용자가 잡은 위치에 둠
+            if not self.seek_slider.isSliderDown():
+                self.seek_slider.blockSignals(True)
+                self.seek_slider.setValue(self.current_frame)
+                self.seek_slider.blockSignals(False)
 
-        # 4개 영상에서 다음 프레임 읽기 (빠름)
-        for key, cap in self.caps.items():
-            if cap and cap.isOpened():
-                ret, frame = cap.read() # [!!!] cap.set()이 없음 [!!!]
-                if ret:
-                    self.display_frame(frame, labels_map[key])
+            elapsed_time = self.current_frame / self.fps if self.fps > 0 else 0
+            h, m, s = int(elapsed_time // 3600), int((elapsed_time % 3600) // 60), int(elapsed_time % 60)
+            self.time_label.setText(f"주행중 : {h:02}시간 {m:02}분 {s:02}초")
+            keys = list(self.decoders)
+        else:
+            # [신규] 숨김 중에는 루프 캐시를 기록 중인 영상만 계속 가져옴 (나머지 디코더는 링이 차면 쉼)
+            keys = [key for key, writer in self.loop_writers.items() if writer.key == key and key not in self.loop_sources]
+
+        # 디코딩 스레드(또는 루프 캐시)가 미리 준비해 둔 프레임만 가져옴 (준비되지 않았으면 이전 프레임 유지)
+        for key in keys:
+            source = self.source_for(key)
+            frame_idx = self.stream_frame(key, self.current_frame)
+            if source and frame_idx != self.shown_frames.get(key): # 느린 영상은 다음 프레임 시각까지 그대로 유지
+                frame = source.take(frame_idx)
+                if frame is not None:
+                    self.display_frame(key, frame_idx, *frame)
+                    if key in self.wrap_waiting:
+                        logger.info("[%s %s] %s, 첫 프레임 표시까지 %.1fms", self.wait_reason, key,
+                                    self.wrap_waiting.pop(key), (time.perf_counter() - self.wrap_started) * 1000)
+
+        if not self.video_visible:
+            self.schedule_next_frame()
+            return
+        self.clock.record(self.current_frame, now, dropped)
+        trace = self.stage_timings.trace
+        if trace is not None:
+            trace.write('clock', 'tick', (time.perf_counter() - now) * 1000) # 프레임을 가져와 그리기까지 걸린 시간
+            trace.write('clock', 'lateness', self.clock.last_drift_ms)
+            if dropped:
+                trace.write('clock', 'dropped', dropped)
+        self.schedule_next_frame()
+
+    def schedule_next_frame(self):
+        """다음 프레임의 표시 시각 직전에 play_videos가 호출되도록 타이머를 예약합니다."""
+        if not self.video_visible and not self.loop_writers:
+            self.timer.start(HIDDEN_TICK_MS) # 숨김 중에는 시계 위치와 루프 전환만 확인
+            return
+        delay = self.clock.deadline(self.current_frame + 1) - time.perf_counter() - CLOCK_SPIN_THRESHOLD / 2
+        self.timer.start(max(0, int(delay * 1000)))
 
     # --- [삭제] update_video_frame 함수 ---
     # def update_video_frame(self, frame_idx):
     #     ...
 
-    def display_frame(self, frame, label):
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = frame.shape
-        q_img = QImage(frame.data, w, h, ch * w, QImage.Format_RGB888)
-        pixmap = QPixmap.fromImage(q_img).scaled(label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        label.setPixmap(pixmap)
+    def display_frame(self, key, frame_idx, frame, fitted_for=None):
+        """패널 크기로 줄인 프레임을 캐시에 넣고 화면에 표시합니다.
+
+        fitted_for는 디코더가 프레임을 줄일 때 기준으로 삼은 패널 크기입니다. 그 사이 패널 크기가
+        바뀌었거나 원본 그대로라면 여기서 한 번만 다시 줄입니다.
+        """
+        panel_size = self.panel_sizes[key]
+        source_frame = frame
+        if fitted_for != panel_size:
+            t0 = time.perf_counter()
+            frame = fit_frame(frame, panel_size, self.frame_pool)
+            self.stage_timings.add(key, 'resize_gui', time.perf_counter() - t0)
+        if frame is source_frame and getattr(self.source_for(key), 'frames_are_views', False):
+            # 공유 메모리 슬롯은 곧 재사용되므로, 줄이지 않고 그대로 쓰게 된 프레임은 (색 변환 전에) 복사본으로 바꿈
+            frame = copy_frame(frame, self.frame_pool)
+        if fitted_for is None:
+            t1 = time.perf_counter()
+            frame = to_display_format(frame)
+            if needs_color_conversion():
+                self.stage_timings.add(key, 'cvtcolor_gui', time.perf_counter() - t1)
+        writer = self.loop_writers.get(key)
+        if writer is not None and writer.key == key and key not in self.loop_sources:
+            writer.add(frame_idx, frame) # 루프 캐시에는 박스 없는 프레임을 기록 (같은 기록기를 쓰는 다른 패널은 넣지 않음)
+        tracks = self.track_overlays.get(key)
+        if tracks is not None:
+            t0 = time.perf_counter()
+            if writer is not None or not frame.flags.writeable: # 기록 대기 중이거나 읽기 전용(mmap)이면 복사본에 그림
+                frame = copy_frame(frame, self.frame_pool)
+            tracks.draw(frame, frame_idx)
+            self.stage_timings.add(key, 'boxes', time.perf_counter() - t0)
+        self.frame_cache.put(key, frame_idx, panel_size, frame)
+        self.shown_frames[key] = frame_idx
+        if self.video_visible:
+            self.presented_times[key].append(time.perf_counter())
+            self.show_frame(key, frame)
+
+    def show_frame(self, key, frame):
+        """[수정] 표시 포맷 프레임을 패널의 고정 버퍼에 복사해 그립니다. (GL 렌더러면 텍스처 업로드를 예약)"""
+        if self.gl_grid is not None:
+            self.gl_grid.set_frame(key, frame)
+            return
+        t0 = time.perf_counter()
+        self.video_labels[key].set_frame(frame)
+        self.stage_timings.add(key, 'blit', time.perf_counter() - t0)
+
+    def eventFilter(self, obj, event):
+        """패널 크기가 바뀔 때만 크기 캐시와 디코더의 축소 크기를 갱신합니다. (탐색 막대 위 마우스는 미리보기)"""
+        if obj is getattr(self, 'seek_slider', None):
+            if event.type() == QEvent.MouseMove and obj.isEnabled() and not obj.isSliderDown():
+                self.show_seek_preview(self.slider_value_at(event.x()), event.x())
+            elif event.type() == QEvent.Leave and not obj.isSliderDown():
+                self.seek_preview.hide()
+            return super().eventFilter(obj, event)
+        if event.type() == QEvent.Resize and getattr(self, 'gl_grid', None) is None:
+            for key, label in self.video_labels.items():
+                if label is obj:
+                    self.update_panel_size(key, event.size().width(), event.size().height())
+                    break
+        return super().eventFilter(obj, event)
             
     def set_video_position(self, position):
-        """[수정] 슬라이더 이동 시 비디오 위치를 설정합니다."""
-        self.current_frame = position
-        self.seek_all_videos(position) # 1. 모든 비디오를 해당 프레임으로 탐색
-        
-        # 2. 일시정지 상태면, 탐색한 프레임을 수동으로 표시
+        """[수정] 슬라이더 이동 시 비디오 위치를 설정합니다. (짧은 간격의 이벤트는 모아서 최신 위치만 탐색)"""
+        self.pending_seek = position
+        if not self.seek_coalesce_timer.isActive():
+            self.seek_coalesce_timer.start(SEEK_COALESCE_MS)
+
         if self.is_paused:
             self.seek_slider.setValue(position)
             elapsed_time = position / self.fps if self.fps > 0 else 0
             h, m, s = int(elapsed_time // 3600), int((elapsed_time % 3600) // 60), int(elapsed_time % 60)
             self.time_label.setText(f"주행중 : {h:02}시간 {m:02}분 {s:02}초")
-            
-            self.display_current_frame()
+
+    def on_slider_moved(self, position):
+        """[신규] 드래그 중에는 썸네일 미리보기만 갱신합니다. (썸네일이 하나도 준비되지 않았으면 이전처럼 바로 탐색)"""
+        if not self.thumbnail_strips:
+            self.set_video_position(position)
+            return
+        self.show_seek_preview(position, self.slider_x_of(position))
+
+    def on_slider_released(self):
+        """[신규] 슬라이더를 놓은 위치로 한 번만 실제 탐색합니다."""
+        self.seek_preview.hide()
+        if self.thumbnail_strips:
+            self.set_video_position(self.seek_slider.value())
+
+    def show_seek_preview(self, position, x):
+        """master 프레임 position에 해당하는 영상별 썸네일을 탐색 막대의 x 위치 위에 보여줍니다. (디코딩 없음)"""
+        picks = {}
+        for key, strip in list(self.thumbnail_strips.items()):
+            if self.decoders.get(key):
+                picks[key] = (strip, strip.index_of(self.stream_frame(key, position)))
+        if not picks:
+            self.seek_preview.hide()
+            return
+        elapsed_time = position / self.fps if self.fps > 0 else 0
+        h, m, s = int(elapsed_time // 3600), int((elapsed_time % 3600) // 60), int(elapsed_time % 60)
+        self.seek_preview.show_tiles([keys for _, _, keys in grid_rows()], picks, f"{h:02}:{m:02}:{s:02}",
+                                     self.seek_slider.mapToGlobal(QPoint(x, -4)))
+
+    def slider_geometry(self):
+        """탐색 막대의 홈(groove) 시작 x, 손잡이 너비, 손잡이가 움직이는 길이"""
+        opt = QStyleOptionSlider()
+        self.seek_slider.initStyleOption(opt)
+        style = self.seek_slider.style()
+        groove = style.subControlRect(QStyle.CC_Slider, opt, QStyle.SC_SliderGroove, self.seek_slider)
+        handle = style.subControlRect(QStyle.CC_Slider, opt, QStyle.SC_SliderHandle, self.seek_slider)
+        return groove.x(), handle.width(), max(1, groove.width() - handle.width())
+
+    def slider_value_at(self, x):
+        left, handle_w, span = self.slider_geometry()
+        return QStyle.sliderValueFromPosition(self.seek_slider.minimum(), self.seek_slider.maximum(),
+                                              x - left - handle_w // 2, span)
+
+    def slider_x_of(self, value):
+        left, handle_w, span = self.slider_geometry()
+        return left + handle_w // 2 + QStyle.sliderPositionFromValue(self.seek_slider.minimum(),
+                                                                     self.seek_slider.maximum(), value, span)
+
+    def apply_pending_seek(self):
+        """모아 둔 슬라이더 위치 중 가장 최근 것으로 실제 탐색을 수행합니다."""
+        if self.pending_seek is None:
+            return
+        position, self.pending_seek = self.pending_seek, None
+        if not self.is_paused:
+            self.seek_all_videos(position) # 모든 비디오를 해당 프레임으로 탐색 (디코더가 최신 요청만 처리)
+            self.clock.start(self.current_frame) # 재생 중이면 시계도 새 위치 기준으로 맞춤
+            return
+
+        # 일시정지 상태: 최근에 본 프레임은 캐시에서 바로 표시하고, 나머지만 디코더에 탐색 요청
+        position = min(position, self.total_frames - 1)
+        self.current_frame = position
+        to_decode = []
+        for key, decoder in self.decoders.items():
+            if not decoder:
+                continue
+            frame_idx = self.stream_frame(key, position)
+            cached = self.frame_cache.get(key, frame_idx, self.panel_sizes[key])
+            if cached is not None:
+                self.show_frame(key, cached)
+                self.shown_frames[key] = frame_idx
+                self.stale_decoders.add(key)
+            else:
+                to_decode.append(key)
+        self.seek_all_videos(position, to_decode)
+
+        # 디코딩이 필요한 프레임은 준비되는 대로 표시 (GUI는 기다리지 않음)
+        self.seek_pending_keys = set(to_decode)
+        self.seek_poll_deadline = time.monotonic() + SEEK_DISPLAY_TIMEOUT
+        if to_decode:
+            self.seek_poll_timer.start(SEEK_POLL_MS)
+        else:
+            self.seek_poll_timer.stop()
+
+    def poll_seek_frames(self):
+        """일시정지 중 탐색한 프레임 중 디코딩이 끝난 것부터 화면에 표시합니다."""
+        for key in list(self.seek_pending_keys):
+            source = self.source_for(key)
+            frame_idx = self.stream_frame(key, self.current_frame)
+            frame = source.wait_frame(frame_idx, timeout=0) if source else None
+            if frame is not None:
+                self.display_frame(key, frame_idx, *frame)
+                self.seek_pending_keys.discard(key)
+        if not self.seek_pending_keys or time.monotonic() > self.seek_poll_deadline:
+            self.seek_poll_timer.stop()
 
     # --- [신규: 수정 2] 탭 전환 로직 ---
     def switch_tabs(self):
         """[신규] 30초/10초 간격으로 영상 탭과 결과 탭을 전환합니다."""
+        # [수정] 전환 간격을 먼저 바꿔 두어야 탭이 바뀔 때(on_video_hidden) 돌아올 시각을 알 수 있음
         if self.current_tab_index == 0: # 현재 영상 탭(0) -> 결과 탭(1)으로
             self.current_tab_index = 1
-            self.tabs.setCurrentIndex(1)
             self.tab_switch_timer.setInterval(8000) # 10초 뒤 전환
+            self.tabs.setCurrentIndex(1)
         else: # 현재 결과 탭(1) -> 영상 탭(0)으로
             self.current_tab_index = 0
-            self.tabs.setCurrentIndex(0)
             self.tab_switch_timer.setInterval(30000) # 30초 뒤 전환
+            self.tabs.setCurrentIndex(0)
     # -----------------------------------
 
-    def seek_all_videos(self, frame_idx):
-        """[신규] 모든 비디오를 frame_idx로 탐색합니다. (읽지 않음)"""
+    def seek_all_videos(self, frame_idx, keys=None):
+        """[신규] 모든 비디오(또는 keys에 해당하는 비디오)를 frame_idx로 탐색합니다. (디코딩 스레드에 요청만 함)"""
         if frame_idx >= self.total_frames:
             frame_idx = self.total_frames - 1
         self.current_frame = frame_idx
 
-        for key, cap in self.caps.items():
-            if cap and cap.isOpened():
-                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+        for key, decoder in self.decoders.items():
+            if decoder and (keys is None or key in keys) and key not in self.loop_sources:
+                decoder.seek(self.stream_frame(key, frame_idx))
+                self.stale_decoders.discard(key)
+                self.shown_frames.pop(key, None)
+                self.wrap_waiting.pop(key, None)
+
+    def stream_frame(self, key, master_idx):
+        """[신규] 마스터 타임라인의 프레임 번호에 해당하는 key 영상의 프레임 번호. 더 짧은 영상은 마지막 프레임에 머뭅니다."""
+        decoder = self.decoders.get(key)
+        if not decoder:
+            return master_idx
+        # 프레임률을 k로 나눈 영상은 마스터 k프레임마다 한 번 바뀜 (decoder.stride에 k가 곱해져 있음)
+        frame_idx = timeline_frame(master_idx // self.rate_divisors.get(key, 1), decoder.stride)
+        if decoder.frame_count > 0:
+            frame_idx = min(frame_idx, int(decoder.frame_count) - 1)
+        return frame_idx
+
+    def wrap_all_videos(self, frame_idx):
+        """[신규] 루프 끝에서 frame_idx로 되감습니다. 시작 프레임이 프리롤되어 있으면 탐색 없이 버퍼만 교체합니다."""
+        self.current_frame = frame_idx
+        self.wrap_started = time.perf_counter()
+        self.wrap_waiting = {}
+        self.wait_reason = "루프 전환"
+        for key, decoder in self.decoders.items():
+            if not decoder:
+                continue
+            if key in self.loop_sources:
+                self.wrap_waiting[key] = "루프 캐시"
+            else:
+                self.wrap_waiting[key] = "프리롤" if decoder.seek(self.stream_frame(key, frame_idx)) else "탐색"
+                self.stale_decoders.discard(key)
+
+    # --- [신규] 영상 탭 숨김 / 복귀 ---
+    def update_video_visibility(self):
+        """영상 탭이 실제로 보이는지 다시 확인하고, 바뀌었으면 숨김/복귀 처리를 합니다."""
+        if not hasattr(self, 'video_visible'):
+            return
+        visible = self.tabs.currentWidget() is self.video_tab and self.isVisible() and not self.isMinimized()
+        if visible == self.video_visible:
+            return
+        self.video_visible = visible
+        if visible:
+            self.on_video_shown()
+        else:
+            self.on_video_hidden()
+
+    def on_video_hidden(self):
+        """보이지 않는 영상은 가져오지 않습니다. (pause 모드면 재생 시계를 멈춤)"""
+        self.hidden_since = time.perf_counter()
+        self.wrap_waiting = {}
+        self.prewarm_frame = None
+        if self.is_paused:
+            return
+        if HIDDEN_PLAYBACK == "pause":
+            self.timer.stop()
+            self.clock.stop()
+        elif self.tab_switch_timer.isActive():
+            # 탭 자동 전환으로 돌아올 시각을 알고 있으므로 그 직전에 돌아올 위치로 미리 탐색
+            self.prewarm_timer.start(max(0, self.tab_switch_timer.remainingTime() - HIDDEN_PREWARM_MS))
+        logger.info("[화면 숨김] 영상 탭이 보이지 않아 %s", "재생 시계를 멈춥니다." if HIDDEN_PLAYBACK == "pause"
+                    else "보이지 않는 영상을 가져오지 않습니다.")
+
+    def prewarm_hidden_decoders(self):
+        """돌아오기 직전에, 돌아올 시각의 타임라인 위치로 디코더를 미리 탐색해 링을 채워 둡니다."""
+        if self.video_visible or self.is_paused or not self.clock.running:
+            return
+        target = self.clock.frame_at(time.perf_counter() + HIDDEN_PREWARM_MS / 1000) % self.total_frames
+        self.prewarm_frame = target
+        for key, decoder in self.decoders.items():
+            if decoder and key not in self.loop_sources and key not in self.loop_writers:
+                decoder.seek(self.stream_frame(key, target))
+                self.stale_decoders.discard(key)
+
+    def on_video_shown(self):
+        """영상 탭으로 돌아오면 타임라인 위치에 맞춰 바로 이어서 재생합니다."""
+        self.prewarm_timer.stop()
+        if self.is_paused:
+            return
+        hidden_for = time.perf_counter() - self.hidden_since
+        if HIDDEN_PLAYBACK == "pause":
+            self.clock.start(self.current_frame, self.fps)
+            self.timer.start(0)
+            logger.info("[화면 복귀] %.1fs 동안 멈췄던 재생을 %d번 프레임부터 이어갑니다.", hidden_for, self.current_frame)
+            return
+
+        # 시계는 계속 돌았으므로 지금 보여야 할 위치로 맞춤 (루프 전환은 다음 play_videos가 처리)
+        position = self.clock.frame_at(time.perf_counter()) % self.total_frames
+        # 미리 탐색한 위치가 지금 위치와 링 하나 안쪽으로 맞으면 그대로 쓰고, 아니면 키프레임 탐색
+        prewarmed = (self.prewarm_frame is not None and
+                     -2 <= position - self.prewarm_frame < DECODE_QUEUE_SIZE)
+        self.wrap_started = time.perf_counter()
+        self.wrap_waiting = {}
+        self.wait_reason = "화면 복귀"
+        self.shown_frames.clear()
+        for key, decoder in self.decoders.items():
+            if not decoder:
+                continue
+            if key in self.loop_sources:
+                self.wrap_waiting[key] = "루프 캐시"
+            elif key in self.loop_writers:
+                self.wrap_waiting[key] = "계속 디코딩"
+            elif prewarmed:
+                self.wrap_waiting[key] = "미리 탐색"
+            else:
+                decoder.seek(self.stream_frame(key, position))
+                self.stale_decoders.discard(key)
+                self.wrap_waiting[key] = "탐색"
+        self.prewarm_frame = None
+        self.clock.reset_stats() # 숨김 중 건너뛴 시간은 지연 통계에 넣지 않음
+        self.timer.start(0)
+        logger.info("[화면 복귀] %.1fs 숨김 후 %d번 프레임에서 이어서 재생합니다.", hidden_for, position)
+
+    def resync_stale_decoders(self):
+        """캐시로만 탐색했던 디코더를 현재 위치로 옮깁니다. (재생 시작 직전에 호출)"""
+        if self.stale_decoders:
+            self.seek_all_videos(self.current_frame, set(self.stale_decoders))
 
     def display_current_frame(self):
         """[신규] 모든 비디오에서 현재 프레임을 읽고 표시합니다."""
-        labels_map = {
-            '1-1': self.video_label1_1, '1-2': self.video_label1_2,
-            '2-1': self.video_label2_1, '2-2': self.video_label2_2
-        }
-        for key, cap in self.caps.items():
-            if cap and cap.isOpened():
-                ret, frame = cap.read() # 현재 위치의 프레임을 읽음
-                if ret:
-                    self.display_frame(frame, labels_map[key])
+        for key in self.decoders:
+            source = self.source_for(key)
+            if source:
+                frame_idx = self.stream_frame(key, self.current_frame)
+                frame = source.wait_frame(frame_idx) # 현재 위치의 프레임이 디코딩될 때까지 대기
+                if frame is not None:
+                    self.display_frame(key, frame_idx, *frame)
+
+    # --- 전시용 루프 캐시 ---
+    def source_for(self, key):
+        """key 영상의 프레임 공급원. 현재 패널 크기에 맞는 루프 캐시가 있으면 그것을, 아니면 디코더를 반환합니다."""
+        source = self.loop_sources.get(key)
+        if source is not None:
+            if source.panel_size == self.panel_sizes[key]:
+                return source
+            # 패널 크기가 바뀌면 캐시를 내려놓고 디코더를 현재 위치로 옮겨 이어서 재생
+            self.drop_loop_cache(key)
+            if self.decoders.get(key):
+                self.seek_all_videos(self.current_frame, {key})
+        return self.decoders.get(key)
+
+    def loop_cache_codec(self, key):
+        if LOOP_CACHE_CODEC != "auto":
+            return "lz4" if LOOP_CACHE_CODEC == "lz4" and lz4_frame is None else LOOP_CACHE_CODEC
+        w, h = self.panel_sizes[key]
+        if w * h * 3 * self.total_frames <= LOOP_CACHE_RAW_LIMIT:
+            return "raw"
+        return "lz4" if lz4_frame is not None else "jpeg"
+
+    def start_loop_recording(self):
+        """0번 프레임부터 재생을 시작할 때, 루프 캐시가 없는 영상의 기록을 시작합니다. (디스크에 있으면 바로 사용)
+
+        같은 파일을 같은 크기로 보여주는 패널들은 캐시 파일이 같으므로, 기록기와 캐시 공급원을 하나씩만 만들어 함께 씁니다.
+        """
+        if not LOOP_CACHE_ENABLED:
+            return
+        sources = {source.base: source for source in self.loop_sources.values()}
+        writers = {writer.base: writer for writer in self.loop_writers.values()}
+        for key, decoder in self.decoders.items():
+            if not decoder or key in self.loop_sources or key in self.loop_writers:
+                continue
+            base = loop_cache_base(self.video_paths[key], self.panel_sizes[key])
+            if base in sources:
+                self.loop_sources[key] = sources[base]
+                continue
+            if base in writers:
+                self.loop_writers[key] = writers[base]
+                continue
+            if LoopCacheSource.exists(base):
+                self.loop_sources[key] = sources[base] = LoopCacheSource(key, base, self.panel_sizes[key])
+                continue
+            writer = LoopCacheWriter(key, base, self.loop_cache_codec(key), first_frame_idx=self.stream_frame(key, self.current_frame),
+                                     pool=self.frame_pool)
+            if self.current_frame == 0 and self.is_paused:
+                # 일시정지 화면의 0번 프레임은 이미 표시되어 캐시에 있으므로 그것부터 기록
+                first = self.frame_cache.get(key, 0, self.panel_sizes[key])
+                if first is not None:
+                    writer.add(0, first)
+            writer.start()
+            self.loop_writers[key] = writers[base] = writer
+
+    def finish_loop_recording(self):
+        """루프가 한 바퀴 돌았을 때 기록 중인 캐시를 마무리합니다."""
+        for writer in self.loop_writers.values():
+            writer.finish()
+
+    def check_loop_writers(self):
+        """기록이 끝난 캐시를 열어, 다음 프레임부터 디코딩 대신 mmap에서 재생합니다. (같은 기록기를 쓰던 패널은 공급원도 함께 씀)"""
+        opened = {}
+        for key, writer in list(self.loop_writers.items()):
+            if not writer.done:
+                continue
+            del self.loop_writers[key]
+            if writer.ok and writer.base == loop_cache_base(self.video_paths[key], self.panel_sizes[key]):
+                if writer.base not in opened:
+                    opened[writer.base] = LoopCacheSource(writer.key, writer.base, self.panel_sizes[key])
+                self.loop_sources[key] = opened[writer.base]
+                logger.info("[루프 캐시 %s] 다음 루프부터 캐시에서 재생합니다.", key)
+
+    def drop_loop_cache(self, key):
+        """key 패널의 루프 캐시를 내려놓습니다. 다른 패널이 아직 쓰는 기록기와 공급원은 멈추지 않습니다."""
+        writer = self.loop_writers.pop(key, None)
+        if writer is not None:
+            sharing = [other for other, w in self.loop_writers.items() if w is writer]
+            if not sharing:
+                writer.abort()
+            elif writer.key == key:
+                writer.key = sharing[0] # 프레임을 넣던 패널이 빠지면 함께 쓰던 패널이 이어서 넣음
+        source = self.loop_sources.pop(key, None)
+        if source is not None and all(other is not source for other in self.loop_sources.values()):
+            source.stop()
+
+    # --- 디코딩 예산 ---
+    def rebalance_decoding(self):
+        """[신규] 측정한 프레임당 디코딩 시간으로 CPU 예산을 영상별로 다시 나누고 프레임률 분할 값을 적용합니다."""
+        stages = self.stage_timings.summary()
+        streams = {}
+        for key, decoder in self.decoders.items():
+            if not decoder or key in self.loop_sources: # 루프 캐시로 재생 중인 영상은 디코딩하지 않음
+                continue
+            measured = stages.get(key, {})
+            cost = measured.get('decode', 0.0) + measured.get('resize', 0.0) + measured.get('cvtcolor', 0.0)
+            if cost <= 0: # 프로세스 모드처럼 단계별 시간이 없으면 화소 수로 추정
+                w, h = self.source_sizes.get(key, (0, 0))
+                cost = w * h / 1e6 * DECODE_MS_PER_MPIXEL
+            rate = self.fps * min(self.base_strides.get(key, 1.0), 1.0) # 나누기 전 초당 디코딩 프레임 수
+            w, h = (self.gl_grid.cell_size(key) if self.gl_grid is not None else None) or self.panel_sizes[key] # 화면 넓이
+            streams[key] = (cost, rate, max(1, w * h) * PANEL_PRIORITY.get(key, 1.0))
+        divisors = self.decode_scheduler.plan(streams)
+        changed = False
+        for key, decoder in self.decoders.items():
+            k = divisors.get(key, 1)
+            if decoder and self.rate_divisors.get(key, 1) != k:
+                self.rate_divisors[key] = k
+                decoder.stride = self.base_strides.get(key, 1.0) * k
+                changed = True
+        if changed:
+            logger.info("[디코딩 예산] 예상 %.2f / %.1f 코어, 프레임률 분할 %s", self.decode_scheduler.load,
+                        self.decode_scheduler.budget,
+                        ", ".join(f"{key} 1/{k}" for key, k in sorted(self.rate_divisors.items())))
+
+    # --- 영상 내보내기 ---
+    def export_video(self):
+        """[신규] 불러온 영상들을 재생과 같은 동기화로 읽어 비교 화면을 영상 파일로 내보냅니다. (백그라운드)"""
+        if self.exporter is not None:
+            return
+        file_name, _ = QFileDialog.getSaveFileName(self, "내보낼 영상 파일", "comparison.mp4", "Video Files (*.mp4 *.avi)")
+        if not file_name:
+            return
+        paths = {key: path for key, path in self.video_paths.items() if self.decoders.get(key)}
+        self.exporter = GridExporter(file_name, paths, self.total_frames, self.fps, track_overlays=self.track_overlays)
+        self.exporter.prepare()
+        self.exporter.start()
+        self.export_btn.setEnabled(False)
+        self.export_dialog = QProgressDialog("영상을 내보내는 중입니다...", "취소", 0, 100, self)
+        self.export_dialog.setWindowTitle("영상 내보내기")
+        self.export_dialog.setMinimumDuration(0)
+        self.export_dialog.setValue(0)
+        self.export_timer.start()
+
+    def poll_export(self):
+        exporter = self.exporter
+        if exporter is None:
+            return
+        if self.export_dialog.wasCanceled():
+            exporter.cancel()
+        if not exporter.done:
+            self.export_dialog.setValue(int(exporter.progress * 100))
+            return
+        self.export_timer.stop()
+        self.export_dialog.close()
+        self.exporter = self.export_dialog = None
+        self.export_btn.setEnabled(True)
+        if exporter.error is not None:
+            QMessageBox.warning(self, "오류", f"영상을 내보내는 중 오류가 발생했습니다:\n{exporter.error}")
+        elif exporter.cancelled:
+            logger.info("[영상 내보내기] 취소됨 (%s)", exporter.report())
+        else:
+            logger.info("[영상 내보내기] %s: %s", os.path.basename(exporter.output_path), exporter.report())
+
+    # --- 추적 박스 오버레이 ---
+    def show_track_menu(self, key, pos):
+        """열기 버튼의 우클릭 메뉴: 추적 박스 파일 열기 / 지우기"""
+        menu = QMenu(self)
+        open_action = menu.addAction("추적 박스 파일 열기...")
+        open_action.setEnabled(self.caps.get(key) is not None)
+        clear_action = menu.addAction("추적 박스 지우기")
+        clear_action.setEnabled(key in self.track_overlays)
+        chosen = menu.exec_(self.open_buttons[key].mapToGlobal(pos))
+        if chosen is open_action:
+            file_name, _ = QFileDialog.getOpenFileName(self, f"영상 {key} 추적 결과 선택", "", "MOT Files (*.txt)")
+            if file_name:
+                self.load_tracks(key, file_name)
+                self.refresh_panel(key)
+        elif chosen is clear_action:
+            self.track_overlays.pop(key, None)
+            self.refresh_panel(key)
+
+    def load_tracks(self, key, path):
+        """MOT 형식 추적 결과를 key 영상의 박스 오버레이로 불러옵니다."""
+        try:
+            start = time.perf_counter()
+            tracks = TrackBoxOverlay(path, self.source_sizes[key])
+        except Exception as e:
+            QMessageBox.warning(self, "오류", f"추적 박스 파일을 읽을 수 없습니다:\n{e}")
+            return
+        self.track_overlays[key] = tracks
+        logger.info("[추적 박스 %s] %s: 박스 %d개, %.2fs", key, os.path.basename(path),
+                    len(tracks.detections), time.perf_counter() - start)
+
+    def refresh_panel(self, key):
+        """박스가 바뀐 영상의 캐시를 비우고, 일시정지 중이면 현재 프레임을 다시 그립니다."""
+        self.frame_cache.invalidate(key)
+        if self.is_paused and self.decoders.get(key):
+            self.seek_all_videos(self.current_frame, {key})
+            self.seek_pending_keys.add(key)
+            self.seek_poll_deadline = time.monotonic() + SEEK_DISPLAY_TIMEOUT
+            self.seek_poll_timer.start(SEEK_POLL_MS)
+
+    # --- 성능 오버레이 / 측정값 기록 ---
+    OVERLAY_STAGES = ('decode', 'resize', 'cvtcolor', 'resize_gui', 'cvtcolor_gui', 'boxes', 'blit')
+
+    def toggle_overlay(self):
+        """영상마다 단계별 지연, 실제 FPS, 건너뛴 프레임, 타이머 지연을 보여 주는 오버레이를 켜거나 끕니다."""
+        if self.overlays:
+            self.overlay_timer.stop()
+            for overlay in self.overlays.values():
+                overlay.deleteLater()
+            self.overlays = {}
+            return
+        for key in self.caps:
+            overlay = QLabel()
+            overlay.setAttribute(Qt.WA_TransparentForMouseEvents)
+            overlay.setStyleSheet("background-color: rgba(0, 0, 0, 170); color: #7CFC00; padding: 4px;"
+                                  "font-family: Consolas, monospace; font-size: 11px; border-radius: 3px;")
+            self.overlays[key] = overlay
+        self.update_overlays()
+        self.overlay_timer.start()
+
+    def update_overlays(self):
+        clock = self.clock.stats()
+        stages = self.stage_timings.summary()
+        now = time.perf_counter()
+        for key, overlay in self.overlays.items():
+            # 렌더러(QLabel / GL)에 따라 오버레이를 올릴 위젯과 위치가 다름
+            if self.gl_grid is not None:
+                parent, rect = self.gl_grid, self.gl_grid.cell_rect(key)
+                pos = (rect[0] + 8, rect[1] + 8) if rect else (8, 8)
+            else:
+                parent, pos = self.video_labels[key], (8, 8)
+            if overlay.parent() is not parent:
+                overlay.setParent(parent)
+
+            times = [t for t in self.presented_times[key] if now - t < 2.0]
+            fps = (len(times) - 1) / (times[-1] - times[0]) if len(times) > 1 and times[-1] > times[0] else 0.0
+            decoder = self.decoders.get(key)
+            st = decoder.stats() if decoder else {'skipped': 0, 'underruns': 0}
+            key_stages = dict(stages.get(key, {}))
+            if 'gl' in stages:
+                key_stages.update(stages['gl'])
+            stage_text = "  ".join(f"{stage} {key_stages[stage]:.1f}"
+                                   for stage in self.OVERLAY_STAGES + ('upload_paint',) if stage in key_stages)
+            divisor = self.rate_divisors.get(key, 1)
+            overlay.setText(f"{key}  {fps:5.1f} fps{f' (1/{divisor})' if divisor > 1 else ''}  타이머 {clock['drift_last_ms']:+.1f}ms (평균 {clock['drift_avg_ms']:.1f})\n"
+                            f"건너뜀 {st['skipped']} / 언더런 {st['underruns']} / 시계 건너뜀 {clock['dropped']}\n"
+                            f"{stage_text or '-'} (ms)")
+            overlay.adjustSize()
+            overlay.move(*pos)
+            overlay.show()
+            overlay.raise_()
+
+    def toggle_trace(self):
+        """모든 측정 샘플을 파일로 기록하는 것을 시작하거나 멈춥니다."""
+        if self.stage_timings.trace is not None:
+            self.stop_trace()
+        else:
+            self.start_trace(os.path.join(CACHE_DIR, "traces", time.strftime("trace_%Y%m%d_%H%M%S.csv")))
+
+    def start_trace(self, path):
+        self.stop_trace()
+        try:
+            self.stage_timings.trace = TraceWriter(path)
+        except OSError as e:
+            logger.warning("[측정 기록] %s 파일을 열 수 없습니다: %s", path, e)
+            return
+        logger.info("[측정 기록] 시작: %s", path)
+
+    def stop_trace(self):
+        trace, self.stage_timings.trace = self.stage_timings.trace, None
+        if trace is not None:
+            trace.close()
+            logger.info("[측정 기록] 종료: %s (%d개 샘플)", trace.path, trace.rows)
+
+    def decode_stats(self):
+        """영상별 디코딩 큐 깊이와 언더런 횟수를 반환합니다."""
+        return {key: d.stats() for key, d in self.decoders.items() if d}
+
+    def log_decode_stats(self):
+        for key, st in self.decode_stats().items():
+            logger.info("[디코딩 %s] 큐 %d/%d (최소 %d), 디코딩 %d프레임, 건너뜀 %d, 버림 %d, 언더런 %d회",
+                        key, st['depth'], st['capacity'], st['min_depth'], st['decoded'],
+                        st['skipped'], st['discarded'], st['underruns'])
+        st = self.clock.stats()
+        logger.info("[재생 시계] 표시 %d프레임, 건너뜀 %d프레임, 지연 평균 %.1fms / 최대 %.1fms",
+                    st['presented'], st['dropped'], st['drift_avg_ms'], st['drift_max_ms'])
+        st = self.frame_cache.stats()
+        logger.info("[프레임 캐시] %d개 %.1f/%.1fMB, 적중률 %.1f%% (적중 %d, 미스 %d, 방출 %d)",
+                    st['entries'], st['bytes'] / 2**20, st['max_bytes'] / 2**20, st['hit_rate'] * 100,
+                    st['hits'], st['misses'], st['evictions'])
+        for key, stages in sorted(self.stage_timings.summary().items()):
+            logger.info("[단계별 시간 %s] %s", key,
+                        ", ".join(f"{stage} {ms:.2f}ms" for stage, ms in stages.items()))
+
+    def closeEvent(self, event):
+        """창을 닫을 때 디코딩 스레드를 모두 정리합니다."""
+        self.timer.stop()
+        self.stats_timer.stop()
+        self.schedule_timer.stop()
+        self.overlay_timer.stop()
+        if self.exporter is not None:
+            self.exporter.cancel()
+        for indexer in self.indexers.values():
+            indexer.stop()
+        for worker in self.thumbnail_workers.values():
+            worker.stop()
+        self.seek_preview.hide()
+        for key in list(self.loop_writers) + list(self.loop_sources):
+            self.drop_loop_cache(key)
+        self.stop_trace()
+        for decoder in self.decoders.values():
+            if decoder:
+                decoder.stop()
+        super().closeEvent(event)
+
+STARTUP_PHASES['import'] = time.perf_counter() - _IMPORT_START
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    t0 = time.perf_counter()
     app = QApplication(sys.argv)
+    t1 = time.perf_counter()
     player = DualVideoPlayer()
+    t2 = time.perf_counter()
     player.show()
+    STARTUP_PHASES['QApplication'] = t1 - t0
+    STARTUP_PHASES['창 구성'] = t2 - t1
+
+    def on_first_show():
+        STARTUP_PHASES['첫 화면 표시'] = time.perf_counter() - t2
+        report_startup()
+    QTimer.singleShot(0, on_first_show)
     sys.exit(app.exec_())
\ No newline at end of file
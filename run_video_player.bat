@@ -13,6 +13,33 @@ set VENV_PATH=C:\Users\sam76\Desktop\venv
 REM (2) 실행할 "GUI 프로그램 파이썬 파일" 경로로 수정하세요.
 set SCRIPT_PATH=C:\Users\sam76\Desktop\dual_video_player_with_tabs.py
 
+REM (선택) 영상 렌더러 설정. OpenGL 렌더러를 쓰려면 아래 줄의 REM을 지우세요.
+REM       (GL을 사용할 수 없는 PC에서는 자동으로 기본 렌더러로 실행됩니다)
+REM set DEMOPLAYER_RENDERER=gl
+REM (선택) 디코딩 방식 설정. 영상마다 별도 프로세스로 디코딩하려면 아래 줄의 REM을 지우세요.
+REM set DEMOPLAYER_DECODE=process
+REM (선택) 전시용 루프 캐시 사용. 첫 루프의 화면을 디스크에 기록해 두고 이후 루프는 디코딩 없이 재생합니다.
+REM set DEMOPLAYER_LOOP_CACHE=1
+REM (선택) 성능 오버레이를 켠 채로 시작. 실행 중에는 F3으로 오버레이, F4로 측정값 파일 기록을 켜고 끕니다.
+REM set DEMOPLAYER_OVERLAY=1
+REM (선택) MOT 평가에 쓸 프로세스 수. 기본값은 CPU 코어 수 - 1
+REM set DEMOPLAYER_MOT_WORKERS=4
+REM (선택) 화면 구성: 모델 이름(행)과 모델별 시점 수(열). 기본값은 기존,개선 x 2
+REM set DEMOPLAYER_MODELS=기존,개선,개선2
+REM set DEMOPLAYER_VIEWS=4
+REM (선택) 디코딩에 쓸 코어 수와 영상별 중요도. 넘치면 작고 덜 중요한 영상부터 프레임률을 나눔
+REM set DEMOPLAYER_DECODE_BUDGET=6
+REM set DEMOPLAYER_PRIORITY=1-1=2,2-1=2
+REM (선택) 결과 탭을 보는 동안 영상 재생 방식. continue(기본): 시계는 계속 흐르고 돌아오기 직전 미리 탐색, pause: 멈췄다가 이어서 재생
+REM set DEMOPLAYER_HIDDEN=pause
+REM (선택) 결과 탭 미리 구성 지연(ms). 창이 뜬 뒤 백그라운드로 미리 만들어 첫 전환이 멈추지 않게 함. -1이면 끔 (처음 볼 때 구성)
+REM set DEMOPLAYER_RESULTS_PREBUILD_MS=-1
+REM (선택) 결과 엑셀에서 읽을 열 (쉼표 목록). 기본은 MOT 평가 지표 열과 Sequence 열만 읽음. all이면 모든 열
+REM set DEMOPLAYER_RESULT_COLUMNS=all
+
+REM [필수 확인] MOT 평가 코드를 바꿨다면 배포 전에 benchmark_player.py가 있는 폴더에서 아래를 실행해
+REM   TrackEval 기댓값과 같은지(종료 코드 0) 확인하세요. 자세한 내용은 README.md의 '변경 후 확인'
+REM   python benchmark_player.py --check-mot
 REM =================================================================
 
 echo.
@@ -29,7 +56,7 @@ IF ERRORLEVEL 1 (
 echo.
 echo [2] 필수 패키지를 설치합니다...
 pip install --upgrade pip >nul
-pip install pyqt5 opencv-python pandas numpy matplotlib openpyxl >nul
+pip install pyqt5 opencv-python pandas numpy matplotlib openpyxl scipy >nul
 
 echo.
 echo [3] 프로그램을 시작합니다!